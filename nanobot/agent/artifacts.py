@@ -0,0 +1,67 @@
+"""Content-addressed storage for tool results too large to keep in the conversation."""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+_HANDLE_RE = re.compile(r"^art_[0-9a-f]{16}$")
+
+
+class ArtifactStore:
+    """
+    Stores large tool results as files under root, named by content hash.
+
+    The conversation (and the session file) only keeps a preview and the
+    handle; the model pages through the rest with artifact_read. Storing the
+    same content twice returns the same handle without writing again.
+    """
+
+    def __init__(self, root: Path, spill_chars: int = 16_000, preview_chars: int = 2_000):
+        self.root = Path(root)
+        self.spill_chars = spill_chars
+        self.preview_chars = preview_chars
+
+    def path(self, handle: str) -> Path | None:
+        """File for a handle, or None if the handle is malformed."""
+        if not _HANDLE_RE.match(handle):
+            return None
+        return self.root / f"{handle}.txt"
+
+    def put(self, content: str) -> str:
+        """Store content and return its handle."""
+        handle = "art_" + hashlib.sha256(content.encode("utf-8", errors="surrogatepass")).hexdigest()[:16]
+        path = self.root / f"{handle}.txt"
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8", errors="surrogatepass") as f:
+                    f.write(content)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        return handle
+
+    def read(self, handle: str) -> str | None:
+        path = self.path(handle)
+        if path is None or not path.is_file():
+            return None
+        return path.read_text(encoding="utf-8", errors="surrogatepass")
+
+    def spill(self, tool_name: str, result: str) -> str:
+        """Store result if it is over the threshold; returns what goes into the conversation."""
+        if len(result) <= self.spill_chars:
+            return result
+        handle = self.put(result)
+        preview = result[:self.preview_chars]
+        cut = preview.rfind("\n")
+        if cut > self.preview_chars // 2:
+            preview = preview[:cut]
+        return (
+            f"{preview}\n\n[{tool_name} result truncated: showing {len(preview):,} of {len(result):,} chars. "
+            f"The full result is saved as artifact {handle}; page through it with "
+            f"artifact_read(handle=\"{handle}\", offset={len(preview)}) or search it with artifact_read's pattern]"
+        )
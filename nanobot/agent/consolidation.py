@@ -0,0 +1,159 @@
+"""Background memory consolidation service."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from nanobot.agent.memory import MemoryStore
+    from nanobot.providers.base import LLMProvider
+    from nanobot.session.manager import Session
+
+
+@dataclass
+class _ConsolidationJob:
+    """A queued consolidation request for one session."""
+    session: Session
+    archive_all: bool = False
+
+
+class ConsolidationService:
+    """
+    Runs memory consolidation off the interactive path.
+
+    Requests go through a work queue served by a fixed number of workers.
+    Per session key there is at most one job in flight and one pending:
+    further requests for a busy session are coalesced into the pending slot.
+    Archive jobs (from /new) absorb anything else pending for the session so
+    that no archived messages are ever dropped.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        provider: LLMProvider,
+        model: str,
+        memory_window: int = 50,
+        max_concurrent: int = 1,
+        timeout_s: float = 120.0,
+        chunk_tokens: int = 12000,
+        chunk_concurrency: int = 4,
+        memory_tokens: int = 2000,
+    ):
+        self.store = store
+        self.provider = provider
+        self.model = model
+        self.memory_window = memory_window
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout_s = timeout_s
+        self.chunk_tokens = chunk_tokens
+        self.chunk_concurrency = chunk_concurrency
+        self.memory_tokens = memory_tokens
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._queued: dict[str, _ConsolidationJob] = {}  # Waiting in the queue
+        self._inflight: set[str] = set()
+        self._pending: dict[str, _ConsolidationJob] = {}  # Waiting for the in-flight job
+        self._workers: list[asyncio.Task] = []
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def submit(self, session: Session, archive_all: bool = False) -> bool:
+        """
+        Request consolidation of a session.
+
+        Args:
+            session: Session to consolidate (a snapshot for archive_all).
+            archive_all: Archive every message instead of the window tail.
+
+        Returns:
+            True if a new job was queued, False if it was coalesced.
+        """
+        key = session.key
+        job = _ConsolidationJob(session=session, archive_all=archive_all)
+        self._ensure_workers()
+        self._idle.clear()
+
+        if key in self._queued:
+            self._queued[key] = self._merge(self._queued[key], job)
+            return False
+        if key in self._inflight:
+            if key in self._pending:
+                self._pending[key] = self._merge(self._pending[key], job)
+            else:
+                self._pending[key] = job
+            return False
+
+        self._queued[key] = job
+        self._queue.put_nowait(key)
+        return True
+
+    @staticmethod
+    def _merge(current: _ConsolidationJob, new: _ConsolidationJob) -> _ConsolidationJob:
+        """Coalesce two jobs for the same session into one."""
+        if current.archive_all and new.archive_all:
+            current.session.messages.extend(new.session.messages)
+            return current
+        if current.archive_all:
+            # The live session will be resubmitted on its next turn.
+            return current
+        return new
+
+    def is_busy(self, key: str) -> bool:
+        """Check whether a session has consolidation queued or running."""
+        return key in self._queued or key in self._inflight
+
+    async def wait_idle(self) -> None:
+        """Wait until all queued and pending jobs have finished."""
+        await self._idle.wait()
+
+    def _ensure_workers(self) -> None:
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrent:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._queue.get()
+            job = self._queued.pop(key, None)
+            if job is None:
+                continue
+            self._inflight.add(key)
+            try:
+                await self._run(job)
+            finally:
+                self._inflight.discard(key)
+                if pending := self._pending.pop(key, None):
+                    self._queued[key] = pending
+                    self._queue.put_nowait(key)
+                elif not self._queued and not self._inflight:
+                    self._idle.set()
+
+    async def _run(self, job: _ConsolidationJob) -> None:
+        try:
+            await asyncio.wait_for(
+                self.store.consolidate(
+                    job.session, self.provider, self.model,
+                    archive_all=job.archive_all, memory_window=self.memory_window,
+                    chunk_tokens=self.chunk_tokens, max_parallel=self.chunk_concurrency,
+                    memory_tokens=self.memory_tokens,
+                ),
+                timeout=self.timeout_s,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Memory consolidation for {} timed out after {}s", job.session.key, self.timeout_s)
+        except Exception as e:
+            logger.error("Memory consolidation for {} failed: {}", job.session.key, e)
+
+    def stop(self) -> None:
+        """Cancel the workers. Queued jobs are discarded."""
+        for w in self._workers:
+            w.cancel()
+        self._workers = []
+        self._queued.clear()
+        self._pending.clear()
+        self._inflight.clear()
+        self._idle.set()
@@ -4,33 +4,60 @@ import base64
 import mimetypes
 import platform
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.retrieval import MemoryRetriever, make_embedder
 from nanobot.agent.skills import SkillsLoader
 
+if TYPE_CHECKING:
+    from nanobot.config.schema import MemoryConfig
+    from nanobot.watcher import WatcherService
+
 
 class ContextBuilder:
     """
     Builds the context (system prompt + messages) for the agent.
     
     Assembles bootstrap files, memory, skills, and conversation history
-    into a coherent prompt for the LLM.
+    into a coherent prompt for the LLM. With a watcher, bootstrap files,
+    MEMORY.md and skills are cached until they change on disk.
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    # Recent user turns added to the current message when querying memory
+    RETRIEVAL_RECENT_TURNS = 2
+
+    def __init__(
+        self,
+        workspace: Path,
+        memory_config: "MemoryConfig | None" = None,
+        watcher: "WatcherService | None" = None,
+    ):
         self.workspace = workspace
-        self.memory = MemoryStore(workspace)
-        self.skills = SkillsLoader(workspace)
+        self.memory = MemoryStore(workspace, watcher=watcher)
+        self.skills = SkillsLoader(workspace, watcher=watcher)
+        self._bootstrap: str | None = None
+        self._watched = watcher is not None
+        if watcher is not None:
+            watcher.watch(workspace, self._on_workspace_changed)
+        self.retriever: MemoryRetriever | None = None
+        if memory_config and memory_config.retrieval_enabled:
+            self.retriever = MemoryRetriever(
+                self.memory,
+                embedder=make_embedder(memory_config.embedding_model),
+                top_k=memory_config.retrieval_top_k,
+                max_tokens=memory_config.retrieval_max_tokens,
+            )
     
-    def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
+    async def build_system_prompt(self, skill_names: list[str] | None = None, query: str = "") -> str:
         """
         Build the system prompt from bootstrap files, memory, and skills.
         
         Args:
             skill_names: Optional list of skills to include.
+            query: Text used to retrieve relevant memory (when retrieval is enabled).
         
         Returns:
             Complete system prompt.
@@ -46,7 +73,10 @@ class ContextBuilder:
             parts.append(bootstrap)
         
         # Memory context
-        memory = self.memory.get_memory_context()
+        if self.retriever:
+            memory = await self.retriever.build_context(query)
+        else:
+            memory = self.memory.get_memory_context()
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
@@ -98,7 +128,7 @@ Você é o Caio, um assistente de IA extremamente alegre, proativo e amigável.
 ## Workspace
 Seu workspace está em: {workspace_path}
 - Memória de longo prazo: {workspace_path}/memory/MEMORY.md
-- Log de histórico: {workspace_path}/memory/HISTORY.md (pesquisável via grep)
+- Log de histórico: {workspace_path}/memory/HISTORY.md (pesquisável com a ferramenta history_search)
 - Habilidades personalizadas: {workspace_path}/skills/{{skill-name}}/SKILL.md
 
 IMPORTANTE: Ao responder perguntas diretas ou conversas, responda diretamente com seu texto.
@@ -108,10 +138,16 @@ Para conversas normais, apenas responda com o texto — não chame a ferramenta
 Sempre seja útil, preciso e conciso. Antes de chamar ferramentas, diga brevemente ao usuário o que você vai fazer (uma frase curta e alegre em Português).
 Se precisar usar ferramentas, chame-as diretamente — nunca envie uma mensagem preliminar como "Deixe-me verificar" sem chamar a ferramenta de fato.
 Quando lembrar de algo importante, escreva em {workspace_path}/memory/MEMORY.md
-Para recordar eventos passados, use grep em {workspace_path}/memory/HISTORY.md"""
+Para recordar eventos passados, use a ferramenta history_search (aceita filtros de data since/until)"""
     
+    def _on_workspace_changed(self, changed: set[Path]) -> None:
+        if any(p.name in self.BOOTSTRAP_FILES for p in changed):
+            self._bootstrap = None
+
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
+        if self._bootstrap is not None:
+            return self._bootstrap
         parts = []
         
         for filename in self.BOOTSTRAP_FILES:
@@ -120,9 +156,12 @@ Para recordar eventos passados, use grep em {workspace_path}/memory/HISTORY.md""
                 content = file_path.read_text(encoding="utf-8")
                 parts.append(f"## {filename}\n\n{content}")
         
-        return "\n\n".join(parts) if parts else ""
+        bootstrap = "\n\n".join(parts) if parts else ""
+        if self._watched:
+            self._bootstrap = bootstrap
+        return bootstrap
     
-    def build_messages(
+    async def build_messages(
         self,
         history: list[dict[str, Any]],
         current_message: str,
@@ -148,7 +187,7 @@ Para recordar eventos passados, use grep em {workspace_path}/memory/HISTORY.md""
         messages = []
 
         # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
+        system_prompt = await self.build_system_prompt(skill_names, query=self._retrieval_query(history, current_message))
         if channel and chat_id:
             system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
         messages.append({"role": "system", "content": system_prompt})
@@ -162,6 +201,14 @@ Para recordar eventos passados, use grep em {workspace_path}/memory/HISTORY.md""
 
         return messages
 
+    def _retrieval_query(self, history: list[dict[str, Any]], current_message: str) -> str:
+        """Current message plus the last few user turns, for memory retrieval."""
+        recent = [
+            m["content"] for m in history
+            if m.get("role") == "user" and isinstance(m.get("content"), str)
+        ][-self.RETRIEVAL_RECENT_TURNS:]
+        return "\n".join(recent + [current_message])
+
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
         if not media:
@@ -0,0 +1,291 @@
+"""Segmented HISTORY.md log with an incremental BM25 index."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+_WORD_RE = re.compile(r"\w+")
+_DATE_RE = re.compile(rb"^\[(\d{4}-\d{2}-\d{2})(?:[ T](\d{2}:\d{2}))?")
+_ENTRY_START_RE = re.compile(rb"\[\d{4}-\d{2}-\d{2}")
+
+# Common Portuguese and English words that carry no recall signal
+_STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por pelo pela pelos pelas
+para pra com sem sobre entre ate e ou mas que se nao sim ja ainda tambem muito mais menos
+como quando onde qual quais quem porque isso isto esse essa este esta aquele aquela ele ela
+eles elas eu voce voces nos meu minha seu sua foi ser era sao estava esta estao tem ter
+ha havia vai vou fazer feito ao aos the and or of to in on for with is are was were be been
+it this that at by from an as not
+""".split())
+
+K1 = 1.2
+B = 0.75
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _stem(word: str) -> str:
+    """Light Portuguese stemmer: reduce plurals and a few derivational suffixes."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, repl in (
+        ("mente", ""), ("coes", "cao"), ("soes", "sao"), ("oes", "ao"), ("aes", "ao"),
+        ("ais", "al"), ("eis", "el"), ("ois", "ol"), ("ns", "m"), ("res", "r"), ("zes", "z"),
+        ("les", "l"), ("s", ""),
+    ):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: len(word) - len(suffix)] + repl
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Accent-insensitive, stopword-filtered, lightly stemmed terms."""
+    words = _WORD_RE.findall(_strip_accents(text.lower()))
+    return [_stem(w) for w in words if w not in _STOPWORDS and len(w) > 1]
+
+
+def _split_entries(data: bytes, base: int) -> list[tuple[int, int]]:
+    """Return (offset, length) of entries in data; entries start with a [date] line."""
+    spans: list[tuple[int, int]] = []
+    pos = 0
+    for para in data.split(b"\n\n"):
+        start, pos = pos, pos + len(para) + 2
+        if not para.strip():
+            continue
+        if spans and not _ENTRY_START_RE.match(para.lstrip()):
+            off, _ = spans[-1]
+            spans[-1] = (off, base + start + len(para) - off)
+        else:
+            spans.append((base + start, len(para)))
+    return spans
+
+
+class HistoryIndex:
+    """
+    HISTORY.md plus rotated monthly segments, searchable with BM25.
+
+    HISTORY.md holds the current month; older months are moved to
+    memory/history/YYYY-MM.md. The inverted index is updated incrementally
+    from appended bytes and persisted next to the segments, so a query never
+    rescans the log and only reads the text of the top hits.
+    """
+
+    def __init__(self, memory_dir: Path):
+        self.memory_dir = memory_dir
+        self.current_file = memory_dir / "HISTORY.md"
+        self.segments_dir = memory_dir / "history"
+        self.index_file = self.segments_dir / "index.json"
+        self._loaded = False
+        self._segments: dict[str, list[int]] = {}  # name -> [indexed_size, mtime_ns]
+        self._docs: list[list] = []  # [segment, offset, length, date, doc_len]
+        self._postings: dict[str, dict[int, int]] = {}
+        self._total_len = 0
+        self._dirty = False
+
+    # ---- log ----
+
+    def append(self, entry: str) -> None:
+        """Append an entry to HISTORY.md, rotating last month's file first."""
+        self._rotate()
+        with open(self.current_file, "a", encoding="utf-8") as f:
+            f.write(entry.rstrip() + "\n\n")
+
+    def _rotate(self, now: datetime | None = None) -> None:
+        if not self.current_file.exists():
+            return
+        st = self.current_file.stat()
+        month = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m")
+        if month == (now or datetime.now()).strftime("%Y-%m") or st.st_size == 0:
+            return
+        self._load()
+        self.refresh()
+        target = ensure_dir(self.segments_dir) / f"{month}.md"
+        shift = target.stat().st_size if target.exists() else 0
+        with open(target, "ab") as out:
+            out.write(self.current_file.read_bytes())
+        self.current_file.unlink()
+
+        name = target.relative_to(self.memory_dir).as_posix()
+        for doc in self._docs:
+            if doc[0] == "HISTORY.md":
+                doc[0], doc[1] = name, doc[1] + shift
+        self._segments.pop("HISTORY.md", None)
+        tst = target.stat()
+        self._segments[name] = [tst.st_size, tst.st_mtime_ns]
+        self._dirty = True
+        self._save()
+        logger.info("History: rotated HISTORY.md into {}", name)
+
+    def segment_files(self) -> list[Path]:
+        files = sorted(self.segments_dir.glob("*.md")) if self.segments_dir.exists() else []
+        if self.current_file.exists():
+            files.append(self.current_file)
+        return files
+
+    # ---- index ----
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.index_file.exists():
+            return
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+            self._segments = data["segments"]
+            self._docs = data["docs"]
+            self._postings = {t: {d: tf for d, tf in p} for t, p in data["postings"].items()}
+            self._total_len = sum(d[4] for d in self._docs)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("History index unreadable, rebuilding: {}", e)
+            self._reset()
+
+    def _reset(self) -> None:
+        self._segments, self._docs, self._postings, self._total_len = {}, [], {}, 0
+        self._dirty = True
+
+    def refresh(self) -> None:
+        """Index bytes appended since the last refresh; rebuild if a segment was rewritten."""
+        self._load()
+        present = {}
+        for path in self.segment_files():
+            st = path.stat()
+            present[path.relative_to(self.memory_dir).as_posix()] = (path, st.st_size, st.st_mtime_ns)
+
+        rewritten = any(
+            name not in present
+            or present[name][1] < size
+            or (present[name][1] == size and present[name][2] != mtime)
+            for name, (size, mtime) in self._segments.items()
+        )
+        if rewritten:
+            self._reset()
+
+        for name, (path, size, mtime) in present.items():
+            indexed = self._segments.get(name, [0, 0])[0]
+            if size > indexed:
+                with open(path, "rb") as f:
+                    f.seek(indexed)
+                    data = f.read(size - indexed)
+                for offset, length in _split_entries(data, indexed):
+                    self._add_doc(name, offset, data[offset - indexed: offset - indexed + length])
+                self._dirty = True
+            self._segments[name] = [size, mtime]
+        self._save()
+
+    def _add_doc(self, segment: str, offset: int, raw: bytes) -> None:
+        m = _DATE_RE.match(raw.lstrip())
+        date = f"{m.group(1).decode()} {(m.group(2) or b'').decode()}".strip() if m else ""
+        terms = tokenize(raw.decode("utf-8", errors="replace"))
+        doc_id = len(self._docs)
+        self._docs.append([segment, offset, len(raw), date, len(terms)])
+        self._total_len += len(terms)
+        for t in terms:
+            posting = self._postings.setdefault(t, {})
+            posting[doc_id] = posting.get(doc_id, 0) + 1
+
+    def _save(self) -> None:
+        if not self._dirty:
+            return
+        ensure_dir(self.segments_dir)
+        data = {
+            "version": 1,
+            "segments": self._segments,
+            "docs": self._docs,
+            "postings": {t: list(p.items()) for t, p in self._postings.items()},
+        }
+        tmp = self.index_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.index_file)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._docs)
+
+    def signature(self) -> dict[str, list[int]]:
+        """Indexed size and mtime of each segment; changes whenever the log does."""
+        self._load()
+        return {name: list(v) for name, v in self._segments.items()}
+
+    def entries(self, start: int = 0) -> list[dict]:
+        """Indexed entries from position start on, as dicts with 'date' and 'text'."""
+        self._load()
+        out = []
+        cache: dict[str, bytes] = {}
+        for segment, offset, length, date, _ in self._docs[start:]:
+            if segment not in cache:
+                cache[segment] = (self.memory_dir / segment).read_bytes()
+            raw = cache[segment][offset: offset + length]
+            out.append({"date": date, "text": raw.decode("utf-8", errors="replace").strip()})
+        return out
+
+    def search(
+        self,
+        query: str,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 5,
+    ) -> list[dict]:
+        """
+        Rank history entries against query.
+
+        Args:
+            query: Free text; empty returns the most recent entries in range.
+            since: Inclusive lower date bound (YYYY-MM-DD).
+            until: Inclusive upper date bound (YYYY-MM-DD).
+            limit: Max hits.
+
+        Returns:
+            Hits as dicts with 'date', 'score', 'segment' and 'text'.
+        """
+        self.refresh()
+
+        def in_range(doc: list) -> bool:
+            day = doc[3][:10]
+            if since and (not day or day < since):
+                return False
+            if until and (not day or day > until[:10]):
+                return False
+            return True
+
+        scores: dict[int, float] = {}
+        terms = tokenize(query)
+        if terms:
+            n = len(self._docs)
+            avgdl = (self._total_len / n) if n else 1.0
+            for t in set(terms):
+                posting = self._postings.get(t)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    dl = self._docs[doc_id][4]
+                    norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+            ranked = sorted((d for d in scores if in_range(self._docs[d])), key=lambda d: -scores[d])
+        elif since or until:
+            ranked = [d for d in range(len(self._docs) - 1, -1, -1) if in_range(self._docs[d])]
+        else:
+            ranked = []
+
+        hits = []
+        for doc_id in ranked[:limit]:
+            segment, offset, length, date, _ = self._docs[doc_id]
+            with open(self.memory_dir / segment, "rb") as f:
+                f.seek(offset)
+                text = f.read(length).decode("utf-8", errors="replace").strip()
+            hits.append({"date": date, "score": round(scores.get(doc_id, 0.0), 3),
+                         "segment": segment, "text": text})
+        return hits
@@ -12,28 +12,47 @@ from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.consolidation import ConsolidationService
 from nanobot.agent.context import ContextBuilder
-from nanobot.agent.memory import MemoryStore
+from nanobot.agent.loop_guard import LoopIncident, LoopMetrics, ToolLoopDetector
 from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.subagent_worker import SubagentWorkerPool
+from nanobot.agent.tools.artifacts import ArtifactReadTool
+from nanobot.agent.tools.cache import ToolResultCache
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.email_read import EmailReadTool
 from nanobot.agent.tools.email_delete import EmailDeleteTool
 from nanobot.agent.tools.email_send import EmailSendTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.google_calendar import GoogleCalendarTool
+from nanobot.agent.tools.history import HistorySearchTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.router import RequestToolsTool, ToolRouter
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
+from nanobot.agent.workspace_index import WorkspaceIndex
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider, ToolCallRequest
 from nanobot.session.manager import Session, SessionManager
 
 if TYPE_CHECKING:
-    from nanobot.config.schema import ExecToolConfig
+    from nanobot.config.schema import (
+        ArtifactsConfig,
+        ExecToolConfig,
+        LoopDetectionConfig,
+        MemoryConfig,
+        SearchToolConfig,
+        SubagentsConfig,
+        ToolCacheConfig,
+        ToolRoutingConfig,
+    )
     from nanobot.cron.service import CronService
+    from nanobot.watcher import WatcherService
 
 
 class AgentLoop:
@@ -60,6 +79,10 @@ class AgentLoop:
         memory_window: int = 50,
         brave_api_key: str | None = None,
         exec_config: ExecToolConfig | None = None,
+        search_config: SearchToolConfig | None = None,
+        tool_routing: ToolRoutingConfig | None = None,
+        tool_cache: ToolCacheConfig | None = None,
+        artifacts_config: ArtifactsConfig | None = None,
         cron_service: CronService | None = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
@@ -67,8 +90,22 @@ class AgentLoop:
         email_config: dict | None = None,
         gcal_config: dict | None = None,
         fallback_models: list[str] | None = None,
+        memory_config: MemoryConfig | None = None,
+        loop_detection: LoopDetectionConfig | None = None,
+        watcher: WatcherService | None = None,
+        subagents_config: SubagentsConfig | None = None,
+        provider_factory: Callable[[], LLMProvider] | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import (
+            ArtifactsConfig,
+            ExecToolConfig,
+            LoopDetectionConfig,
+            MemoryConfig,
+            SearchToolConfig,
+            SubagentsConfig,
+            ToolCacheConfig,
+            ToolRoutingConfig,
+        )
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
@@ -79,15 +116,52 @@ class AgentLoop:
         self.memory_window = memory_window
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        search_config = search_config or SearchToolConfig()
+        self.workspace_index = WorkspaceIndex(
+            workspace,
+            max_file_bytes=search_config.max_file_kb * 1024,
+            max_files=search_config.max_files,
+            ignore=search_config.ignore,
+        )
+        tool_routing = tool_routing or ToolRoutingConfig()
+        self.router = ToolRouter(
+            core=tool_routing.core, max_tools=tool_routing.max_tools,
+        ) if tool_routing.enabled else None
+        tool_cache = tool_cache or ToolCacheConfig()
+        self.tool_cache_scope = tool_cache.scope
+        artifacts_config = artifacts_config or ArtifactsConfig()
+        self.artifacts = ArtifactStore(
+            workspace / "artifacts" / "results",
+            spill_chars=artifacts_config.spill_chars,
+            preview_chars=artifacts_config.preview_chars,
+        ) if artifacts_config.enabled else None
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
         self.email_config = email_config or {}
         self.gcal_config = gcal_config or {}
         self.fallback_models = fallback_models or []
+        self.memory_config = memory_config or MemoryConfig()
+        self.loop_detection = loop_detection or LoopDetectionConfig()
+        self.loop_metrics = LoopMetrics()
+        subagents_config = subagents_config or SubagentsConfig()
+        worker_pool = None
+        if subagents_config.isolation == "process":
+            if provider_factory is None:
+                logger.warning("Subagent process isolation needs a provider factory; running subagents inline")
+            else:
+                worker_pool = SubagentWorkerPool(
+                    provider_factory,
+                    size=subagents_config.worker_processes or subagents_config.max_concurrent,
+                    memory_mb=subagents_config.worker_memory_mb,
+                    cpu_s=subagents_config.worker_cpu_s,
+                )
 
-        self.context = ContextBuilder(workspace)
+        self.context = ContextBuilder(workspace, memory_config=self.memory_config, watcher=watcher)
         self.sessions = session_manager or SessionManager(workspace)
-        self.tools = ToolRegistry()
+        self.tools = ToolRegistry(
+            cache=ToolResultCache(tool_cache.max_entries) if tool_cache.enabled else None,
+            artifacts=self.artifacts,
+        )
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -98,6 +172,14 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            max_concurrent=subagents_config.max_concurrent,
+            max_per_origin=subagents_config.max_per_origin,
+            max_queued=subagents_config.max_queued,
+            timeout_s=subagents_config.timeout_s,
+            max_iterations=subagents_config.max_iterations,
+            token_budget=subagents_config.token_budget,
+            worker_pool=worker_pool,
+            workspace_index=self.workspace_index,
         )
 
         self._running = False
@@ -105,7 +187,17 @@ class AgentLoop:
         self._mcp_stack: AsyncExitStack | None = None
         self._mcp_connected = False
         self._mcp_connecting = False
-        self._consolidating: set[str] = set()  # Session keys with consolidation in progress
+        self.consolidation = ConsolidationService(
+            store=self.context.memory,
+            provider=provider,
+            model=self.memory_config.consolidation_model or self.model,
+            memory_window=memory_window,
+            max_concurrent=self.memory_config.consolidation_concurrency,
+            timeout_s=self.memory_config.consolidation_timeout_s,
+            chunk_tokens=self.memory_config.consolidation_chunk_tokens,
+            chunk_concurrency=self.memory_config.consolidation_chunk_concurrency,
+            memory_tokens=self.memory_config.consolidation_memory_tokens,
+        )
         self._register_default_tools()
 
     def _register_default_tools(self) -> None:
@@ -117,13 +209,24 @@ class AgentLoop:
             working_dir=str(self.workspace),
             timeout=self.exec_config.timeout,
             restrict_to_workspace=self.restrict_to_workspace,
+            max_output_chars=self.exec_config.max_output_chars,
+            artifacts_dir=self.workspace / "artifacts" / "exec" if self.exec_config.spill_output else None,
+            progress_interval_s=self.exec_config.progress_interval_s,
+            persistent=self.exec_config.persistent_sessions,
+            session_idle_s=self.exec_config.session_idle_s,
         ))
+        self.tools.register(SearchFilesTool(self.workspace_index))
         self.tools.register(WebSearchTool(api_key=self.brave_api_key))
         self.tools.register(WebFetchTool())
+        self.tools.register(HistorySearchTool(self.context.memory.history))
         self.tools.register(MessageTool(send_callback=self.bus.publish_outbound))
         self.tools.register(SpawnTool(manager=self.subagents))
         if self.cron_service:
             self.tools.register(CronTool(self.cron_service))
+        if self.artifacts:
+            self.tools.register(ArtifactReadTool(self.artifacts))
+        if self.router:
+            self.tools.register(RequestToolsTool(self.tools, self.router))
         # Register email reading tool if IMAP credentials are configured
         ec = self.email_config
         if ec.get("imap_host") and ec.get("imap_username") and ec.get("imap_password"):
@@ -192,6 +295,9 @@ class AgentLoop:
 
     def _set_tool_context(self, channel: str, chat_id: str, message_id: str | None = None) -> None:
         """Update context for all tools that need routing info."""
+        if self.tool_cache_scope == "session":
+            self.tools.cache_scope = f"{channel}:{chat_id}"
+
         if message_tool := self.tools.get("message"):
             if isinstance(message_tool, MessageTool):
                 message_tool.set_context(channel, chat_id, message_id)
@@ -204,6 +310,20 @@ class AgentLoop:
             if isinstance(cron_tool, CronTool):
                 cron_tool.set_context(channel, chat_id)
 
+        if exec_tool := self.tools.get("exec"):
+            if isinstance(exec_tool, ExecTool):
+                exec_tool.set_context(channel, chat_id)
+
+    def _select_tools(self, message: str, channel: str, history: list[dict]) -> set[str] | None:
+        """Tool names to offer for this turn (None for all of them)."""
+        if self.router is None:
+            return None
+        active = self.router.select(self.tools, message, channel=channel, history=history)
+        if isinstance(request_tool := self.tools.get("request_tools"), RequestToolsTool):
+            request_tool.active = active
+        logger.debug("Tools for this turn: {}", ", ".join(sorted(active)))
+        return active
+
     @staticmethod
     def _strip_think(text: str | None) -> str | None:
         """Remove <think>…</think> blocks that some models embed in content."""
@@ -259,12 +379,23 @@ class AgentLoop:
         initial_messages: list[dict],
         session: Session | None = None,
         on_progress: Callable[[str], Awaitable[None]] | None = None,
+        tool_names: set[str] | None = None,
     ) -> tuple[str | None, list[str]]:
-        """Run the agent iteration loop. Returns (final_content, tools_used)."""
+        """
+        Run the agent iteration loop. Returns (final_content, tools_used).
+
+        tool_names limits the tools offered to the model; request_tools may
+        add to the set during the turn.
+        """
         messages = initial_messages
         iteration = 0
         final_content = None
         tools_used: list[str] = []
+        detector = ToolLoopDetector(
+            warn_after=self.loop_detection.warn_after, stop_after=self.loop_detection.stop_after,
+        ) if self.loop_detection.enabled else None
+        if isinstance(exec_tool := self.tools.get("exec"), ExecTool):
+            exec_tool.on_progress = on_progress
 
         while iteration < self.max_iterations:
             iteration += 1
@@ -278,7 +409,7 @@ class AgentLoop:
                 try:
                     response = await self.provider.chat(
                         messages=messages,
-                        tools=self.tools.get_definitions(),
+                        tools=self.tools.get_definitions(tool_names),
                         model=m,
                         temperature=self.temperature,
                         max_tokens=self.max_tokens,
@@ -346,9 +477,22 @@ class AgentLoop:
 
                 for tool_call in response.tool_calls:
                     tools_used.append(tool_call.name)
+                    if tool_names is not None and self.tools.has(tool_call.name):
+                        # Called without being offered (e.g. extracted from text): keep it offered
+                        tool_names.add(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, args_str[:200])
                     result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                    if detector:
+                        repeats = detector.record(tool_call.name, tool_call.arguments, result)
+                        if hint := detector.hint(tool_call.name, repeats):
+                            result = f"{result}\n\n{hint}"
+                            if repeats == detector.warn_after:
+                                logger.warning("Repeated tool call: {} x{}", tool_call.name, repeats)
+                                self.loop_metrics.record(LoopIncident(
+                                    session=session.key if session else "", tool=tool_call.name,
+                                    repeats=repeats, stopped=False,
+                                ))
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -359,12 +503,45 @@ class AgentLoop:
                             name=tool_call.name,
                             content=result
                         )
+                if detector and detector.should_stop:
+                    name = response.tool_calls[-1].name
+                    logger.warning("Stopping turn after {} identical tool calls ({})", detector.max_repeats, name)
+                    self.loop_metrics.record(LoopIncident(
+                        session=session.key if session else "", tool=name,
+                        repeats=detector.max_repeats, stopped=True,
+                    ))
+                    final_content = await self._loop_stop_answer(messages)
+                    break
             else:
                 final_content = self._strip_think(response.content)
                 break
 
         return final_content, tools_used
 
+    async def _loop_stop_answer(self, messages: list[dict]) -> str:
+        """Final answer for a turn stopped by loop detection, from what the model gathered so far."""
+        messages = messages + [{
+            "role": "user",
+            "content": (
+                "[System: you kept repeating the same tool calls with the same results, so tool use is over "
+                "for this turn. Do not call any tool. Reply to the user now with what you found so far, "
+                "what is still missing and, if useful, what they could try next.]"
+            ),
+        }]
+        try:
+            response = await self.provider.chat(
+                messages=messages,
+                tools=None,  # No tools offered, so the model has to answer in text
+                model=self.model,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
+            if response.finish_reason != "error" and (content := self._strip_think(response.content)):
+                return content
+        except Exception as e:
+            logger.warning("Loop-stop answer failed: {}", e)
+        return "I stopped because I kept repeating the same step without making progress. Could you rephrase or give me more details?"
+
     async def run(self) -> None:
         """Run the agent loop, processing messages from the bus."""
         self._running = True
@@ -407,6 +584,11 @@ class AgentLoop:
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        self.consolidation.stop()
+        self.subagents.shutdown()
+        self.workspace_index.close()
+        if isinstance(exec_tool := self.tools.get("exec"), ExecTool):
+            exec_tool.close_sessions()
         logger.info("Agent loop stopping")
 
     async def _process_message(
@@ -424,12 +606,15 @@ class AgentLoop:
             key = f"{channel}:{chat_id}"
             session = self.sessions.get_or_create(key)
             self._set_tool_context(channel, chat_id, msg.metadata.get("message_id"))
-            messages = self.context.build_messages(
-                history=session.get_history(max_messages=self.memory_window),
+            history = session.get_history(max_messages=self.memory_window)
+            messages = await self.context.build_messages(
+                history=history,
                 current_message=msg.content, channel=channel, chat_id=chat_id,
             )
             session.add_message("user", msg.content)
-            final_content, _ = await self._run_agent_loop(messages, session=session)
+            final_content, _ = await self._run_agent_loop(
+                messages, session=session, tool_names=self._select_tools(msg.content, channel, history),
+            )
             # No need to add assistant message here as it's added inside the loop
             self.sessions.save(session)
             return OutboundMessage(channel=channel, chat_id=chat_id,
@@ -449,36 +634,28 @@ class AgentLoop:
             self.sessions.save(session)
             self.sessions.invalidate(session.key)
 
-            async def _consolidate_and_cleanup():
+            if messages_to_archive:
                 temp = Session(key=session.key)
                 temp.messages = messages_to_archive
-                await self._consolidate_memory(temp, archive_all=True)
-
-            asyncio.create_task(_consolidate_and_cleanup())
+                self.consolidation.submit(temp, archive_all=True)
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="New session started. Memory consolidation in progress.")
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands")
 
-        if len(session.messages) > self.memory_window and session.key not in self._consolidating:
-            self._consolidating.add(session.key)
-
-            async def _consolidate_and_unlock():
-                try:
-                    await self._consolidate_memory(session)
-                finally:
-                    self._consolidating.discard(session.key)
-
-            asyncio.create_task(_consolidate_and_unlock())
+        # Only consolidate once a full window of new messages has accumulated
+        if len(session.messages) - session.last_consolidated > self.memory_window:
+            self.consolidation.submit(session)
 
         self._set_tool_context(msg.channel, msg.chat_id, msg.metadata.get("message_id"))
         if message_tool := self.tools.get("message"):
             if isinstance(message_tool, MessageTool):
                 message_tool.start_turn()
 
-        initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+        history = session.get_history(max_messages=self.memory_window)
+        initial_messages = await self.context.build_messages(
+            history=history,
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel, chat_id=msg.chat_id,
@@ -492,7 +669,7 @@ class AgentLoop:
             trimmed = content.strip()
             
             # Pattern matches common tool names or word + parenthesis
-            _tool_pattern = re.compile(r'^(cron|email_send|email_read|google_calendar|message|read_file|write_file|edit_file|ls|exec|spawn|web_search|web_fetch)\b', re.IGNORECASE)
+            _tool_pattern = re.compile(r'^(cron|email_send|email_read|google_calendar|message|read_file|write_file|edit_file|ls|exec|search_files|request_tools|artifact_read|spawn|web_search|web_fetch|history_search)\b', re.IGNORECASE)
             _call_pattern = re.compile(r'^\w+\s*\(', re.DOTALL)
             
             if _tool_pattern.match(trimmed) or _call_pattern.match(trimmed):
@@ -511,6 +688,7 @@ class AgentLoop:
         session.add_message("user", msg.content)
         final_content, tools_used = await self._run_agent_loop(
             initial_messages, session=session, on_progress=on_progress or _bus_progress,
+            tool_names=self._select_tools(msg.content, msg.channel, history),
         )
 
         if final_content is None:
@@ -537,13 +715,6 @@ class AgentLoop:
             metadata=msg.metadata or {},
         )
 
-    async def _consolidate_memory(self, session, archive_all: bool = False) -> None:
-        """Delegate to MemoryStore.consolidate()."""
-        await MemoryStore(self.workspace).consolidate(
-            session, self.provider, self.model,
-            archive_all=archive_all, memory_window=self.memory_window,
-        )
-
     async def process_direct(
         self,
         content: str,
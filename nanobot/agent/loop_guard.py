@@ -0,0 +1,105 @@
+"""Detection of repeated tool calls within one agent turn."""
+
+import hashlib
+import json
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+_CACHED_PREFIX = re.compile(r"^\[cached: [^\]]*\]\n")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def fingerprint(name: str, args: dict[str, Any], result: str) -> str:
+    """Identity of a call and its outcome: tool name, normalized arguments and result hash."""
+    result = _CACHED_PREFIX.sub("", result or "")
+    key = json.dumps([name, _normalize(args)], sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha1(result.encode("utf-8", errors="replace")).hexdigest()[:16]
+    return f"{key}|{digest}"
+
+
+class ToolLoopDetector:
+    """
+    Counts identical tool calls (same arguments, same result) within a turn.
+
+    A call repeated warn_after times gets a corrective hint appended to its
+    result; at stop_after the turn should end. Alternating between a few
+    failing calls is caught too, since each of them keeps repeating.
+    """
+
+    def __init__(self, warn_after: int = 3, stop_after: int = 5):
+        self.warn_after = warn_after
+        self.stop_after = stop_after
+        self._counts: dict[str, int] = {}
+        self.max_repeats = 0
+
+    def record(self, name: str, args: dict[str, Any], result: str) -> int:
+        """Register a call; returns how many times this exact call and result have been seen."""
+        fp = fingerprint(name, args, result)
+        count = self._counts.get(fp, 0) + 1
+        self._counts[fp] = count
+        self.max_repeats = max(self.max_repeats, count)
+        return count
+
+    @property
+    def should_stop(self) -> bool:
+        return self.max_repeats >= self.stop_after
+
+    def hint(self, name: str, count: int) -> str | None:
+        """Corrective note for the model once a call starts repeating."""
+        if count < self.warn_after:
+            return None
+        return (
+            f"[Loop warning: this is call #{count} of {name} with the same arguments and the same result. "
+            "Repeating it will not change anything. Try a different approach or different arguments, "
+            "or answer the user with what you have.]"
+        )
+
+
+@dataclass
+class LoopIncident:
+    session: str
+    tool: str
+    repeats: int
+    stopped: bool
+    at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "session": self.session, "tool": self.tool, "repeats": self.repeats,
+            "stopped": self.stopped, "at": self.at,
+        }
+
+
+class LoopMetrics:
+    """Counters and recent incidents of repeated-call loops, for the status API."""
+
+    def __init__(self, keep: int = 50):
+        self.warnings = 0
+        self.stopped = 0
+        self.incidents: deque[LoopIncident] = deque(maxlen=keep)
+
+    def record(self, incident: LoopIncident) -> None:
+        if incident.stopped:
+            self.stopped += 1
+        else:
+            self.warnings += 1
+        self.incidents.append(incident)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "warnings": self.warnings,
+            "stopped": self.stopped,
+            "recent": [i.to_dict() for i in reversed(self.incidents)],
+        }
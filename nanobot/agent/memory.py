@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir
+from nanobot.agent.history import HistoryIndex
+from nanobot.utils.helpers import ensure_dir, safe_filename
 
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
     from nanobot.session.manager import Session
+    from nanobot.watcher import WatcherService
 
 
 _SAVE_MEMORY_TOOL = [
@@ -27,40 +32,334 @@ _SAVE_MEMORY_TOOL = [
                     "history_entry": {
                         "type": "string",
                         "description": "A paragraph (2-5 sentences) summarizing key events/decisions/topics. "
-                        "Start with [YYYY-MM-DD HH:MM]. Include detail useful for grep search.",
+                        "Start with [YYYY-MM-DD HH:MM]. Include names and keywords useful for search.",
                     },
-                    "memory_update": {
-                        "type": "string",
-                        "description": "Full updated long-term memory as markdown. Include all existing "
-                        "facts plus new ones. Return unchanged if nothing new.",
+                    "memory_ops": {
+                        "type": "array",
+                        "description": "Changes to long-term memory. Only list facts that are new, "
+                        "changed or obsolete. Empty if nothing changed.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "op": {"type": "string", "enum": ["add", "update", "delete"]},
+                                "section": {
+                                    "type": "string",
+                                    "description": "Section title, e.g. 'User Information'",
+                                },
+                                "key": {
+                                    "type": "string",
+                                    "description": "Short fact key, unique within the section",
+                                },
+                                "value": {
+                                    "type": "string",
+                                    "description": "Fact text (markdown). Not needed for delete.",
+                                },
+                            },
+                            "required": ["op", "section", "key"],
+                        },
                     },
                 },
-                "required": ["history_entry", "memory_update"],
+                "required": ["history_entry"],
             },
         },
     }
 ]
 
+_CHUNK_SYSTEM_PROMPT = (
+    "You are a memory consolidation agent. Summarize this part of a longer conversation. "
+    "Keep timestamps ([YYYY-MM-DD HH:MM]), decisions, facts about the user and anything "
+    "worth remembering long-term. Reply with the summary only."
+)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _split_chunks(lines: list[str], max_tokens: int) -> list[str]:
+    """Group lines into chunks of at most max_tokens, splitting oversized lines."""
+    max_chars = max(1, max_tokens) * 4
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in lines:
+        while len(line) > max_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and size + len(line) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+_KEYED_FACT_RE = re.compile(r"^[-*]\s+(?:\*\*(.+?)\*\*|([^:*\n]{1,40}):\s)")
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+def _is_bullet(text: str) -> bool:
+    return text[:2] in ("- ", "* ")
+
+
+def _fact_key(text: str, existing: dict[str, str]) -> str:
+    """Derive a stable key for a markdown block: its bold/colon label, else its first words."""
+    m = _KEYED_FACT_RE.match(text)
+    if m:
+        base = (m.group(1) or m.group(2)).strip().rstrip(":")
+    else:
+        words = re.sub(r"[*_`#>\[\]()-]", " ", text).split()
+        base = " ".join(words[:6])[:48] or "note"
+    key, n = base, 2
+    while key in existing:
+        key, n = f"{base} ({n})", n + 1
+    return key
+
+
+def _parse_memory_markdown(content: str) -> list[dict]:
+    """Split MEMORY.md into sections of keyed blocks (top-level bullets or paragraphs)."""
+    sections: list[dict] = []
+    current: dict = {"title": "", "level": 0, "facts": {}}
+    block: list[str] = []
+
+    def flush() -> None:
+        text = "\n".join(block).rstrip()
+        if text.strip():
+            current["facts"][_fact_key(text, current["facts"])] = text
+        block.clear()
+
+    for line in content.splitlines():
+        if m := _HEADING_RE.match(line):
+            flush()
+            if current["level"] or current["facts"]:
+                sections.append(current)
+            title, n = m.group(2), 2
+            while any(sec["title"] == title for sec in sections):
+                title, n = f"{m.group(2)} ({n})", n + 1
+            current = {"title": title, "level": len(m.group(1)), "facts": {}}
+        elif not line.strip():
+            flush()
+        else:
+            if _is_bullet(line) and block:
+                flush()
+            block.append(line)
+    flush()
+    if current["level"] or current["facts"]:
+        sections.append(current)
+    return sections
+
+
+def _render_sections(sections: list[dict]) -> str:
+    out = []
+    for sec in sections:
+        body, prev_bullet = "", False
+        for text in sec["facts"].values():
+            if body:
+                body += "\n" if prev_bullet and _is_bullet(text) else "\n\n"
+            body += text
+            prev_bullet = _is_bullet(text)
+        heading = f"{'#' * sec['level']} {sec['title']}" if sec["level"] else ""
+        out.append("\n\n".join(p for p in (heading, body) if p))
+    return "\n\n".join(out) + "\n" if out else ""
+
+
+def _rewrite_as_ops(markdown: str, sections: list[dict]) -> list[dict]:
+    """Turn a full MEMORY.md rewrite into add/update ops for the facts it adds or changes."""
+    existing = {sec["title"].lower(): sec["facts"] for sec in sections}
+    ops = []
+    for sec in _parse_memory_markdown(markdown):
+        title = sec["title"] or "Notes"
+        current = existing.get(title.lower(), {})
+        for key, value in sec["facts"].items():
+            if current.get(key) != value:
+                ops.append({"op": "update", "section": title, "key": key, "value": value})
+    return ops
+
+
+class FactStore:
+    """
+    Structured long-term memory: keyed facts grouped in sections.
+
+    The structure is persisted as JSON and rendered to MEMORY.md, which stays
+    the human/agent-editable view. When MEMORY.md is edited outside the store
+    it is re-parsed, so direct edits are never lost. A watched store skips
+    the per-call stat and relies on invalidate() instead.
+    """
+
+    def __init__(self, path: Path, markdown_file: Path):
+        self.path = path
+        self.markdown_file = markdown_file
+        self.watched = False
+        self._sections: list[dict] | None = None
+        self._signature: tuple[int, int] | None = None
+        # Bumped whenever the facts change (reload or apply), for caches built on them
+        self.version = 0
+
+    def invalidate(self) -> None:
+        self._sections = None
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.markdown_file.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def sections(self) -> list[dict]:
+        """Current sections, re-synced from MEMORY.md if it changed on disk."""
+        if self.watched and self._sections is not None:
+            return self._sections
+        signature = self._stat()
+        if self._sections is not None and signature == self._signature:
+            return self._sections
+
+        markdown = self.markdown_file.read_text(encoding="utf-8") if signature else ""
+        digest = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+        data = None
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = None
+        if data and data.get("markdownSha") == digest:
+            self._sections = data.get("sections", [])
+        else:
+            self._sections = _parse_memory_markdown(markdown)
+            self._save_json(digest)
+        self._signature = signature
+        self.version += 1
+        return self._sections
+
+    def apply(self, ops: list[dict]) -> int:
+        """Apply add/update/delete operations and re-render MEMORY.md. Returns ops applied."""
+        sections = self.sections()
+        applied = 0
+        for op in ops:
+            if not isinstance(op, dict):
+                continue
+            kind = op.get("op")
+            title = str(op.get("section") or "").strip()
+            key = str(op.get("key") or "").strip()
+            if kind not in ("add", "update", "delete") or not title or not key:
+                continue
+            sec = next((s for s in sections if s["title"].lower() == title.lower()), None)
+            if kind == "delete":
+                if sec and sec["facts"].pop(key, None) is not None:
+                    applied += 1
+                    if not sec["facts"]:
+                        sections.remove(sec)
+                continue
+            value = str(op.get("value") or "").strip()
+            if not value:
+                continue
+            if sec is None:
+                sec = {"title": title, "level": 2, "facts": {}}
+                sections.append(sec)
+            sec["facts"][key] = value if _is_bullet(value) else f"- **{key}**: {value}"
+            applied += 1
+
+        if applied:
+            markdown = _render_sections(sections)
+            tmp = self.markdown_file.with_suffix(".tmp")
+            tmp.write_text(markdown, encoding="utf-8")
+            tmp.replace(self.markdown_file)
+            self._save_json(hashlib.sha256(markdown.encode("utf-8")).hexdigest())
+            self._signature = self._stat()
+            self.version += 1
+        return applied
+
+    def prompt_view(self, query: str, max_tokens: int) -> str:
+        """
+        Render memory for a prompt within max_tokens.
+
+        Small memories are rendered in full. Larger ones become a key index of
+        every section plus the full text of the sections most relevant to query.
+        """
+        sections = self.sections()
+        full = _render_sections(sections)
+        if _estimate_tokens(full) <= max_tokens:
+            return full
+
+        words = set(_WORD_RE.findall(query.lower()))
+
+        def score(sec: dict) -> int:
+            text = sec["title"] + " " + " ".join(f"{k} {v}" for k, v in sec["facts"].items())
+            return len(words & set(_WORD_RE.findall(text.lower())))
+
+        index = "\n".join(
+            f"- {sec['title'] or '(untitled)'}: {', '.join(sec['facts'])}" for sec in sections
+        )
+        budget = max_tokens - _estimate_tokens(index)
+        chosen = []
+        for sec in sorted(sections, key=score, reverse=True):
+            if score(sec) == 0:
+                break
+            cost = _estimate_tokens(_render_sections([sec]))
+            if cost <= budget:
+                chosen.append(sec)
+                budget -= cost
+        relevant = _render_sections([s for s in sections if s in chosen]) or "(none)"
+        return f"### Index (section: keys)\n{index}\n\n### Relevant sections\n{relevant}"
+
+    def _save_json(self, digest: str) -> None:
+        ensure_dir(self.path.parent)
+        self.path.write_text(
+            json.dumps({"version": 1, "markdownSha": digest, "sections": self._sections},
+                       ensure_ascii=False),
+            encoding="utf-8",
+        )
+
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (indexed, searchable log)."""
 
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, watcher: WatcherService | None = None):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self.checkpoint_dir = self.memory_dir / ".consolidation"
+        self.facts = FactStore(self.memory_dir / "facts.json", self.memory_file)
+        self.history = HistoryIndex(self.memory_dir)
+        # With a watcher MEMORY.md is read once and cached until it changes
+        self._long_term: str | None = None
+        self._watched = watcher is not None
+        if watcher is not None:
+            self.facts.watched = True
+            watcher.watch(self.memory_file, self._on_memory_file_changed)
+
+    def _on_memory_file_changed(self, changed: set[Path]) -> None:
+        self._long_term = None
+        self.facts.invalidate()
 
     def read_long_term(self) -> str:
-        if self.memory_file.exists():
-            return self.memory_file.read_text(encoding="utf-8")
-        return ""
+        if self._long_term is not None:
+            return self._long_term
+        content = self.memory_file.read_text(encoding="utf-8") if self.memory_file.exists() else ""
+        if self._watched:
+            self._long_term = content
+        return content
 
     def write_long_term(self, content: str) -> None:
         self.memory_file.write_text(content, encoding="utf-8")
+        self._long_term = None
+        self.facts.invalidate()
+
+    def apply_memory_ops(self, ops: list[dict]) -> int:
+        """Apply structured add/update/delete operations to long-term memory."""
+        applied = self.facts.apply(ops)
+        if applied:
+            self._long_term = None
+        return applied
 
     def append_history(self, entry: str) -> None:
-        with open(self.history_file, "a", encoding="utf-8") as f:
-            f.write(entry.rstrip() + "\n\n")
+        self.history.append(entry)
 
     def get_memory_context(self) -> str:
         long_term = self.read_long_term()
@@ -74,11 +373,26 @@ class MemoryStore:
         *,
         archive_all: bool = False,
         memory_window: int = 50,
+        chunk_tokens: int = 12000,
+        max_parallel: int = 4,
+        memory_tokens: int = 2000,
     ) -> None:
-        """Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool call."""
+        """
+        Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool call.
+
+        Backlogs larger than chunk_tokens are map-reduced: the conversation is
+        split into chunks that are summarized in parallel (at most max_parallel
+        at a time) and the partial summaries are consolidated in one final call.
+        Finished chunk summaries are checkpointed, so an interrupted run resumes
+        where it stopped.
+
+        Long-term memory is updated with add/update/delete operations; only the
+        sections relevant to the conversation (within memory_tokens) are sent.
+        """
         if archive_all:
             old_messages = session.messages
             keep_count = 0
+            consolidated_upto = 0
             logger.info("Memory consolidation (archive_all): {} messages", len(session.messages))
         else:
             keep_count = memory_window // 2
@@ -89,6 +403,8 @@ class MemoryStore:
             old_messages = session.messages[session.last_consolidated:-keep_count]
             if not old_messages:
                 return
+            # Fixed now: messages may keep arriving while a large backlog is processed
+            consolidated_upto = len(session.messages) - keep_count
             logger.info("Memory consolidation: {} to consolidate, {} keep", len(old_messages), keep_count)
 
         lines = []
@@ -98,19 +414,30 @@ class MemoryStore:
             tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
             lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
 
-        current_memory = self.read_long_term()
-        prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
+        conversation = "\n".join(lines)
+        heading = "Conversation to Process"
+
+        try:
+            checkpoint = None
+            if _estimate_tokens(conversation) > chunk_tokens:
+                checkpoint = self._checkpoint_path(session.key)
+                conversation = await self._map_reduce(
+                    lines, provider, model, chunk_tokens, max_parallel, checkpoint,
+                )
+                heading = "Conversation to Process (summarized in parts, oldest first)"
+
+            current_memory = self.facts.prompt_view(conversation, memory_tokens)
+            prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
 
 ## Current Long-term Memory
-{current_memory or "(empty)"}
+{current_memory.strip() or "(empty)"}
 
-## Conversation to Process
-{chr(10).join(lines)}"""
+## {heading}
+{conversation}"""
 
-        try:
             response = await provider.chat(
                 messages=[
-                    {"role": "system", "content": "You are a memory consolidation agent. Call the save_memory tool with your consolidation of the conversation."},
+                    {"role": "system", "content": "You are a memory consolidation agent. Call the save_memory tool with your consolidation of the conversation. Record long-term memory changes as memory_ops; never repeat facts that are unchanged."},
                     {"role": "user", "content": prompt},
                 ],
                 tools=_SAVE_MEMORY_TOOL,
@@ -126,13 +453,104 @@ class MemoryStore:
                 if not isinstance(entry, str):
                     entry = json.dumps(entry, ensure_ascii=False)
                 self.append_history(entry)
+            ops = args.get("memory_ops") or []
+            if isinstance(ops, str):
+                try:
+                    ops = json.loads(ops)
+                except ValueError:
+                    ops = []
+            if isinstance(ops, list) and ops:
+                logger.info("Memory consolidation: {} memory ops applied", self.apply_memory_ops(ops))
             if update := args.get("memory_update"):
+                # Legacy full rewrite, from models that ignore memory_ops
                 if not isinstance(update, str):
                     update = json.dumps(update, ensure_ascii=False)
-                if update != current_memory:
-                    self.write_long_term(update)
+                if current_memory == _render_sections(self.facts.sections()):
+                    if update != self.read_long_term():
+                        self.write_long_term(update)
+                else:
+                    # The model only saw part of memory: merge, never drop facts it wasn't shown
+                    merged = self.apply_memory_ops(_rewrite_as_ops(update, self.facts.sections()))
+                    logger.info("Memory consolidation: partial memory_update merged as {} ops", merged)
 
-            session.last_consolidated = 0 if archive_all else len(session.messages) - keep_count
+            if checkpoint:
+                checkpoint.unlink(missing_ok=True)
+            session.last_consolidated = consolidated_upto
             logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
         except Exception as e:
             logger.error("Memory consolidation failed: {}", e)
+
+    def _checkpoint_path(self, key: str) -> Path:
+        return self.checkpoint_dir / f"{safe_filename(key.replace(':', '_'))}.json"
+
+    async def _map_reduce(
+        self,
+        lines: list[str],
+        provider: LLMProvider,
+        model: str,
+        chunk_tokens: int,
+        max_parallel: int,
+        checkpoint: Path,
+    ) -> str:
+        """
+        Summarize lines chunk by chunk until the result fits in one chunk.
+
+        Chunk summaries are checkpointed by chunk digest, so a retry reuses
+        every chunk that is unchanged even if new messages were appended.
+        """
+        done = self._load_checkpoint(checkpoint)
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+        async def summarize(chunk: str, index: int, total: int) -> str:
+            digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+            if digest in done:
+                return done[digest]
+            async with semaphore:
+                response = await provider.chat(
+                    messages=[
+                        {"role": "system", "content": _CHUNK_SYSTEM_PROMPT},
+                        {"role": "user", "content": f"## Part {index + 1} of {total}\n{chunk}"},
+                    ],
+                    model=model,
+                )
+            if response.finish_reason == "error" or not response.content:
+                raise RuntimeError(f"chunk {index + 1}/{total} summary failed: {response.content}")
+            done[digest] = response.content.strip()
+            self._save_checkpoint(checkpoint, done)
+            return done[digest]
+
+        parts = lines
+        previous = None
+        while True:
+            chunks = _split_chunks(parts, chunk_tokens)
+            logger.info("Memory consolidation: summarizing {} chunks", len(chunks))
+            summaries = await asyncio.gather(
+                *(summarize(c, i, len(chunks)) for i, c in enumerate(chunks))
+            )
+            parts = [f"### Part {i + 1}\n{s}" for i, s in enumerate(summaries)]
+            combined = "\n\n".join(parts)
+            # Stop when it fits, or when another round would not shrink it further
+            if _estimate_tokens(combined) <= chunk_tokens or len(chunks) in (1, previous):
+                return combined
+            previous = len(chunks)
+
+    def _load_checkpoint(self, path: Path) -> dict[str, str]:
+        if not path.exists():
+            return {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        summaries = data.get("summaries", {})
+        if summaries:
+            logger.info("Memory consolidation: resuming with {} checkpointed chunks", len(summaries))
+        return summaries
+
+    def _save_checkpoint(self, path: Path, summaries: dict[str, str]) -> None:
+        ensure_dir(path.parent)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"summaries": summaries}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
@@ -0,0 +1,313 @@
+"""Embedding-based retrieval of memory facts and history entries for the prompt."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+from loguru import logger
+
+from nanobot.agent.history import tokenize
+from nanobot.agent.memory import _estimate_tokens, _render_sections
+
+if TYPE_CHECKING:
+    from nanobot.agent.memory import MemoryStore
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+MAX_ENTRY_CHARS = 800
+
+
+class Embedder(Protocol):
+    """Turns texts into fixed-size vectors. `name` identifies the vector space."""
+
+    name: str
+
+    async def embed(self, texts: list[str]) -> list[list[float]]: ...
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vec))
+    return [v / norm for v in vec] if norm else vec
+
+
+class HashingEmbedder:
+    """
+    Local CPU embedder with no model download.
+
+    Stemmed terms, term bigrams and character 4-grams are hashed into a fixed
+    number of signed buckets, so accents, plurals and small spelling variants
+    land close together. Vectors are sparse and L2-normalized.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature: str) -> tuple[int, float]:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+        return h % self.dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        out = []
+        for text in texts:
+            vec = [0.0] * self.dim
+            terms = tokenize(text)
+            features: list[tuple[str, float]] = [(t, 1.0) for t in terms]
+            features += [(f"{a} {b}", 0.5) for a, b in zip(terms, terms[1:])]
+            for t in terms:
+                padded = f"<{t}>"
+                features += [(padded[i:i + 4], 0.25) for i in range(len(padded) - 3)]
+            for feature, weight in features:
+                idx, sign = self._bucket(feature)
+                vec[idx] += sign * weight
+            out.append(_normalize(vec))
+        return out
+
+
+class LiteLLMEmbedder:
+    """Remote embeddings through LiteLLM (e.g. 'text-embedding-3-small')."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.name = f"litellm:{model}"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        import litellm
+
+        response = await litellm.aembedding(model=self.model, input=texts)
+        return [_normalize(list(item["embedding"])) for item in response.data]
+
+
+def make_embedder(model: str = "") -> Embedder:
+    """Local hashing embedder when model is empty, otherwise a LiteLLM embedding model."""
+    return LiteLLMEmbedder(model) if model else HashingEmbedder()
+
+
+def _item_id(kind: str, text: str) -> str:
+    return hashlib.sha1(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+
+
+class VectorIndex:
+    """
+    Flat float32 vector store: memory/vectors.f32 rows + memory/vectors.json items.
+
+    Rows are content-addressed, so unchanged items are never re-embedded and
+    new ones are appended in place. Scoring uses a NumPy memory map when NumPy
+    is installed and a sparse pure-Python dot product otherwise.
+    """
+
+    def __init__(self, memory_dir: Path, embedder: Embedder):
+        self.vectors_file = memory_dir / "vectors.f32"
+        self.meta_file = memory_dir / "vectors.json"
+        self.embedder = embedder
+        self.dim = 0
+        self.items: list[dict] = []
+        self.extra: dict = {}
+        self._rows = array("f")
+        self._matrix = None
+        self._loaded = False
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not (self.meta_file.exists() and self.vectors_file.exists()):
+            return
+        try:
+            meta = json.loads(self.meta_file.read_text(encoding="utf-8"))
+            if meta.get("embedder") != self.embedder.name:
+                logger.info("Vector index built with {}, re-embedding", meta.get("embedder"))
+                return
+            rows = array("f")
+            with open(self.vectors_file, "rb") as f:
+                rows.fromfile(f, len(meta["items"]) * meta["dim"])
+            self.dim, self.items, self.extra, self._rows = meta["dim"], meta["items"], meta.get("extra", {}), rows
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            logger.warning("Vector index unreadable, rebuilding: {}", e)
+
+    async def update(self, wanted: list[dict], extra: dict | None = None) -> None:
+        """Make the index hold exactly the wanted items ({'id', 'kind', 'text', ...})."""
+        self.load()
+        extra_changed = extra is not None and extra != self.extra
+        if extra is not None:
+            self.extra = extra
+        known = {item["id"]: i for i, item in enumerate(self.items)}
+        wanted_ids = {item["id"] for item in wanted}
+        new = [item for item in wanted if item["id"] not in known]
+        removed = len(known) - len(known.keys() & wanted_ids)
+        if not new and not removed:
+            if extra_changed:
+                self._save_meta()
+            return
+
+        vectors = await self.embedder.embed([item["text"] for item in new]) if new else []
+        if vectors and not self.dim:
+            self.dim = len(vectors[0])
+
+        if removed or not known:
+            rows = array("f")
+            kept = [item for item in self.items if item["id"] in wanted_ids]
+            for item in kept:
+                i = known[item["id"]]
+                rows.extend(self._rows[i * self.dim:(i + 1) * self.dim])
+            self._rows, self.items = rows, kept
+            for vec in vectors:
+                self._rows.extend(vec)
+            with open(self.vectors_file, "wb") as f:
+                self._rows.tofile(f)
+        else:
+            appended = array("f")
+            for vec in vectors:
+                appended.extend(vec)
+            self._rows.extend(appended)
+            with open(self.vectors_file, "ab") as f:
+                appended.tofile(f)
+        self.items.extend(new)
+        self._matrix = None
+        self._save_meta()
+
+    def _save_meta(self) -> None:
+        data = {"version": 1, "embedder": self.embedder.name, "dim": self.dim,
+                "items": self.items, "extra": self.extra}
+        tmp = self.meta_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.meta_file)
+
+    def search(self, vector: list[float], limit: int, kinds: set[str] | None = None) -> list[tuple[float, dict]]:
+        """Top items by cosine similarity (vectors are normalized)."""
+        self.load()
+        if not self.items or not self.dim:
+            return []
+        if NUMPY_AVAILABLE:
+            if self._matrix is None:
+                self._matrix = np.memmap(self.vectors_file, dtype=np.float32, mode="r",
+                                         shape=(len(self.items), self.dim))
+            scores = (self._matrix @ np.asarray(vector, dtype=np.float32)).tolist()
+        else:
+            nz = [(j, v) for j, v in enumerate(vector) if v]
+            dim, rows = self.dim, self._rows
+            scores = [sum(v * rows[base + j] for j, v in nz)
+                      for base in range(0, len(self.items) * dim, dim)]
+        ranked = sorted(
+            (i for i, item in enumerate(self.items) if kinds is None or item["kind"] in kinds),
+            key=lambda i: -scores[i],
+        )
+        return [(scores[i], self.items[i]) for i in ranked[:limit]]
+
+
+class MemoryRetriever:
+    """
+    Picks the memory facts and history entries relevant to the current turn.
+
+    A long-term memory that fits in half the budget is still injected in
+    full; beyond that only the top-k matching facts are. Related history
+    entries fill the rest, so the prompt stays flat as memory grows.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryStore,
+        embedder: Embedder | None = None,
+        top_k: int = 8,
+        max_tokens: int = 1500,
+        min_score: float = 0.15,
+    ):
+        self.memory = memory
+        self.index = VectorIndex(memory.memory_dir, embedder or HashingEmbedder())
+        self.top_k = top_k
+        self.max_tokens = max_tokens
+        self.min_score = min_score
+        self._fact_items: list[dict] = []
+        self._facts_version: int | None = None
+
+    async def sync(self) -> None:
+        """Embed facts and history entries added since the last sync."""
+        facts = self.memory.facts
+        sections = facts.sections()
+        if facts.version != self._facts_version:
+            self._fact_items = []
+            for sec in sections:
+                for key, line in sec["facts"].items():
+                    text = f"{sec['title']}: {line}" if sec["title"] else line
+                    self._fact_items.append({"id": _item_id("fact", text), "kind": "fact", "text": text,
+                                             "section": sec["title"], "key": key, "line": line})
+            self._facts_version = facts.version
+
+        self.index.load()
+        history = self.memory.history
+        history.refresh()
+        signature = history.signature()
+        previous = self.index.extra.get("historySegments") or {}
+        if signature == previous:
+            history_items = [item for item in self.index.items if item["kind"] == "history"]
+        else:
+            appended_only = all(
+                name in signature and (signature[name][0] > size or signature[name] == [size, mtime])
+                for name, (size, mtime) in previous.items()
+            )
+            # After a rewrite or rotation re-collect every entry; unchanged ones keep their vectors
+            seen = self.index.extra.get("historySeen", 0) if appended_only else 0
+            old = [item for item in self.index.items if item["kind"] == "history"] if seen else []
+            history_items = old + [
+                {"id": _item_id("history", e["text"]), "kind": "history",
+                 "date": e["date"], "text": e["text"][:MAX_ENTRY_CHARS]}
+                for e in history.entries(seen)
+            ]
+        extra = {"historySegments": signature, "historySeen": len(history)}
+        # Duplicate entries collapse onto one row
+        wanted = list({item["id"]: item for item in self._fact_items + history_items}.values())
+        await self.index.update(wanted, extra)
+
+    async def build_context(self, query: str) -> str:
+        """Memory section for the system prompt, relevant to query, within max_tokens."""
+        try:
+            await self.sync()
+            vector = (await self.index.embedder.embed([query]))[0] if query.strip() else None
+        except Exception as e:
+            logger.warning("Memory retrieval failed, using full long-term memory: {}", e)
+            return self.memory.get_memory_context()
+
+        parts = []
+        budget = self.max_tokens
+        full = self.memory.read_long_term()
+        if full and _estimate_tokens(full) <= self.max_tokens // 2:
+            parts.append(f"## Long-term Memory\n{full}")
+            budget -= _estimate_tokens(full)
+            kinds = {"history"}
+        else:
+            kinds = {"fact", "history"}
+
+        if vector is None:
+            return "\n\n".join(parts)
+
+        facts: dict[str, dict] = {}
+        entries: list[str] = []
+        for score, item in self.index.search(vector, self.top_k, kinds):
+            if score < self.min_score:
+                break
+            text = item.get("line") or item["text"]
+            cost = _estimate_tokens(text)
+            if cost > budget:
+                continue
+            budget -= cost
+            if item["kind"] == "fact":
+                sec = facts.setdefault(item["section"], {"title": item["section"], "level": 3, "facts": {}})
+                sec["facts"][item["key"]] = text
+            else:
+                entries.append(text)
+
+        if facts:
+            parts.append(f"## Long-term Memory (relevant facts)\n{_render_sections(list(facts.values()))}")
+        if entries:
+            parts.append("## Related History\n" + "\n\n".join(entries))
+        return "\n\n".join(parts)
@@ -5,6 +5,10 @@ import os
 import re
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from nanobot.watcher import WatcherService
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
@@ -16,12 +20,38 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    With a watcher, the skill index and SKILL.md contents are cached and
+    invalidated on change; without one, skills are re-read on every call.
     """
     
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        watcher: "WatcherService | None" = None,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self._cache: dict[Any, Any] | None = None
+        if watcher is not None:
+            self._cache = {}
+            watcher.watch(self.workspace_skills, self.invalidate, recursive=True)
+            if self.builtin_skills:
+                watcher.watch(self.builtin_skills, self.invalidate, recursive=True)
+
+    def invalidate(self, changed: set[Path] | None = None) -> None:
+        """Drop cached skill data (called by the watcher when skill files change)."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _cached(self, key: Any, compute: Callable[[], Any]) -> Any:
+        if self._cache is None:
+            return compute()
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,6 +63,14 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
+        skills = self._cached("index", self._scan_skills)
+        
+        # Filter by requirements
+        if filter_unavailable:
+            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
+        return list(skills)
+    
+    def _scan_skills(self) -> list[dict[str, str]]:
         skills = []
         
         # Workspace skills (highest priority)
@@ -50,10 +88,6 @@ class SkillsLoader:
                     skill_file = skill_dir / "SKILL.md"
                     if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
                         skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
         return skills
     
     def load_skill(self, name: str) -> str | None:
@@ -66,6 +100,9 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
+        return self._cached(("skill", name), lambda: self._read_skill(name))
+    
+    def _read_skill(self, name: str) -> str | None:
         # Check workspace first
         workspace_skill = self.workspace_skills / name / "SKILL.md"
         if workspace_skill.exists():
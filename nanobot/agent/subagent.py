@@ -2,9 +2,12 @@
 
 import asyncio
 import json
+import time
 import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from loguru import logger
 
@@ -13,8 +16,97 @@ from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.workspace_index import WorkspaceIndex
+from nanobot.agent.subagent_worker import SubagentWorkerPool, WorkerCrashedError
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+# Finished tasks kept for status/list
+FINISHED_HISTORY = 50
+
+
+@dataclass
+class SubagentTask:
+    """One spawned subagent: queued, running or finished."""
+
+    id: str
+    task: str
+    label: str
+    origin: dict[str, str]
+    priority: int = PRIORITIES["normal"]
+    timeout_s: float = 900.0
+    seq: int = 0
+    group: str | None = None  # Spawn group id; members are announced together
+    status: str = "queued"  # queued, running, ok, error, timeout, budget, cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    iterations: int = 0
+    tokens_used: int = 0
+    result: str | None = None
+    partial: str = ""  # Latest assistant text, returned if the run is cut short
+    cancel_status: str = "cancelled"  # Status recorded if the run is cancelled
+
+    @property
+    def origin_key(self) -> str:
+        return f"{self.origin['channel']}:{self.origin['chat_id']}"
+
+    @property
+    def queue_wait_s(self) -> float:
+        return ((self.started_at or self.finished_at or time.time()) - self.created_at)
+
+    @property
+    def run_s(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "group": self.group,
+            "label": self.label,
+            "task": self.task,
+            "origin": self.origin_key,
+            "priority": next(k for k, v in PRIORITIES.items() if v == self.priority),
+            "status": self.status,
+            "queueWaitS": round(self.queue_wait_s, 2),
+            "runS": round(self.run_s, 2) if self.run_s is not None else None,
+            "iterations": self.iterations,
+            "tokensUsed": self.tokens_used,
+            "result": self.result,
+        }
+
+
+@dataclass
+class SubagentGroup:
+    """Subtasks spawned together; their results come back as one message."""
+
+    id: str
+    label: str
+    origin: dict[str, str]
+    members: list[SubagentTask]
+    timeout_s: float
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    deadline: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return all(m.finished_at is not None for m in self.members)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "origin": f"{self.origin['channel']}:{self.origin['chat_id']}",
+            "status": "done" if self.finished_at else "running",
+            "members": [m.id for m in self.members],
+            "completed": sum(m.status == "ok" for m in self.members),
+        }
 
 
 class SubagentManager:
@@ -24,6 +116,16 @@ class SubagentManager:
     Subagents are lightweight agent instances that run in the background
     to handle specific tasks. They share the same LLM provider but have
     isolated context and a focused system prompt.
+
+    Spawned tasks wait in a priority (then FIFO) queue. At most
+    max_concurrent run at once, and at most max_per_origin for one chat, so
+    a burst of spawns can't saturate the provider or starve interactive
+    users. Each run has a deadline and a token budget; queue wait and run
+    times are recorded on the task.
+
+    With a worker pool, runs happen in separate processes (own event loop
+    and provider client, CPU/memory limits), so CPU-heavy tool work or a
+    crash can't stall or take down the gateway.
     """
     
     def __init__(
@@ -37,6 +139,14 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        max_concurrent: int = 3,
+        max_per_origin: int = 2,
+        max_queued: int = 20,
+        timeout_s: float = 900.0,
+        max_iterations: int = 15,
+        token_budget: int = 200_000,
+        worker_pool: SubagentWorkerPool | None = None,
+        workspace_index: WorkspaceIndex | None = None,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -48,7 +158,23 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_origin = max(1, max_per_origin)
+        self.max_queued = max_queued
+        self.timeout_s = timeout_s
+        self.max_iterations = max_iterations
+        self.token_budget = token_budget
+        self.worker_pool = worker_pool
+        self.workspace_index = workspace_index or WorkspaceIndex(workspace)
+        self.on_progress: Callable[[SubagentTask], None] | None = None
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        self._tasks: dict[str, SubagentTask] = {}  # Queued and running
+        self._queue: list[SubagentTask] = []
+        self._finished: deque[SubagentTask] = deque(maxlen=FINISHED_HISTORY)
+        self._groups: dict[str, SubagentGroup] = {}
+        self._seq = 0
+        self._tools: ToolRegistry | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
     
     async def spawn(
         self,
@@ -56,51 +182,296 @@ class SubagentManager:
         label: str | None = None,
         origin_channel: str = "cli",
         origin_chat_id: str = "direct",
+        priority: str = "normal",
+        timeout_s: float | None = None,
     ) -> str:
         """
-        Spawn a subagent to execute a task in the background.
+        Queue a subagent to execute a task in the background.
         
         Args:
             task: The task description for the subagent.
             label: Optional human-readable label for the task.
             origin_channel: The channel to announce results to.
             origin_chat_id: The chat ID to announce results to.
+            priority: 'high', 'normal' or 'low'.
+            timeout_s: Deadline for the run (capped by the manager's timeout).
         
         Returns:
-            Status message indicating the subagent was started.
+            Status message indicating the subagent was started or queued.
         """
-        task_id = str(uuid.uuid4())[:8]
-        display_label = label or task[:30] + ("..." if len(task) > 30 else "")
-        
-        origin = {
-            "channel": origin_channel,
-            "chat_id": origin_chat_id,
-        }
-        
-        # Create background task
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
+        if len(self._queue) >= self.max_queued:
+            return f"Error: subagent queue is full ({len(self._queue)} waiting). Try again later or cancel a task."
+        self._loop = asyncio.get_running_loop()
+        self._seq += 1
+        record = SubagentTask(
+            id=str(uuid.uuid4())[:8],
+            task=task,
+            label=label or task[:30] + ("..." if len(task) > 30 else ""),
+            origin={"channel": origin_channel, "chat_id": origin_chat_id},
+            priority=PRIORITIES.get(priority, PRIORITIES["normal"]),
+            timeout_s=min(timeout_s, self.timeout_s) if timeout_s else self.timeout_s,
+            seq=self._seq,
         )
-        self._running_tasks[task_id] = bg_task
-        
-        # Cleanup when done
-        bg_task.add_done_callback(lambda _: self._running_tasks.pop(task_id, None))
+        self._tasks[record.id] = record
+        self._queue.append(record)
+        self._pump()
         
-        logger.info("Spawned subagent [{}]: {}", task_id, display_label)
-        return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
+        if record.status == "running":
+            logger.info("Spawned subagent [{}]: {}", record.id, record.label)
+            return f"Subagent [{record.label}] started (id: {record.id}). I'll notify you when it completes."
+        position = self._queue.index(record) + 1
+        logger.info("Queued subagent [{}] at position {}: {}", record.id, position, record.label)
+        return (
+            f"Subagent [{record.label}] queued (id: {record.id}, position {position}). "
+            "It will start when a slot frees up; I'll notify you when it completes."
+        )
     
-    async def _run_subagent(
+    async def spawn_group(
         self,
-        task_id: str,
-        task: str,
-        label: str,
-        origin: dict[str, str],
-    ) -> None:
-        """Execute the subagent task and announce the result."""
-        logger.info("Subagent [{}] starting task: {}", task_id, label)
-        
+        tasks: list[str],
+        label: str | None = None,
+        origin_channel: str = "cli",
+        origin_chat_id: str = "direct",
+        priority: str = "normal",
+        timeout_s: float | None = None,
+    ) -> str:
+        """
+        Fan out several subtasks and fan their results back in as one message.
+
+        Members are scheduled like single subagents (same limits). When all
+        have finished, or the group deadline passes, one aggregated result is
+        announced, with partial results for members that were cut short.
+        """
+        tasks = [t for t in tasks if t and t.strip()]
+        if not tasks:
+            return "Error: a group needs at least one task"
+        if len(self._queue) + len(tasks) > self.max_queued + self.max_concurrent:
+            return f"Error: subagent queue is full ({len(self._queue)} waiting). Try fewer tasks or cancel some."
+        self._loop = asyncio.get_running_loop()
+        timeout = min(timeout_s, self.timeout_s) if timeout_s else self.timeout_s
+        group = SubagentGroup(
+            id=str(uuid.uuid4())[:8],
+            label=label or f"{len(tasks)} parallel tasks",
+            origin={"channel": origin_channel, "chat_id": origin_chat_id},
+            members=[],
+            timeout_s=timeout,
+        )
+        for i, task in enumerate(tasks, 1):
+            self._seq += 1
+            record = SubagentTask(
+                id=str(uuid.uuid4())[:8],
+                task=task,
+                label=f"{group.label} #{i}",
+                origin=group.origin,
+                priority=PRIORITIES.get(priority, PRIORITIES["normal"]),
+                timeout_s=timeout,
+                seq=self._seq,
+                group=group.id,
+            )
+            group.members.append(record)
+            self._tasks[record.id] = record
+            self._queue.append(record)
+        self._groups[group.id] = group
+        group.deadline = self._loop.call_later(timeout, self._expire_group, group.id)
+        self._pump()
+
+        running = sum(m.status == "running" for m in group.members)
+        logger.info("Spawned subagent group [{}] with {} tasks ({} running)", group.id, len(tasks), running)
+        return (
+            f"Subagent group [{group.label}] started (id: {group.id}) with {len(tasks)} tasks, "
+            f"{running} running now. I'll get all results together when they finish."
+        )
+
+    def _expire_group(self, group_id: str) -> None:
+        """Group deadline: cut short every member that hasn't finished."""
+        group = self._groups.get(group_id)
+        if group is None or group.finished_at:
+            return
+        logger.info("Subagent group [{}] deadline reached, collecting partial results", group_id)
+        for member in group.members:
+            if member.finished_at is None:
+                member.cancel_status = "timeout"
+                self.cancel(member.id)
+
+    def _member_done(self, record: SubagentTask) -> None:
+        group = self._groups.get(record.group or "")
+        if group is None or group.finished_at or not group.done:
+            return
+        group.finished_at = time.time()
+        if group.deadline:
+            group.deadline.cancel()
+        asyncio.get_running_loop().create_task(self._announce_group(group))
+
+    async def _announce_group(self, group: SubagentGroup) -> None:
+        """Announce all member results in one system message (one follow-up turn)."""
+        counts: dict[str, int] = {}
+        sections = []
+        for i, m in enumerate(group.members, 1):
+            counts[m.status] = counts.get(m.status, 0) + 1
+            if m.status == "ok":
+                body = m.result or ""
+            elif m.partial:
+                body = f"(partial - {m.status})\n{m.partial}"
+            else:
+                body = m.result or f"(no result - {m.status})"
+            sections.append(f"### {i}. {m.task}\nStatus: {m.status}\n{body}")
+        summary = ", ".join(f"{n} {status}" for status, n in counts.items())
+        content = f"""[Subagent group '{group.label}' finished: {summary}]
+
+{chr(10).join(sections)}
+
+Combine these results into one answer for the user. Mention anything that is missing or partial. Do not mention technical details like "subagent" or task IDs."""
+
+        await self.bus.publish_inbound(InboundMessage(
+            channel="system",
+            sender_id="subagent",
+            chat_id=f"{group.origin['channel']}:{group.origin['chat_id']}",
+            content=content,
+        ))
+        # Keep only recent groups around for status
+        for gid in [g.id for g in self._groups.values() if g.finished_at][:-FINISHED_HISTORY]:
+            self._groups.pop(gid, None)
+        logger.info("Subagent group [{}] announced ({})", group.id, summary)
+
+    def get_group(self, group_id: str) -> SubagentGroup | None:
+        return self._groups.get(group_id)
+
+    def list_groups(self) -> list[SubagentGroup]:
+        return list(self._groups.values())
+
+    # ---- scheduling ----
+    
+    def _pump(self) -> None:
+        """Start queued tasks while global and per-origin slots are free."""
+        while len(self._running_tasks) < self.max_concurrent:
+            per_origin: dict[str, int] = {}
+            for rid in self._running_tasks:
+                key = self._tasks[rid].origin_key
+                per_origin[key] = per_origin.get(key, 0) + 1
+            eligible = [r for r in self._queue if per_origin.get(r.origin_key, 0) < self.max_per_origin]
+            if not eligible:
+                return
+            record = min(eligible, key=lambda r: (r.priority, r.seq))
+            self._queue.remove(record)
+            record.status = "running"
+            record.started_at = time.time()
+            bg_task = asyncio.create_task(self._execute(record))
+            self._running_tasks[record.id] = bg_task
+            # Covers tasks cancelled before their coroutine got to run
+            bg_task.add_done_callback(lambda _, r=record: r.finished_at is None and self._cancelled(r))
+    
+    async def _execute(self, record: SubagentTask) -> None:
+        logger.info("Subagent [{}] starting task after {:.1f}s in queue: {}", record.id, record.queue_wait_s, record.label)
+        try:
+            run = self._run_in_worker(record) if self.worker_pool else self._run_subagent(record)
+            result, status = await asyncio.wait_for(run, timeout=record.timeout_s)
+        except asyncio.TimeoutError:
+            result, status = f"Error: timed out after {record.timeout_s:.0f}s", "timeout"
+            if record.partial:
+                result += f". Partial result:\n{record.partial}"
+        except asyncio.CancelledError:
+            self._cancelled(record)
+            raise
+        except Exception as e:
+            logger.error("Subagent [{}] failed: {}", record.id, e)
+            result, status = f"Error: {str(e)}", "error"
+        record.result, record.status = result, status
+        self._finish(record)
+        logger.info("Subagent [{}] {} in {:.1f}s ({} iterations, {} tokens)",
+                    record.id, status, record.run_s or 0, record.iterations, record.tokens_used)
+        if record.group:
+            return
+        await self._announce_result(record.id, record.label, record.task, result, record.origin,
+                                    "ok" if status == "ok" else "error")
+    
+    def _finish(self, record: SubagentTask) -> None:
+        record.finished_at = time.time()
+        self._running_tasks.pop(record.id, None)
+        self._tasks.pop(record.id, None)
+        self._finished.append(record)
+        self._pump()
+        if record.group:
+            self._member_done(record)
+    
+    def _cancelled(self, record: SubagentTask) -> None:
+        record.status = record.cancel_status
+        self._finish(record)
+    
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a queued or running subagent. Returns False if it is not active."""
+        record = self._tasks.get(task_id)
+        if record is None:
+            return False
+        if record in self._queue:
+            self._queue.remove(record)
+            self._cancelled(record)
+        elif bg_task := self._running_tasks.get(task_id):
+            bg_task.cancel()
+        logger.info("Subagent [{}] cancelled", task_id)
+        return True
+    
+    def cancel_threadsafe(self, task_id: str) -> bool:
+        """cancel() for callers outside the event loop thread (e.g. the API server)."""
+        if task_id not in self._tasks:
+            return False
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.cancel, task_id)
+        return True
+    
+    def get(self, task_id: str) -> SubagentTask | None:
+        return self._tasks.get(task_id) or next((r for r in self._finished if r.id == task_id), None)
+    
+    def list_tasks(self, include_finished: bool = True) -> list[SubagentTask]:
+        """Running, then queued (in start order), then recently finished tasks."""
+        running = [r for r in self._tasks.values() if r.status == "running"]
+        queued = sorted(self._queue, key=lambda r: (r.priority, r.seq))
+        finished = list(reversed(self._finished)) if include_finished else []
+        return running + queued + finished
+    
+    def stats(self) -> dict[str, Any]:
+        done = [r for r in self._finished if r.started_at is not None]
+        return {
+            "running": len(self._running_tasks),
+            "queued": len(self._queue),
+            "maxConcurrent": self.max_concurrent,
+            "maxPerOrigin": self.max_per_origin,
+            "avgQueueWaitS": round(sum(r.queue_wait_s for r in done) / len(done), 2) if done else 0.0,
+            "avgRunS": round(sum(r.run_s or 0 for r in done) / len(done), 2) if done else 0.0,
+        }
+    
+    # ---- execution ----
+    
+    async def _run_in_worker(self, record: SubagentTask) -> tuple[str, str]:
+        """Run the subagent loop in a worker process. Returns (result, status)."""
+        job = {
+            "id": record.id,
+            "task": record.task,
+            "workspace": str(self.workspace),
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "brave_api_key": self.brave_api_key,
+            "exec_config": self.exec_config.model_dump(),
+            "restrict_to_workspace": self.restrict_to_workspace,
+            "max_iterations": self.max_iterations,
+            "token_budget": self.token_budget,
+        }
+
+        def update(msg: dict) -> None:
+            record.iterations, record.tokens_used = msg["iterations"], msg["tokens"]
+            record.partial = msg["partial"] or record.partial
+
         try:
-            # Build subagent tools (no message tool, no spawn tool)
+            msg = await self.worker_pool.run(job, on_progress=update)
+        except WorkerCrashedError as e:
+            logger.error("Subagent [{}] worker crashed: {}", record.id, e)
+            return f"Error: {e} (it may have hit its CPU or memory limit)", "error"
+        update(msg)
+        return msg["result"], msg["status"]
+    
+    def _build_tools(self) -> ToolRegistry:
+        """Subagent tools (no message tool, no spawn tool); built once and shared."""
+        if self._tools is None:
             tools = ToolRegistry()
             allowed_dir = self.workspace if self.restrict_to_workspace else None
             tools.register(ReadFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
@@ -111,77 +482,86 @@ class SubagentManager:
                 working_dir=str(self.workspace),
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
+                max_output_chars=self.exec_config.max_output_chars,
+                artifacts_dir=self.workspace / "artifacts" / "exec" if self.exec_config.spill_output else None,
+                progress_interval_s=self.exec_config.progress_interval_s,
             ))
+            tools.register(SearchFilesTool(self.workspace_index))
             tools.register(WebSearchTool(api_key=self.brave_api_key))
             tools.register(WebFetchTool())
+            self._tools = tools
+        return self._tools
+    
+    async def _run_subagent(self, record: SubagentTask) -> tuple[str, str]:
+        """Run the subagent loop. Returns (result, status)."""
+        tools = self._build_tools()
+        
+        # Build messages with subagent-specific prompt
+        system_prompt = self._build_subagent_prompt(record.task)
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": record.task},
+        ]
+        
+        # Run agent loop (limited iterations and tokens)
+        final_result: str | None = None
+        
+        while record.iterations < self.max_iterations:
+            if self.token_budget and record.tokens_used >= self.token_budget:
+                last = next((m["content"] for m in reversed(messages) if m["role"] == "assistant" and m["content"]), "")
+                return (f"Stopped: token budget of {self.token_budget} exhausted.\n{last}".strip(), "budget")
+            record.iterations += 1
             
-            # Build messages with subagent-specific prompt
-            system_prompt = self._build_subagent_prompt(task)
-            messages: list[dict[str, Any]] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": task},
-            ]
-            
-            # Run agent loop (limited iterations)
-            max_iterations = 15
-            iteration = 0
-            final_result: str | None = None
+            response = await self.provider.chat(
+                messages=messages,
+                tools=tools.get_definitions(),
+                model=self.model,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
+            record.tokens_used += response.usage.get("total_tokens", 0)
+            if response.content:
+                record.partial = response.content
+            if self.on_progress:
+                self.on_progress(record)
             
-            while iteration < max_iterations:
-                iteration += 1
+            if response.has_tool_calls:
+                # Add assistant message with tool calls
+                tool_call_dicts = [
+                    {
+                        "id": tc.id,
+                        "type": "function",
+                        "function": {
+                            "name": tc.name,
+                            "arguments": json.dumps(tc.arguments, ensure_ascii=False),
+                        },
+                    }
+                    for tc in response.tool_calls
+                ]
+                messages.append({
+                    "role": "assistant",
+                    "content": response.content or "",
+                    "tool_calls": tool_call_dicts,
+                })
                 
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
-                
-                if response.has_tool_calls:
-                    # Add assistant message with tool calls
-                    tool_call_dicts = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments, ensure_ascii=False),
-                            },
-                        }
-                        for tc in response.tool_calls
-                    ]
+                # Execute tools
+                for tool_call in response.tool_calls:
+                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+                    logger.debug("Subagent [{}] executing: {} with arguments: {}", record.id, tool_call.name, args_str)
+                    result = await tools.execute(tool_call.name, tool_call.arguments)
                     messages.append({
-                        "role": "assistant",
-                        "content": response.content or "",
-                        "tool_calls": tool_call_dicts,
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "name": tool_call.name,
+                        "content": result,
                     })
-                    
-                    # Execute tools
-                    for tool_call in response.tool_calls:
-                        args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                        logger.debug("Subagent [{}] executing: {} with arguments: {}", task_id, tool_call.name, args_str)
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": tool_call.name,
-                            "content": result,
-                        })
-                else:
-                    final_result = response.content
-                    break
-            
-            if final_result is None:
-                final_result = "Task completed but no final response was generated."
-            
-            logger.info("Subagent [{}] completed successfully", task_id)
-            await self._announce_result(task_id, label, task, final_result, origin, "ok")
-            
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            logger.error("Subagent [{}] failed: {}", task_id, e)
-            await self._announce_result(task_id, label, task, error_msg, origin, "error")
+            else:
+                final_result = response.content
+                break
+        
+        if final_result is None:
+            final_result = "Task completed but no final response was generated."
+        return final_result, "ok"
     
     async def _announce_result(
         self,
@@ -252,6 +632,11 @@ Skills are available at: {self.workspace}/skills/ (read SKILL.md files as needed
 
 When you have completed the task, provide a clear summary of your findings or actions."""
     
+    def shutdown(self) -> None:
+        """Stop worker processes (if any)."""
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+    
     def get_running_count(self) -> int:
         """Return the number of currently running subagents."""
         return len(self._running_tasks)
@@ -0,0 +1,210 @@
+"""Worker processes for running subagents outside the gateway's event loop."""
+
+import asyncio
+import math
+import multiprocessing
+import os
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+
+
+class WorkerCrashedError(RuntimeError):
+    """A worker process died (resource limit, segfault, kill) while running a job."""
+
+
+def _apply_limits(memory_mb: int, nice: int) -> None:
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if nice > 0:
+        os.nice(nice)
+
+
+def _set_cpu_budget(cpu_s: int) -> None:
+    """Allow cpu_s more CPU seconds from now on (the limit is cumulative per process)."""
+    try:
+        import resource
+    except ImportError:
+        return
+    if cpu_s <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # Round up after adding: truncating the time already used would eat into this job's budget
+    soft = math.ceil(usage.ru_utime + usage.ru_stime + cpu_s)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft if hard < 0 else min(soft, hard), hard))
+
+
+async def _run_job(job: dict[str, Any], provider: LLMProvider, conn: Connection) -> dict[str, Any]:
+    from pathlib import Path
+
+    from nanobot.agent.subagent import SubagentManager, SubagentTask
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.schema import ExecToolConfig
+
+    manager = SubagentManager(
+        provider=provider,
+        workspace=Path(job["workspace"]),
+        bus=MessageBus(),
+        model=job["model"],
+        temperature=job["temperature"],
+        max_tokens=job["max_tokens"],
+        brave_api_key=job["brave_api_key"],
+        exec_config=ExecToolConfig(**job["exec_config"]),
+        restrict_to_workspace=job["restrict_to_workspace"],
+        max_iterations=job["max_iterations"],
+        token_budget=job["token_budget"],
+    )
+    record = SubagentTask(id=job["id"], task=job["task"], label=job["id"], origin={"channel": "", "chat_id": ""})
+    manager.on_progress = lambda r: conn.send({
+        "type": "progress", "iterations": r.iterations, "tokens": r.tokens_used, "partial": r.partial,
+    })
+    try:
+        result, status = await manager._run_subagent(record)
+    except Exception as e:
+        result, status = f"Error: {str(e)}", "error"
+    return {
+        "type": "result", "result": result, "status": status,
+        "iterations": record.iterations, "tokens": record.tokens_used, "partial": record.partial,
+    }
+
+
+def _worker_main(
+    conn: Connection,
+    provider_factory: Callable[[], LLMProvider],
+    memory_mb: int,
+    cpu_s: int,
+    nice: int,
+) -> None:
+    """Worker process: own event loop and provider client, one job at a time."""
+    _apply_limits(memory_mb, nice)
+    provider = provider_factory()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        _set_cpu_budget(cpu_s)
+        conn.send(loop.run_until_complete(_run_job(job, provider, conn)))
+
+
+@dataclass
+class _Worker:
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+
+
+class SubagentWorkerPool:
+    """
+    A small pool of long-lived worker processes for subagents.
+
+    Workers are started on demand (spawn start method, so nothing of the
+    gateway's loop or threads is inherited) and reused across jobs. Each one
+    runs at a lower CPU priority, under an address-space limit and a per-job
+    CPU-time limit. Messages travel over a pipe; a cancelled job kills its
+    worker, which is replaced on the next run.
+    """
+
+    def __init__(
+        self,
+        provider_factory: Callable[[], LLMProvider],
+        size: int = 2,
+        memory_mb: int = 2048,
+        cpu_s: int = 0,
+        nice: int = 10,
+    ):
+        self.provider_factory = provider_factory
+        self.size = max(1, size)
+        self.memory_mb = memory_mb
+        self.cpu_s = cpu_s
+        self.nice = nice
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: list[_Worker] = []
+        self._slots: asyncio.Semaphore | None = None
+
+    def _spawn(self) -> _Worker:
+        parent, child = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child, self.provider_factory, self.memory_mb, self.cpu_s, self.nice),
+            daemon=True,
+            name="nanobot-subagent",
+        )
+        process.start()
+        child.close()
+        logger.debug("Subagent worker {} started", process.pid)
+        return _Worker(process=process, conn=parent)
+
+    async def _recv(self, worker: _Worker) -> Any:
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        fd = worker.conn.fileno()
+
+        def ready() -> None:
+            loop.remove_reader(fd)
+            if fut.done():
+                return
+            try:
+                fut.set_result(worker.conn.recv())
+            except (EOFError, OSError) as e:
+                fut.set_exception(e)
+
+        loop.add_reader(fd, ready)
+        try:
+            return await fut
+        finally:
+            loop.remove_reader(fd)
+
+    def _kill(self, worker: _Worker) -> None:
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.conn.close()
+
+    @staticmethod
+    async def _reap(worker: _Worker) -> None:
+        # join() blocks; wait in a thread so a slow-to-die worker does not stall the event loop
+        await asyncio.to_thread(worker.process.join, 1)
+
+    async def run(self, job: dict[str, Any], on_progress: Callable[[dict], None] | None = None) -> dict[str, Any]:
+        """Run job in a worker; returns its result message. Raises WorkerCrashedError if the worker dies."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else self._spawn()
+            try:
+                worker.conn.send(job)
+                while True:
+                    msg = await self._recv(worker)
+                    if msg.get("type") == "progress":
+                        if on_progress:
+                            on_progress(msg)
+                        continue
+                    self._idle.append(worker)
+                    return msg
+            except (EOFError, OSError, BrokenPipeError):
+                await self._reap(worker)
+                code = worker.process.exitcode
+                self._kill(worker)
+                raise WorkerCrashedError(f"subagent worker exited unexpectedly (exit code {code})")
+            except BaseException:
+                # Cancelled (deadline or user): the worker may be mid-job, so it is not reused
+                self._kill(worker)
+                await self._reap(worker)
+                raise
+
+    def shutdown(self) -> None:
+        # Not joined: SIGKILLed daemon workers are reaped by multiprocessing on its next start or at exit
+        for worker in self._idle:
+            self._kill(worker)
+        self._idle.clear()
@@ -0,0 +1,90 @@
+"""Tool to read stored tool-result artifacts."""
+
+import re
+from typing import Any
+
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.base import Tool
+
+
+class ArtifactReadTool(Tool):
+    """Tool to page through or search a large tool result saved as an artifact."""
+
+    # Its pages are already bounded; spilling them again would never end
+    spill_results = False
+
+    def __init__(self, store: ArtifactStore, max_chars: int = 8_000):
+        self._store = store
+        self._max_chars = max_chars
+
+    @property
+    def name(self) -> str:
+        return "artifact_read"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read a large tool result that was saved as an artifact (the truncated result names its handle). "
+            "Returns a page of characters starting at offset, or with pattern, the matching lines."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": "Artifact handle, e.g. art_0123456789abcdef"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to start reading from",
+                    "minimum": 0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max characters to return (default 8000)",
+                    "minimum": 1
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": "Regular expression; return only matching lines (case-insensitive)"
+                }
+            },
+            "required": ["handle"]
+        }
+
+    async def execute(
+        self, handle: str, offset: int = 0, limit: int | None = None, pattern: str = "", **kwargs: Any,
+    ) -> str:
+        content = self._store.read(handle.strip())
+        if content is None:
+            return f"Error: Artifact not found: {handle}"
+        limit = min(limit or self._max_chars, self._max_chars)
+
+        if pattern:
+            try:
+                rx = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                return f"Error: Invalid regular expression: {e}"
+            lines, size, total = [], 0, 0
+            for n, line in enumerate(content.splitlines(), 1):
+                if not rx.search(line):
+                    continue
+                total += 1
+                entry = f"{n}: {line[:500]}"
+                if size + len(entry) <= limit:
+                    lines.append(entry)
+                    size += len(entry) + 1
+            if not total:
+                return f"No lines match {pattern!r} in {handle}."
+            header = f"[{handle}: {total} matching lines" + (f", first {len(lines)} shown" if len(lines) < total else "") + "]"
+            return "\n".join([header, *lines])
+
+        if offset >= len(content):
+            return f"Error: offset {offset} is past the end of {handle} ({len(content):,} chars)"
+        page = content[offset:offset + limit]
+        end = offset + len(page)
+        note = f"continue with offset={end}" if end < len(content) else "end of artifact"
+        return f"[{handle}: chars {offset:,}-{end:,} of {len(content):,} | {note}]\n{page}"
@@ -1,7 +1,7 @@
 """Base class for agent tools."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable
 
 
 class Tool(ABC):
@@ -52,43 +52,94 @@ class Tool(ABC):
         """
         pass
 
+    # Results over the registry's artifact threshold are stored and replaced by a preview
+    spill_results: bool = True
+
+    # Memoization: idempotent tools opt in by returning a key from cache_key
+    cache_ttl: float | None = None  # Max age of a memoized result in seconds (None: until the validator changes)
+
+    def cache_key(self, params: dict[str, Any]) -> str | None:
+        """Key for a call whose result can be reused while cache_validator is unchanged (None: never)."""
+        return None
+
+    async def cache_validator(self, params: dict[str, Any]) -> Any:
+        """Cheap token for the state the call's result depends on (e.g. a file's mtime)."""
+        return None
+
+    def is_cacheable_result(self, result: str) -> bool:
+        """Whether a result may be memoized (errors are not)."""
+        return not result.startswith("Error")
+
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
+        validator = self.__dict__.get("_validator")
+        if validator is None:
+            validator = self.compile_validator()
+        return validator(params, "")
+
+    def compile_validator(self) -> Callable[[Any, str], list[str]]:
+        """
+        Turn the parameter schema into a validator function, once.
+
+        The schema is walked a single time here; validate_params then only
+        runs the resulting closures. Tools whose parameters change after
+        construction must delete _validator to recompile.
+        """
         schema = self.parameters or {}
         if schema.get("type", "object") != "object":
             raise ValueError(f"Schema must be object type, got {schema.get('type')!r}")
-        return self._validate(params, {**schema, "type": "object"}, "")
+        self._validator = self._compile({**schema, "type": "object"})
+        return self._validator
 
-    def _validate(self, val: Any, schema: dict[str, Any], path: str) -> list[str]:
-        t, label = schema.get("type"), path or "parameter"
-        if t in self._TYPE_MAP and not isinstance(val, self._TYPE_MAP[t]):
-            return [f"{label} should be {t}"]
-        
-        errors = []
-        if "enum" in schema and val not in schema["enum"]:
-            errors.append(f"{label} must be one of {schema['enum']}")
+    @classmethod
+    def _compile(cls, schema: dict[str, Any]) -> Callable[[Any, str], list[str]]:
+        if not isinstance(schema, dict):
+            return lambda val, path: []  # e.g. boolean sub-schemas from MCP servers
+        t = schema.get("type")
+        py_type = cls._TYPE_MAP.get(t) if isinstance(t, str) else None
+        enum = schema["enum"] if "enum" in schema else None
+        bounds = []
         if t in ("integer", "number"):
-            if "minimum" in schema and val < schema["minimum"]:
-                errors.append(f"{label} must be >= {schema['minimum']}")
-            if "maximum" in schema and val > schema["maximum"]:
-                errors.append(f"{label} must be <= {schema['maximum']}")
+            if "minimum" in schema:
+                bounds.append((lambda v, m=schema["minimum"]: v < m, f"must be >= {schema['minimum']}"))
+            if "maximum" in schema:
+                bounds.append((lambda v, m=schema["maximum"]: v > m, f"must be <= {schema['maximum']}"))
         if t == "string":
-            if "minLength" in schema and len(val) < schema["minLength"]:
-                errors.append(f"{label} must be at least {schema['minLength']} chars")
-            if "maxLength" in schema and len(val) > schema["maxLength"]:
-                errors.append(f"{label} must be at most {schema['maxLength']} chars")
+            if "minLength" in schema:
+                bounds.append((lambda v, m=schema["minLength"]: len(v) < m, f"must be at least {schema['minLength']} chars"))
+            if "maxLength" in schema:
+                bounds.append((lambda v, m=schema["maxLength"]: len(v) > m, f"must be at most {schema['maxLength']} chars"))
+        props: dict[str, Callable[[Any, str], list[str]]] = {}
+        required: tuple[str, ...] = ()
         if t == "object":
-            props = schema.get("properties", {})
-            for k in schema.get("required", []):
-                if k not in val:
-                    errors.append(f"missing required {path + '.' + k if path else k}")
-            for k, v in val.items():
-                if k in props:
-                    errors.extend(self._validate(v, props[k], path + '.' + k if path else k))
-        if t == "array" and "items" in schema:
-            for i, item in enumerate(val):
-                errors.extend(self._validate(item, schema["items"], f"{path}[{i}]" if path else f"[{i}]"))
-        return errors
+            props = {k: cls._compile(v) for k, v in schema.get("properties", {}).items()}
+            required = tuple(schema.get("required", ()))
+        items = cls._compile(schema["items"]) if t == "array" and "items" in schema else None
+
+        def check(val: Any, path: str) -> list[str]:
+            label = path or "parameter"
+            if py_type is not None and not isinstance(val, py_type):
+                return [f"{label} should be {t}"]
+
+            errors = []
+            if enum is not None and val not in enum:
+                errors.append(f"{label} must be one of {enum}")
+            for failed, message in bounds:
+                if failed(val):
+                    errors.append(f"{label} {message}")
+            if required or props:
+                for k in required:
+                    if k not in val:
+                        errors.append(f"missing required {path + '.' + k if path else k}")
+                for k, v in val.items():
+                    if k in props:
+                        errors.extend(props[k](v, path + '.' + k if path else k))
+            if items is not None:
+                for i, item in enumerate(val):
+                    errors.extend(items(item, f"{path}[{i}]" if path else f"[{i}]"))
+            return errors
+
+        return check
     
     def to_schema(self) -> dict[str, Any]:
         """Convert tool to OpenAI function schema format."""
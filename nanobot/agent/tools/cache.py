@@ -0,0 +1,60 @@
+"""Memoized results for idempotent tool calls."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _CachedResult:
+    validator: Any
+    stored_at: float
+    result: str
+
+
+class ToolResultCache:
+    """
+    Bounded LRU of tool results.
+
+    Entries are keyed by (scope, tool name, the tool's cache key). A hit is
+    only served while the tool's validator for the call (file mtime, mailbox
+    UIDNEXT...) still equals the one stored with the result, and, for tools
+    with a cache_ttl, while the entry is younger than that.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, _CachedResult] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple, validator: Any, ttl: float | None = None) -> tuple[str, float] | None:
+        """Returns (result, age in seconds) for a fresh entry, else None."""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry.validator != validator or (ttl is not None and now - entry.stored_at > ttl):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result, now - entry.stored_at
+
+    def put(self, key: tuple, validator: Any, result: str) -> None:
+        self._entries[key] = _CachedResult(validator=validator, stored_at=time.monotonic(), result=result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self, scope: str | None = None) -> None:
+        """Drop every entry, or only those of one scope."""
+        if scope is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == scope]:
+            del self._entries[key]
@@ -64,6 +64,15 @@ class CronTool(Tool):
                     "type": "string",
                     "description": "ISO datetime for one-time execution (e.g. '2026-02-12T10:30:00')"
                 },
+                "recipients": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Broadcast to these chats instead of the current one ('channel:chat_id' each); the message is produced once and sent to all"
+                },
+                "spread_seconds": {
+                    "type": "integer",
+                    "description": "Spread broadcast deliveries over this many seconds"
+                },
                 "job_id": {
                     "type": "string",
                     "description": "Job ID (for remove)"
@@ -82,10 +91,14 @@ class CronTool(Tool):
         tz: str | None = None,
         at: str | None = None,
         job_id: str | None = None,
+        recipients: list[str] | None = None,
+        spread_seconds: int = 0,
         **kwargs: Any
     ) -> str:
         if action == "add":
-            return self._add_job(message, every_seconds, delay_seconds, cron_expr, tz, at)
+            return self._add_job(
+                message, every_seconds, delay_seconds, cron_expr, tz, at, recipients, spread_seconds,
+            )
         elif action == "list":
             return self._list_jobs()
         elif action == "remove":
@@ -100,11 +113,15 @@ class CronTool(Tool):
         cron_expr: str | None,
         tz: str | None,
         at: str | None,
+        recipients: list[str] | None = None,
+        spread_seconds: int = 0,
     ) -> str:
         if not message:
             return "Error: message is required for add"
         if not self._channel or not self._chat_id:
             return "Error: no session context (channel/chat_id)"
+        if recipients and any(":" not in r for r in recipients):
+            return "Error: recipients must be 'channel:chat_id'"
         if tz and not cron_expr:
             return "Error: tz can only be used with cron_expr"
         if tz:
@@ -141,7 +158,11 @@ class CronTool(Tool):
             channel=self._channel,
             to=self._chat_id,
             delete_after_run=delete_after,
+            recipients=recipients,
+            spread_s=spread_seconds,
         )
+        if recipients:
+            return f"Created broadcast job '{job.name}' (id: {job.id}) for {len(recipients)} recipients"
         return f"Created job '{job.name}' (id: {job.id})"
     
     def _list_jobs(self) -> str:
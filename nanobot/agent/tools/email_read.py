@@ -9,6 +9,8 @@ import imaplib
 import re
 from typing import Any
 
+from loguru import logger
+
 from nanobot.agent.tools.base import Tool
 
 
@@ -95,6 +97,9 @@ class EmailReadTool(Tool):
         "required": ["query"],
     }
 
+    # Flag changes other than \Seen only show up with CONDSTORE; the TTL bounds staleness without it
+    cache_ttl = 120
+
     def __init__(
         self,
         imap_host: str = "",
@@ -109,6 +114,44 @@ class EmailReadTool(Tool):
         self.password = password
         self.use_ssl = use_ssl
 
+    def cache_key(self, params: dict[str, Any]) -> str | None:
+        return repr((
+            params.get("query", "ALL").strip(), min(params.get("max_results", 5), 20),
+            params.get("include_body", True), params.get("mailbox", "INBOX"),
+        ))
+
+    async def cache_validator(self, params: dict[str, Any]) -> Any:
+        """
+        Mailbox state a cached result is valid for.
+
+        Each check logs in and runs STATUS, so a hit saves the search, fetch
+        and parsing but still pays the IMAP connection and login.
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self._mailbox_status, params.get("mailbox", "INBOX"),
+        )
+
+    def _mailbox_status(self, mailbox: str) -> bytes:
+        """Synchronous IMAP STATUS (runs in executor)."""
+        if self.use_ssl:
+            conn = imaplib.IMAP4_SSL(self.imap_host, self.imap_port)
+        else:
+            conn = imaplib.IMAP4(self.imap_host, self.imap_port)
+        try:
+            conn.login(self.username, self.password)
+            # New, deleted or moved messages change UIDNEXT or MESSAGES; flags read
+            # elsewhere change UNSEEN, and any flag change bumps HIGHESTMODSEQ
+            items = "MESSAGES UIDNEXT UIDVALIDITY UNSEEN"
+            if "CONDSTORE" in conn.capabilities:
+                items += " HIGHESTMODSEQ"
+            _, data = conn.status(mailbox, f"({items})")
+            return data[0]
+        finally:
+            try:
+                conn.logout()
+            except Exception:
+                pass
+
     async def execute(
         self,
         query: str = "ALL",
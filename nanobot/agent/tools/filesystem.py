@@ -1,10 +1,34 @@
 """File system tools: read, write, edit."""
 
+import asyncio
+import codecs
 import difflib
+import fnmatch
+import mmap
+import os
+import tempfile
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.workspace_index import is_ignored, load_gitignore
+
+# Files up to this size are read and decoded whole; larger ones are memory-mapped
+_SMALL_FILE_BYTES = 1024 * 1024
+# Granularity of the newline index for memory-mapped files
+_INDEX_CHUNK = 256 * 1024
+_INDEX_CACHE_SIZE = 32
+_SNIFF_BYTES = 8192
+# Candidate window starts that get a full similarity score in edit_file diagnostics
+_EDIT_CANDIDATES = 8
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"), (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"),
+)
 
 
 def _resolve_path(path: str, workspace: Path | None = None, allowed_dir: Path | None = None) -> Path:
@@ -18,12 +42,104 @@ def _resolve_path(path: str, workspace: Path | None = None, allowed_dir: Path |
     return resolved
 
 
+def _detect_encoding(sample: bytes) -> str | None:
+    """Best-guess text encoding of a file from its first bytes; None if it looks binary."""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if b"\0" in sample:
+        return None
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return "latin-1"
+    best = from_bytes(sample).best()
+    return best.encoding if best else "latin-1"
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    """Whether b"\\n" marks line ends in this encoding (false for UTF-16/32)."""
+    return codecs.lookup(encoding).name not in ("utf-16", "utf-16-le", "utf-16-be", "utf-32", "utf-32-le", "utf-32-be")
+
+
+@dataclass
+class _LineIndex:
+    """Newline counts at every _INDEX_CHUNK boundary of a file."""
+
+    mtime_ns: int
+    size: int
+    newlines_before: list[int]  # Newlines before chunk i; the last entry is the file total
+
+    def total_lines(self, buf: Any) -> int:
+        total = self.newlines_before[-1]
+        return total + 1 if self.size and buf[self.size - 1:self.size] != b"\n" else total
+
+    def line_start(self, buf: Any, line: int) -> int:
+        """Byte offset where 0-based line starts (scans at most one chunk)."""
+        if line <= 0:
+            return 0
+        if line > self.newlines_before[-1]:
+            return self.size
+        chunk = bisect_left(self.newlines_before, line) - 1
+        pos = chunk * _INDEX_CHUNK
+        for _ in range(line - self.newlines_before[chunk]):
+            pos = buf.find(b"\n", pos) + 1
+        return pos
+
+
+_line_indexes: "OrderedDict[Path, _LineIndex]" = OrderedDict()
+
+
+def _line_index(path: Path, mtime_ns: int, buf: Any) -> _LineIndex:
+    """Newline index of path, cached per (path, mtime, size)."""
+    size = len(buf)
+    cached = _line_indexes.get(path)
+    if cached and cached.mtime_ns == mtime_ns and cached.size == size:
+        _line_indexes.move_to_end(path)
+        return cached
+    counts = [0]
+    for pos in range(0, size, _INDEX_CHUNK):
+        counts.append(counts[-1] + buf[pos:pos + _INDEX_CHUNK].count(b"\n"))
+    index = _LineIndex(mtime_ns=mtime_ns, size=size, newlines_before=counts)
+    _line_indexes[path] = index
+    while len(_line_indexes) > _INDEX_CACHE_SIZE:
+        _line_indexes.popitem(last=False)
+    return index
+
+
+def _human_size(n: float) -> str:
+    if n < 1024:
+        return f"{int(n):,} B"
+    for unit in ("KB", "MB", "GB"):
+        n /= 1024
+        if n < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}"
+
+
+def _hexdump(data: bytes, start: int) -> str:
+    rows = []
+    for i in range(0, len(data), 16):
+        row = data[i:i + 16]
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in row)
+        rows.append(f"{start + i:08x}  {row.hex(' '):<47}  {text}")
+    return "\n".join(rows)
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents."""
 
-    def __init__(self, workspace: Path | None = None, allowed_dir: Path | None = None):
+    # Pages itself (offset/limit, continuation header); a spilled preview would skip lines
+    spill_results = False
+
+    def __init__(self, workspace: Path | None = None, allowed_dir: Path | None = None, max_chars: int = 50_000):
         self._workspace = workspace
         self._allowed_dir = allowed_dir
+        self.max_chars = max_chars
 
     @property
     def name(self) -> str:
@@ -31,7 +147,11 @@ class ReadFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Read the contents of a file at the given path."
+        return (
+            "Read the contents of a file at the given path. Large files return the first part "
+            "with their total line count; use offset/limit to page by line (negative offset "
+            "counts from the end), or byte_offset/byte_limit for byte ranges and binary files."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -41,26 +161,151 @@ class ReadFileTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The file path to read"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "First line to read (1-based; negative counts from the end, e.g. -100 for the last 100 lines)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read",
+                    "minimum": 1
+                },
+                "byte_offset": {
+                    "type": "integer",
+                    "description": "Read raw bytes starting here instead of lines (hex dump for binary files)",
+                    "minimum": 0
+                },
+                "byte_limit": {
+                    "type": "integer",
+                    "description": "Number of bytes to read with byte_offset",
+                    "minimum": 1
+                },
+                "encoding": {
+                    "type": "string",
+                    "description": "Text encoding (detected automatically if omitted)"
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        byte_offset: int | None = None,
+        byte_limit: int | None = None,
+        encoding: str | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._workspace, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
             if not file_path.is_file():
                 return f"Error: Not a file: {path}"
-
-            content = file_path.read_text(encoding="utf-8")
-            return content
+            if encoding:
+                codecs.lookup(encoding)
+
+            st = file_path.stat()
+            if st.st_size == 0:
+                return ""
+            with open(file_path, "rb") as f:
+                if st.st_size <= _SMALL_FILE_BYTES:
+                    return self._read(file_path, f.read(), st.st_mtime_ns, offset, limit, byte_offset, byte_limit, encoding)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._read(file_path, mm, st.st_mtime_ns, offset, limit, byte_offset, byte_limit, encoding)
         except PermissionError as e:
             return f"Error: {e}"
+        except LookupError:
+            return f"Error: Unknown encoding: {encoding}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    def cache_key(self, params: dict[str, Any]) -> str | None:
+        try:
+            path = _resolve_path(params["path"], self._workspace, self._allowed_dir)
+        except (KeyError, PermissionError):
+            return None
+        return repr((str(path), *(params.get(k) for k in ("offset", "limit", "byte_offset", "byte_limit", "encoding"))))
+
+    async def cache_validator(self, params: dict[str, Any]) -> Any:
+        st = _resolve_path(params["path"], self._workspace, self._allowed_dir).stat()
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _read(
+        self,
+        file_path: Path,
+        buf: Any,
+        mtime_ns: int,
+        offset: int | None,
+        limit: int | None,
+        byte_offset: int | None,
+        byte_limit: int | None,
+        encoding: str | None,
+    ) -> str:
+        size = len(buf)
+        encoding = encoding or _detect_encoding(buf[:_SNIFF_BYTES])
+        name = file_path.name
+
+        if byte_offset is not None or byte_limit is not None:
+            start = min(byte_offset or 0, size)
+            end = min(size, start + (byte_limit or (4096 if encoding is None else self.max_chars)))
+            header = f"[{name}: {_human_size(size)} | bytes {start}-{end} of {size}]"
+            if encoding is None:
+                return f"{header}\n{_hexdump(bytes(buf[start:min(end, start + 4096)]), start)}"
+            return f"{header}\n{bytes(buf[start:end]).decode(encoding, errors='replace')}"
+
+        if encoding is None:
+            return (
+                f"Error: {name} looks like a binary file ({_human_size(size)}). "
+                "Use byte_offset/byte_limit to view a hex dump of a range."
+            )
+
+        if isinstance(buf, bytes):
+            text = buf.decode(encoding, errors="replace")
+            if offset is None and limit is None and len(text) <= self.max_chars:
+                return text
+            lines = text.splitlines(keepends=True)
+            total = len(lines)
+            first = self._first_line(offset, total)
+            window = "".join(lines[first:first + limit] if limit else lines[first:])
+        else:
+            if not _is_ascii_compatible(encoding):
+                return f"Error: {name} is a large {encoding} file; use byte_offset/byte_limit to read it in ranges."
+            index = _line_index(file_path, mtime_ns, buf)
+            total = index.total_lines(buf)
+            first = self._first_line(offset, total)
+            start = index.line_start(buf, first)
+            end = index.line_start(buf, first + limit) if limit else size
+            # Never decode more than the output can hold
+            end = min(end, start + self.max_chars * 4)
+            window = bytes(buf[start:end]).decode(encoding, errors="replace")
+
+        truncated = len(window) > self.max_chars
+        if truncated:
+            cut = window.rfind("\n", 0, self.max_chars)
+            window = window[:cut + 1] if cut >= 0 else window[:self.max_chars]
+        shown = window.count("\n") + (0 if not window or window.endswith("\n") else 1)
+        last = first + shown
+        header = f"[{name}: {total:,} lines, {_human_size(size)} | lines {first + 1}-{last} shown"
+        if last < total:
+            header += f" | continue with offset={last + 1}"
+        header += "]"
+        if truncated and shown <= 1:
+            header += " (line truncated; use byte_offset/byte_limit for the rest)"
+        return f"{header}\n{window}"
+
+    @staticmethod
+    def _first_line(offset: int | None, total: int) -> int:
+        """0-based first line for a 1-based (or negative, from the end) offset."""
+        if offset is None or offset == 0:
+            return 0
+        if offset < 0:
+            return max(0, total + offset)
+        return min(offset - 1, total)
+
 
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
@@ -106,6 +351,57 @@ class WriteFileTool(Tool):
             return f"Error writing file: {str(e)}"
 
 
+def _atomic_write(path: Path, content: str) -> None:
+    """Replace path's content in one step (temp file + rename), keeping its permissions."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _candidate_starts(old_lines: list[str], lines: list[str], limit: int = _EDIT_CANDIDATES) -> list[int]:
+    """
+    Likely start lines of old_text in the file, without scoring every window.
+
+    Each (whitespace-normalized) line of old_text that also occurs in the file
+    votes for the window start it implies; rare lines weigh more than common
+    ones such as a lone brace.
+    """
+    positions: dict[str, list[int]] = {}
+    for j, line in enumerate(lines):
+        key = line.strip()
+        if key:
+            positions.setdefault(key, []).append(j)
+
+    votes: dict[int, float] = {}
+    for i, line in enumerate(old_lines):
+        hits = positions.get(line.strip(), ())
+        for j in hits:
+            votes[j - i] = votes.get(j - i, 0.0) + 1.0 / len(hits)
+
+    max_start = max(0, len(lines) - len(old_lines))
+    ranked = sorted(votes.items(), key=lambda kv: -kv[1])
+    starts: list[int] = []
+    for start, _ in ranked:
+        start = min(max(start, 0), max_start)
+        if start not in starts:
+            starts.append(start)
+        if len(starts) == limit:
+            break
+    return starts
+
+
 class EditFileTool(Tool):
     """Tool to edit a file by replacing text."""
 
@@ -119,7 +415,10 @@ class EditFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
+        return (
+            "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file. "
+            "For several changes to one file, pass them as edits (applied in order, written once)."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -137,30 +436,68 @@ class EditFileTool(Tool):
                 "new_text": {
                     "type": "string",
                     "description": "The text to replace with"
+                },
+                "edits": {
+                    "type": "array",
+                    "description": "Several replacements, applied in order; if any fails, the file is left unchanged",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "old_text": {"type": "string"},
+                            "new_text": {"type": "string"}
+                        },
+                        "required": ["old_text", "new_text"]
+                    }
                 }
             },
-            "required": ["path", "old_text", "new_text"]
+            "required": ["path"]
         }
     
-    async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        old_text: str | None = None,
+        new_text: str | None = None,
+        edits: list[dict[str, str]] | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._workspace, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
 
+            if edits is None:
+                if old_text is None or new_text is None:
+                    return "Error: Provide old_text and new_text, or edits"
+                edits = [{"old_text": old_text, "new_text": new_text}]
+            elif old_text is not None:
+                edits = [{"old_text": old_text, "new_text": new_text or ""}, *edits]
+            if not edits:
+                return "Error: edits is empty"
+
             content = file_path.read_text(encoding="utf-8")
 
-            if old_text not in content:
-                return self._not_found_message(old_text, content, path)
+            for n, edit in enumerate(edits, 1):
+                old, new = edit["old_text"], edit["new_text"]
+                label = f"edit {n}: " if len(edits) > 1 else ""
+                if old not in content:
+                    message = await asyncio.to_thread(self._not_found_message, old, content, path)
+                    return f"{label}{message}" + (" No edits were applied." if len(edits) > 1 else "")
 
-            # Count occurrences
-            count = content.count(old_text)
-            if count > 1:
-                return f"Warning: old_text appears {count} times. Please provide more context to make it unique."
+                # Count occurrences
+                count = content.count(old)
+                if count > 1:
+                    return (
+                        f"Warning: {label}old_text appears {count} times. Please provide more context to make it unique."
+                        + (" No edits were applied." if len(edits) > 1 else "")
+                    )
 
-            new_content = content.replace(old_text, new_text, 1)
-            file_path.write_text(new_content, encoding="utf-8")
+                content = content.replace(old, new, 1)
 
+            _atomic_write(file_path, content)
+
+            if len(edits) > 1:
+                return f"Successfully applied {len(edits)} edits to {file_path}"
             return f"Successfully edited {file_path}"
         except PermissionError as e:
             return f"Error: {e}"
@@ -175,7 +512,7 @@ class EditFileTool(Tool):
         window = len(old_lines)
 
         best_ratio, best_start = 0.0, 0
-        for i in range(max(1, len(lines) - window + 1)):
+        for i in _candidate_starts(old_lines, lines):
             ratio = difflib.SequenceMatcher(None, old_lines, lines[i : i + window]).ratio()
             if ratio > best_ratio:
                 best_ratio, best_start = ratio, i
@@ -193,9 +530,13 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
 
-    def __init__(self, workspace: Path | None = None, allowed_dir: Path | None = None):
+    # Pages itself with cursor/limit
+    spill_results = False
+
+    def __init__(self, workspace: Path | None = None, allowed_dir: Path | None = None, max_entries: int = 200):
         self._workspace = workspace
         self._allowed_dir = allowed_dir
+        self.max_entries = max_entries
 
     @property
     def name(self) -> str:
@@ -203,7 +544,11 @@ class ListDirTool(Tool):
     
     @property
     def description(self) -> str:
-        return "List the contents of a directory."
+        return (
+            "List the contents of a directory with file sizes; directories that are not expanded "
+            "show their item count. Use depth to list subdirectories too, glob to filter files, "
+            "and cursor to continue a long listing."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -213,12 +558,46 @@ class ListDirTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The directory path to list"
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "Levels to list (1 = only this directory, max 5)",
+                    "minimum": 1,
+                    "maximum": 5
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only list files whose name matches these patterns, comma-separated (e.g. '*.py,*.md')"
+                },
+                "details": {
+                    "type": "boolean",
+                    "description": "Also show modification times"
+                },
+                "cursor": {
+                    "type": "integer",
+                    "description": "Continue a previous listing from this entry",
+                    "minimum": 0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max entries to return (default 200)",
+                    "minimum": 1,
+                    "maximum": 1000
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        depth: int = 1,
+        glob: str = "",
+        details: bool = False,
+        cursor: int = 0,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             dir_path = _resolve_path(path, self._workspace, self._allowed_dir)
             if not dir_path.exists():
@@ -226,16 +605,83 @@ class ListDirTool(Tool):
             if not dir_path.is_dir():
                 return f"Error: Not a directory: {path}"
 
-            items = []
-            for item in sorted(dir_path.iterdir()):
-                prefix = "📁 " if item.is_dir() else "📄 "
-                items.append(f"{prefix}{item.name}")
+            limit = limit or self.max_entries
+            globs = [g.strip() for g in glob.split(",") if g.strip()]
+            walk = self._walk(dir_path, "", 0, max(1, depth), globs, load_gitignore(dir_path))
+
+            # Walk the whole listing (not just this page) so the totals cover all of it
+            items, dirs, files, total_size, seen = [], 0, 0, 0, 0
+            for level, entry, count, ignored in walk:
+                seen += 1
+                on_page = cursor < seen <= cursor + limit
+                indent = "  " * level
+                if entry.is_dir():
+                    dirs += 1
+                    if on_page:
+                        note = " (ignored)" if ignored else f"  ({count} items)" if count is not None else ""
+                        items.append(f"{indent}📁 {entry.name}/{note}")
+                    continue
+                files += 1
+                try:
+                    st = entry.stat()
+                    size, mtime = st.st_size, st.st_mtime
+                except OSError:
+                    size, mtime = 0, None
+                total_size += size
+                if on_page:
+                    line = f"{indent}📄 {entry.name}  {_human_size(size)}"
+                    if details and mtime is not None:
+                        line += f"  {datetime.fromtimestamp(mtime):%Y-%m-%d %H:%M}"
+                    items.append(line)
 
             if not items:
-                return f"Directory {path} is empty"
-
-            return "\n".join(items)
+                if cursor:
+                    return f"No more entries in {path}"
+                return f"Directory {path} is empty" if not globs else f"No files matching {glob} in {path}"
+
+            summary = f"{dirs} dirs, {files} files ({_human_size(total_size)})"
+            end = cursor + len(items)
+            if cursor or end < seen:
+                summary += f" in total; showing entries {cursor + 1}-{end} of {seen}"
+            if end < seen:
+                summary += f"; more entries remain, continue with cursor={end}"
+            return "\n".join(items) + f"\n\n{summary}"
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error listing directory: {str(e)}"
+
+    def _walk(
+        self, directory: Path | str, rel: str, level: int, depth: int, globs: list[str], patterns: list[str],
+    ) -> Iterator[tuple[int, os.DirEntry, int | None, bool]]:
+        """Yield (level, entry, item count of unexpanded dirs, ignored) in listing order."""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            if level == 0:
+                raise
+            return
+        for entry in entries:
+            entry_rel = rel + entry.name
+            if not entry.is_dir():
+                if is_ignored(entry_rel, False, patterns):
+                    continue
+                if not globs or any(fnmatch.fnmatch(entry.name, g) for g in globs):
+                    yield level, entry, None, False
+                continue
+            ignored = is_ignored(entry_rel, True, patterns)
+            if ignored:
+                yield level, entry, None, True
+            elif level + 1 < depth and not entry.is_symlink():
+                yield level, entry, None, False
+                yield from self._walk(entry.path, entry_rel + "/", level + 1, depth, globs, patterns)
+            else:
+                try:
+                    with os.scandir(entry.path) as sub:
+                        count = sum(
+                            1 for e in sub if not is_ignored(f"{entry_rel}/{e.name}", e.is_dir(), patterns)
+                        )
+                except OSError:
+                    count = None
+                yield level, entry, count, False
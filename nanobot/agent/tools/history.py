@@ -0,0 +1,84 @@
+"""History search tool."""
+
+import re
+from typing import Any
+
+from nanobot.agent.history import HistoryIndex
+from nanobot.agent.tools.base import Tool
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class HistorySearchTool(Tool):
+    """Tool to search past conversation summaries in HISTORY.md and its segments."""
+
+    def __init__(self, index: HistoryIndex, max_chars: int = 1200):
+        self._index = index
+        self._max_chars = max_chars
+
+    @property
+    def name(self) -> str:
+        return "history_search"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search the log of past conversations (memory/HISTORY.md and older monthly segments). "
+            "Returns only the best matching entries. Without a query, returns the latest entries "
+            "in the date range."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords to search for (accents and plurals are ignored)"
+                },
+                "since": {
+                    "type": "string",
+                    "description": "Only entries on or after this date (YYYY-MM-DD)"
+                },
+                "until": {
+                    "type": "string",
+                    "description": "Only entries on or before this date (YYYY-MM-DD)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max entries to return (1-20, default 5)",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            }
+        }
+
+    async def execute(
+        self,
+        query: str = "",
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 5,
+        **kwargs: Any,
+    ) -> str:
+        for label, value in (("since", since), ("until", until)):
+            if value and not _DATE_RE.match(value):
+                return f"Error: {label} must be a date in YYYY-MM-DD format"
+        if not query.strip() and not since and not until:
+            return "Error: provide a query or a date range (since/until)"
+
+        try:
+            hits = self._index.search(query, since=since, until=until, limit=limit)
+        except Exception as e:
+            return f"Error searching history: {str(e)}"
+
+        if not hits:
+            return "No matching history entries."
+        lines = [f"Found {len(hits)} history entries:"]
+        for hit in hits:
+            text = hit["text"]
+            if len(text) > self._max_chars:
+                text = text[: self._max_chars] + "…"
+            lines.append(f"\n--- {hit['date'] or 'undated'} ({hit['segment']}) ---\n{text}")
+        return "\n".join(lines)
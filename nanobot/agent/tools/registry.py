@@ -1,8 +1,13 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+from contextvars import ContextVar
+from typing import Any, Collection
 
+from loguru import logger
+
+from nanobot.agent.artifacts import ArtifactStore
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.cache import ToolResultCache
 
 
 class ToolRegistry:
@@ -10,18 +15,53 @@ class ToolRegistry:
     Registry for agent tools.
     
     Allows dynamic registration and execution of tools.
+
+    Tool schemas are built once per registry version (bumped by register and
+    unregister) instead of on every LLM call, and each tool's parameter
+    validator is compiled when it is registered.
+
+    With a cache, results of tools that declare a cache_key are memoized
+    and served again while the tool's validator is unchanged. cache_scope
+    (e.g. the current session key) separates entries between conversations;
+    it is held per asyncio task, so concurrent turns each keep their own.
+
+    With an artifact store, results longer than its threshold are saved
+    there and only a preview with the artifact's handle is returned.
     """
     
-    def __init__(self):
+    def __init__(self, cache: ToolResultCache | None = None, artifacts: ArtifactStore | None = None):
         self._tools: dict[str, Tool] = {}
+        self._schemas: dict[str, dict[str, Any]] | None = None
+        self.version = 0
+        self.cache = cache
+        self.artifacts = artifacts
+        self._cache_scope: ContextVar[str] = ContextVar("tool_cache_scope", default="")
     
+    @property
+    def cache_scope(self) -> str:
+        return self._cache_scope.get()
+
+    @cache_scope.setter
+    def cache_scope(self, scope: str) -> None:
+        self._cache_scope.set(scope)
+
     def register(self, tool: Tool) -> None:
         """Register a tool."""
+        try:
+            tool.compile_validator()
+        except ValueError:
+            pass  # Invalid schema: reported by validate_params when the tool is called
         self._tools[tool.name] = tool
+        self._changed()
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._changed()
+
+    def _changed(self) -> None:
+        self._schemas = None
+        self.version += 1
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -31,9 +71,17 @@ class ToolRegistry:
         """Check if a tool is registered."""
         return name in self._tools
     
-    def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+    def get_definitions(self, names: Collection[str] | None = None) -> list[dict[str, Any]]:
+        """
+        Get tool definitions in OpenAI format (cached until the tool set changes).
+
+        With names, only those tools are included, in registration order.
+        """
+        if self._schemas is None:
+            self._schemas = {name: tool.to_schema() for name, tool in self._tools.items()}
+        if names is None:
+            return list(self._schemas.values())
+        return [schema for name, schema in self._schemas.items() if name in names]
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
@@ -57,9 +105,33 @@ class ToolRegistry:
             errors = tool.validate_params(params)
             if errors:
                 return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
-            return await tool.execute(**params)
+            age = None
+            if self.cache is not None and (key := tool.cache_key(params)) is not None:
+                result, age = await self._execute_cached(tool, (self.cache_scope, name, key), params)
+            else:
+                result = await tool.execute(**params)
+            if self.artifacts is not None and tool.spill_results and isinstance(result, str):
+                result = self.artifacts.spill(name, result)
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
+        if age is not None:
+            logger.debug("Tool cache hit: {} ({:.0f}s old)", name, age)
+            return f"[cached: identical call {age:.0f}s ago]\n{result}"
+        return result
+
+    async def _execute_cached(self, tool: Tool, key: tuple, params: dict[str, Any]) -> tuple[str, float | None]:
+        """Returns (result, age of the cached result or None if it was just computed)."""
+        try:
+            validator = await tool.cache_validator(params)
+        except Exception as e:
+            logger.debug("Cache validator for {} failed, running uncached: {}", tool.name, e)
+            return await tool.execute(**params), None
+        if hit := self.cache.get(key, validator, tool.cache_ttl):
+            return hit
+        result = await tool.execute(**params)
+        if tool.is_cacheable_result(result):
+            self.cache.put(key, validator, result)
+        return result, None
     
     @property
     def tool_names(self) -> list[str]:
@@ -0,0 +1,201 @@
+"""Per-turn tool selection: send the model only the tools a message is likely to need."""
+
+import math
+import re
+from contextvars import ContextVar
+from typing import Any
+
+from nanobot.agent.history import tokenize
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+# Always offered, whatever the message
+DEFAULT_CORE_TOOLS = (
+    "read_file", "write_file", "edit_file", "list_dir", "search_files", "exec", "message", "request_tools",
+    "artifact_read",
+)
+
+# Extra words (Portuguese and English) that point at built-in tools
+TOOL_HINTS = {
+    "web_search": "pesquisa pesquisar buscar busca procurar internet google web noticias news search online preço cotação",
+    "web_fetch": "link url site pagina página artigo abrir fetch download",
+    "email_read": "email e-mail emails inbox caixa entrada correio mensagens recebidas ler",
+    "email_send": "email e-mail enviar mandar responder send reply",
+    "email_delete": "email e-mail apagar excluir deletar lixo spam delete",
+    "google_calendar": "agenda calendario calendário evento eventos reuniao reunião compromisso horario meeting schedule",
+    "cron": "lembrete lembrar lembre avisar alarme agendar diariamente semanal todo dia remind reminder every",
+    "spawn": "subagente subagentes paralelo background tarefa longa demorada parallel",
+    "history_search": "lembra conversamos falamos ontem semana passada historico histórico antes history earlier",
+}
+
+# Tools worth offering on a channel whatever the message says
+CHANNEL_TOOLS = {
+    "email": ("email_read", "email_send"),
+}
+
+_URL_RE = re.compile(r"https?://\S+", re.I)
+
+
+class ToolRouter:
+    """
+    Picks a relevant subset of the registered tools for each turn.
+
+    Uses cheap local signals only: the core set, tools used recently in the
+    session, tools tied to the channel, a link in the message, and keyword
+    similarity (idf-weighted term overlap) between the message and each
+    tool's name, description, parameters and hint words. The model can load
+    anything else with request_tools.
+    """
+
+    def __init__(
+        self,
+        core: list[str] | tuple[str, ...] = DEFAULT_CORE_TOOLS,
+        max_tools: int = 12,
+        recent_messages: int = 20,
+    ):
+        self.core = tuple(core)
+        self.max_tools = max_tools
+        self.recent_messages = recent_messages
+        self._docs: dict[str, set[str]] = {}
+        self._idf: dict[str, float] = {}
+        self._version = -1
+
+    def _index(self, tools: ToolRegistry) -> None:
+        if self._version == tools.version:
+            return
+        self._docs = {}
+        for name in tools.tool_names:
+            tool = tools.get(name)
+            params = (tool.parameters or {}).get("properties", {})
+            text = " ".join([
+                name.replace("_", " "), tool.description, TOOL_HINTS.get(name, ""),
+                *(f"{k.replace('_', ' ')} {v.get('description', '')}" for k, v in params.items() if isinstance(v, dict)),
+            ])
+            self._docs[name] = set(tokenize(text))
+        df: dict[str, int] = {}
+        for terms in self._docs.values():
+            for term in terms:
+                df[term] = df.get(term, 0) + 1
+        n = len(self._docs)
+        self._idf = {term: math.log(1 + n / count) for term, count in df.items()}
+        self._version = tools.version
+
+    def rank(self, tools: ToolRegistry, text: str) -> list[tuple[str, float]]:
+        """Tools whose documentation shares terms with text, best first."""
+        self._index(tools)
+        query = set(tokenize(text))
+        scores = []
+        for name, terms in self._docs.items():
+            score = sum(self._idf[t] for t in query & terms)
+            if score > 0:
+                scores.append((name, score))
+        scores.sort(key=lambda s: -s[1])
+        return scores
+
+    def select(
+        self,
+        tools: ToolRegistry,
+        message: str,
+        channel: str = "",
+        history: list[dict[str, Any]] | None = None,
+    ) -> set[str]:
+        """Names of the tools to offer for a turn starting with message."""
+        available = set(tools.tool_names)
+        selected = {name for name in self.core if name in available}
+        for m in (history or [])[-self.recent_messages:]:
+            if m.get("role") == "tool" and m.get("name") in available:
+                selected.add(m["name"])
+        selected.update(name for name in CHANNEL_TOOLS.get(channel, ()) if name in available)
+        if _URL_RE.search(message) and "web_fetch" in available:
+            selected.add("web_fetch")
+        for name, _ in self.rank(tools, message):
+            if len(selected) >= self.max_tools:
+                break
+            selected.add(name)
+        return selected
+
+
+class RequestToolsTool(Tool):
+    """Tool that lets the model load tools left out of the current turn."""
+
+    def __init__(self, registry: ToolRegistry, router: ToolRouter):
+        self._registry = registry
+        self._router = router
+        self._active: ContextVar[set[str] | None] = ContextVar("active_tools", default=None)
+
+    @property
+    def active(self) -> set[str] | None:
+        """
+        The current turn's active tool names (set by the agent loop); None when every tool is offered.
+
+        Held per asyncio task, so a cron turn running alongside a chat turn loads tools into its own set.
+        """
+        return self._active.get()
+
+    @active.setter
+    def active(self, names: set[str] | None) -> None:
+        self._active.set(names)
+
+    @property
+    def name(self) -> str:
+        return "request_tools"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Only the tools that look relevant to this conversation are loaded. If you need another "
+            "capability (email, calendar, reminders, web, subagents, MCP tools...), call this with a "
+            "short description of what you need or with exact tool names; the tools become available "
+            "from your next step. Call it without arguments to list every tool."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "What you need to do, e.g. 'send an email' or 'schedule a reminder'"
+                },
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Exact names of tools to load"
+                }
+            }
+        }
+
+    async def execute(self, query: str = "", names: list[str] | None = None, **kwargs: Any) -> str:
+        active = self.active
+        if active is None:
+            return "All tools are already available."
+        inactive = [n for n in self._registry.tool_names if n not in active]
+
+        if not query and not names:
+            if not inactive:
+                return "All tools are already loaded."
+            lines = ["Tools you can load:"]
+            for name in inactive:
+                summary = self._registry.get(name).description.split(". ")[0].strip().rstrip(".")
+                lines.append(f"- {name}: {summary[:120]}")
+            return "\n".join(lines)
+
+        loaded, unknown = [], []
+        for name in names or []:
+            if not self._registry.has(name):
+                unknown.append(name)
+            elif name not in active:
+                loaded.append(name)
+        if query:
+            loaded += [n for n, _ in self._router.rank(self._registry, query) if n in inactive and n not in loaded][:3]
+        active.update(loaded)
+
+        parts = []
+        if loaded:
+            parts.append(f"Loaded: {', '.join(loaded)}. They are available from your next step.")
+        elif not unknown:
+            parts.append("No other matching tools. Call request_tools without arguments to list them all.")
+        if unknown:
+            parts.append(f"Unknown tools: {', '.join(unknown)}.")
+        return " ".join(parts)
@@ -0,0 +1,182 @@
+"""Workspace search tool."""
+
+import asyncio
+import fnmatch
+import re
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.workspace_index import WorkspaceIndex, required_literals
+
+
+def _glob_match(rel: str, globs: list[str]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    for glob in globs:
+        if "/" not in glob:
+            if fnmatch.fnmatchcase(name, glob):
+                return True
+        elif fnmatch.fnmatchcase(rel, glob) or fnmatch.fnmatchcase(rel, glob.replace("**/", "")):
+            return True
+    return False
+
+
+class SearchFilesTool(Tool):
+    """Tool to search file contents and names across the workspace."""
+
+    # Pages itself with offset/limit
+    spill_results = False
+
+    def __init__(self, index: WorkspaceIndex, max_line_chars: int = 200):
+        self._index = index
+        self._max_line_chars = max_line_chars
+
+    @property
+    def name(self) -> str:
+        return "search_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search the contents of files in the workspace with a regular expression (like grep -rn, "
+            "but indexed and much faster). Results are grouped by file, best files first, and paginated. "
+            "Without a query, lists the files matching glob. Prefer this over exec with grep or find."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Regular expression to search for (case-insensitive unless case_sensitive)"
+                },
+                "literal": {
+                    "type": "boolean",
+                    "description": "Treat query as plain text instead of a regex"
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only files matching these patterns, comma-separated (e.g. '*.py' or 'src/**/*.ts,*.md')"
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only search under this directory (relative to the workspace)"
+                },
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Match case exactly"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Number of results to skip (for the next page)",
+                    "minimum": 0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max results to return (1-200, default 30)",
+                    "minimum": 1,
+                    "maximum": 200
+                }
+            }
+        }
+
+    async def execute(
+        self,
+        query: str = "",
+        literal: bool = False,
+        glob: str = "",
+        path: str = "",
+        case_sensitive: bool = False,
+        offset: int = 0,
+        limit: int = 30,
+        **kwargs: Any,
+    ) -> str:
+        if not query and not glob:
+            return "Error: provide a query, a glob, or both"
+        try:
+            return await asyncio.to_thread(
+                self._search, query, literal, glob, path, case_sensitive, offset, limit,
+            )
+        except re.error as e:
+            return f"Error: Invalid regular expression: {e}"
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+    def _search(
+        self, query: str, literal: bool, glob: str, path: str, case_sensitive: bool, offset: int, limit: int,
+    ) -> str:
+        root = self._index.root
+        prefix = ""
+        if path:
+            target = Path(path).expanduser()
+            target = (target if target.is_absolute() else root / target).resolve()
+            if target != root and root not in target.parents:
+                return f"Error: path must be inside the workspace ({root})"
+            prefix = "" if target == root else target.relative_to(root).as_posix() + "/"
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        pattern = re.escape(query) if literal else query
+        rx = re.compile(pattern, flags) if query else None
+
+        self._index.refresh()
+        files = self._index.candidates(required_literals(pattern, flags) if query else [])
+        globs = [g.strip() for g in glob.split(",") if g.strip()]
+        files = [f for f in files if f.startswith(prefix) and (not globs or _glob_match(f, globs))]
+
+        if rx is None:
+            page = files[offset:offset + limit]
+            if not page:
+                return "No matching files." if not files else f"No more files (total {len(files)})."
+            header = f"Found {len(files)} files{self._page_note(offset, len(page), len(files))}"
+            return "\n".join([header, *page])
+
+        ranked = []
+        for rel in files:
+            try:
+                text = (root / rel).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            hits = [(n, line) for n, line in enumerate(text.splitlines(), 1) if rx.search(line)]
+            if hits:
+                ranked.append((rx.search(rel) is None, -len(hits), rel.count("/"), rel, hits))
+        ranked.sort(key=lambda r: r[:4])
+
+        total = sum(len(r[4]) for r in ranked)
+        if not total:
+            return "No matches."
+        lines, shown, skipped = [], 0, 0
+        for *_, rel, hits in ranked:
+            if shown >= limit:
+                break
+            if skipped + len(hits) <= offset:
+                skipped += len(hits)
+                continue
+            start = max(0, offset - skipped)
+            skipped += start
+            chunk = hits[start:start + limit - shown]
+            lines.append(f"{rel} ({len(hits)} matches)" if len(hits) > 1 else rel)
+            for n, line in chunk:
+                line = line.strip()
+                if len(line) > self._max_line_chars:
+                    line = line[:self._max_line_chars] + "…"
+                lines.append(f"  {n}: {line}")
+            shown += len(chunk)
+            skipped += len(chunk)
+        if not shown:
+            return f"No more matches (total {total})."
+        header = (
+            f"Found {total} match{'es' if total != 1 else ''} in {len(ranked)} file{'s' if len(ranked) != 1 else ''}"
+            f"{self._page_note(offset, shown, total)}"
+        )
+        return "\n".join([header, *lines])
+
+    @staticmethod
+    def _page_note(offset: int, shown: int, total: int) -> str:
+        if offset == 0 and shown == total:
+            return ":"
+        note = f" (showing {offset + 1}-{offset + shown}"
+        if offset + shown < total:
+            note += f"; next page: offset={offset + shown}"
+        return note + "):"
@@ -3,11 +3,184 @@
 import asyncio
 import os
 import re
+import shlex
+import shutil
+import signal
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Awaitable, Callable
 
 from nanobot.agent.tools.base import Tool
 
+_READ_CHUNK = 64 * 1024
+
+
+class OutputBuffer:
+    """
+    Bounded capture of one output stream.
+
+    Keeps the first head_bytes and the last tail_bytes and counts what falls
+    in between, so memory stays constant however much a command prints. With
+    a spill_path, the complete stream is also written to that file once it
+    outgrows the buffer (small outputs never touch the disk).
+    """
+
+    def __init__(self, head_bytes: int, tail_bytes: int, spill_path: Path | None = None):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.spill_path = spill_path
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self.spilled = False
+        self._spill: IO[bytes] | None = None
+
+    @property
+    def omitted(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        if self._spill:
+            self._spill.write(data)
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        if len(self.tail) + len(data) > self.tail_bytes and self.spill_path and not self.spilled:
+            # About to drop bytes: start the spill file with everything seen so far
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = open(self.spill_path, "wb")
+            self._spill.write(bytes(self.head) + bytes(self.tail) + data)
+            self.spilled = True
+        self.tail += data
+        if len(self.tail) > self.tail_bytes:
+            del self.tail[:len(self.tail) - self.tail_bytes]
+
+    def close(self) -> None:
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    def text(self) -> str:
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        if self.omitted <= 0:
+            return head + tail
+        return f"{head}\n... ({self.omitted:,} bytes omitted) ...\n{tail}"
+
+    def last_lines(self, n: int = 5) -> str:
+        data = self.tail or self.head
+        return "\n".join(data.decode("utf-8", errors="replace").splitlines()[-n:])
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    """Kill a shell and everything it started (it leads its own process group)."""
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+class ShellSession:
+    """
+    A long-lived bash that runs commands one at a time.
+
+    Each command is eval'd in the shell itself, so cd, exported variables and
+    activated virtualenvs carry over to the next one. Its end is marked by a
+    random sentinel line on stdout (carrying the exit status) and on stderr.
+    A session that times out or exits is discarded and respawned on the next run.
+    """
+
+    def __init__(self, cwd: str):
+        self.cwd = cwd
+        self.process: asyncio.subprocess.Process | None = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self._token = f"__NANOBOT_DONE_{uuid.uuid4().hex}__"
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def _start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            "bash", "--noprofile", "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            start_new_session=os.name == "posix",
+        )
+
+    async def run(self, command: str, out: OutputBuffer, err: OutputBuffer) -> int | None:
+        """
+        Run command, capturing into out/err. Returns its exit code, or None if
+        the shell itself exited. Cancellation (e.g. a timeout) kills the session.
+        """
+        self.last_used = time.monotonic()
+        if not self.alive:
+            await self._start()
+        script = (
+            f"eval {shlex.quote(command)} < /dev/null\n"
+            "__nanobot_rc=$?\n"
+            f"printf '\\n%s %s\\n' {self._token} \"$__nanobot_rc\"\n"
+            f"printf '\\n%s\\n' {self._token} >&2\n"
+        )
+        try:
+            self.process.stdin.write(script.encode("utf-8"))
+            await self.process.stdin.drain()
+            code, _ = await asyncio.gather(
+                self._read_until_marker(self.process.stdout, out),
+                self._read_until_marker(self.process.stderr, err),
+            )
+        except (asyncio.CancelledError, ConnectionError):
+            self.close()
+            raise
+        if code is None:
+            code = await self.process.wait()
+            self.close()
+        return code
+
+    async def _read_until_marker(self, stream: asyncio.StreamReader, buffer: OutputBuffer) -> int | None:
+        marker = f"\n{self._token}".encode()
+        keep = len(marker) - 1
+        pending = b""
+        while True:
+            chunk = await stream.read(_READ_CHUNK)
+            if not chunk:
+                buffer.write(pending)
+                return None
+            pending += chunk
+            idx = pending.find(marker)
+            if idx < 0:
+                # Hold back a possible partial marker at the end
+                buffer.write(pending[:-keep])
+                pending = pending[-keep:]
+                continue
+            buffer.write(pending[:idx])
+            rest = pending[idx + len(marker):]
+            while b"\n" not in rest and (more := await stream.read(_READ_CHUNK)):
+                rest += more
+            status = rest.split(b"\n", 1)[0].strip()
+            return int(status) if status.isdigit() else 0
+
+    def close(self) -> None:
+        if self.process is not None:
+            _kill_group(self.process)
+            self.process.stdin.close()
+            self.process = None
+
 
 class ExecTool(Tool):
     """Tool to execute shell commands."""
@@ -19,6 +192,12 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        max_output_chars: int = 10000,
+        artifacts_dir: Path | None = None,
+        progress_interval_s: float = 15,
+        persistent: bool = False,
+        max_sessions: int = 8,
+        session_idle_s: float = 1800,
     ):
         self.timeout = timeout
         self.working_dir = working_dir
@@ -35,6 +214,32 @@ class ExecTool(Tool):
         ]
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_output_chars = max_output_chars
+        self.artifacts_dir = artifacts_dir
+        self.progress_interval_s = progress_interval_s
+        # Set per turn by the agent loop (per asyncio task, so concurrent turns do not
+        # see each other's); receives periodic updates from long commands
+        self._on_progress: ContextVar[Callable[[str], Awaitable[None]] | None] = ContextVar(
+            "exec_on_progress", default=None,
+        )
+        # Persistent shells, one per chat (needs bash; otherwise each command gets a fresh shell)
+        self.persistent = persistent and shutil.which("bash") is not None
+        self.max_sessions = max_sessions
+        self.session_idle_s = session_idle_s
+        self._sessions: OrderedDict[str, ShellSession] = OrderedDict()
+        self._session_key: ContextVar[str] = ContextVar("exec_session_key", default="default")
+
+    @property
+    def on_progress(self) -> Callable[[str], Awaitable[None]] | None:
+        return self._on_progress.get()
+
+    @on_progress.setter
+    def on_progress(self, callback: Callable[[str], Awaitable[None]] | None) -> None:
+        self._on_progress.set(callback)
+
+    def set_context(self, channel: str, chat_id: str) -> None:
+        """Select the persistent shell session for the current chat (per asyncio task)."""
+        self._session_key.set(f"{channel}:{chat_id}")
     
     @property
     def name(self) -> str:
@@ -42,6 +247,12 @@ class ExecTool(Tool):
     
     @property
     def description(self) -> str:
+        if self.persistent:
+            return (
+                "Execute a shell command and return its output. Use with caution. "
+                "Commands in this chat run in one persistent bash session: cd, exported "
+                "variables and activated virtualenvs carry over to later calls."
+            )
         return "Execute a shell command and return its output. Use with caution."
     
     @property
@@ -67,53 +278,148 @@ class ExecTool(Tool):
         if guard_error:
             return guard_error
         
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        half = max(1, self.max_output_chars // 2)
+        out = OutputBuffer(half, half, self._spill_path(stamp, "stdout"))
+        err = OutputBuffer(half // 2, half // 2, self._spill_path(stamp, "stderr"))
+        if self.persistent:
+            try:
+                return await self._execute_in_session(command, working_dir, out, err)
+            except Exception as e:
+                return f"Error executing command: {str(e)}"
+            finally:
+                out.close()
+                err.close()
         try:
             process = await asyncio.create_subprocess_shell(
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                start_new_session=os.name == "posix",
             )
-            
+            progress = asyncio.create_task(self._report_progress(command, out)) if self.on_progress else None
+            done = asyncio.gather(self._pump(process.stdout, out), self._pump(process.stderr, err), process.wait())
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout
-                )
+                await asyncio.wait_for(asyncio.shield(done), timeout=self.timeout)
             except asyncio.TimeoutError:
-                process.kill()
+                _kill_group(process)
                 # Wait for the process to fully terminate so pipes are
                 # drained and file descriptors are released.
                 try:
-                    await asyncio.wait_for(process.wait(), timeout=5.0)
+                    await asyncio.wait_for(done, timeout=5.0)
                 except asyncio.TimeoutError:
                     pass
-                return f"Error: Command timed out after {self.timeout} seconds"
-            
-            output_parts = []
-            
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
-            
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                if stderr_text.strip():
-                    output_parts.append(f"STDERR:\n{stderr_text}")
-            
-            if process.returncode != 0:
-                output_parts.append(f"\nExit code: {process.returncode}")
-            
-            result = "\n".join(output_parts) if output_parts else "(no output)"
-            
-            # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
-            
-            return result
-            
+                captured = self._format(out, err, None)
+                return f"Error: Command timed out after {self.timeout} seconds\n\nOutput before timeout:\n{captured}"
+            finally:
+                if progress:
+                    progress.cancel()
+                if not done.done():
+                    done.cancel()
+                    _kill_group(process)
+            return self._format(out, err, process.returncode)
+
         except Exception as e:
             return f"Error executing command: {str(e)}"
+        finally:
+            out.close()
+            err.close()
+
+    async def _execute_in_session(
+        self, command: str, working_dir: str | None, out: OutputBuffer, err: OutputBuffer,
+    ) -> str:
+        session = self._get_session()
+        if working_dir:
+            command = f"cd {shlex.quote(working_dir)} && {command}"
+        async with session.lock:
+            progress = asyncio.create_task(self._report_progress(command, out)) if self.on_progress else None
+            try:
+                code = await asyncio.wait_for(session.run(command, out, err), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                captured = self._format(out, err, None)
+                return (
+                    f"Error: Command timed out after {self.timeout} seconds "
+                    f"(the shell session was restarted)\n\nOutput before timeout:\n{captured}"
+                )
+            finally:
+                if progress:
+                    progress.cancel()
+        result = self._format(out, err, code)
+        if not session.alive:
+            result += "\n(The shell exited; the next command starts a new session.)"
+        return result
+
+    def _get_session(self) -> ShellSession:
+        now = time.monotonic()
+        for key, session in list(self._sessions.items()):
+            if now - session.last_used > self.session_idle_s and not session.lock.locked():
+                session.close()
+                del self._sessions[key]
+        session_key = self._session_key.get()
+        session = self._sessions.get(session_key)
+        if session is None:
+            session = ShellSession(self.working_dir or os.getcwd())
+            self._sessions[session_key] = session
+            while len(self._sessions) > self.max_sessions:
+                _, oldest = self._sessions.popitem(last=False)
+                oldest.close()
+        self._sessions.move_to_end(session_key)
+        return session
+
+    def close_sessions(self) -> None:
+        """Kill every persistent shell."""
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def _spill_path(self, stamp: str, stream: str) -> Path | None:
+        return self.artifacts_dir / f"{stamp}-{stream}.log" if self.artifacts_dir else None
+
+    @staticmethod
+    async def _pump(stream: asyncio.StreamReader | None, buffer: OutputBuffer) -> None:
+        if stream is None:
+            return
+        while chunk := await stream.read(_READ_CHUNK):
+            buffer.write(chunk)
+
+    async def _report_progress(self, command: str, out: OutputBuffer) -> None:
+        """Send the latest output of a long-running command every progress_interval_s."""
+        started = time.monotonic()
+        while True:
+            await asyncio.sleep(self.progress_interval_s)
+            elapsed = int(time.monotonic() - started)
+            preview = command if len(command) <= 60 else command[:57] + "..."
+            update = f"⏳ Still running `{preview}` ({elapsed}s, {out.total:,} bytes of output)"
+            if tail := out.last_lines():
+                update += f"\n{tail}"
+            try:
+                await self.on_progress(update)
+            except Exception:
+                pass
+
+    def _format(self, out: OutputBuffer, err: OutputBuffer, returncode: int | None) -> str:
+        output_parts = []
+
+        if out.total:
+            output_parts.append(out.text())
+
+        if err.total:
+            stderr_text = err.text()
+            if stderr_text.strip():
+                output_parts.append(f"STDERR:\n{stderr_text}")
+
+        if returncode:
+            output_parts.append(f"\nExit code: {returncode}")
+
+        spilled = [b.spill_path for b in (out, err) if b.spilled]
+        if spilled:
+            names = ", ".join(str(p) for p in spilled)
+            output_parts.append(f"\n(Output truncated; full output saved to {names}. Use read_file to page through it.)")
+        elif out.omitted > 0 or err.omitted > 0:
+            output_parts.append("\n(Output truncated.)")
+
+        return "\n".join(output_parts) if output_parts else "(no output)"
 
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
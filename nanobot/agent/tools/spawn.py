@@ -1,4 +1,4 @@
-"""Spawn tool for creating background subagents."""
+"""Spawn tool for creating and managing background subagents."""
 
 from typing import Any, TYPE_CHECKING
 
@@ -13,7 +13,9 @@ class SpawnTool(Tool):
     Tool to spawn a subagent for background task execution.
     
     The subagent runs asynchronously and announces its result back
-    to the main agent when complete.
+    to the main agent when complete. The group action fans out several
+    subtasks whose results come back together in one message. The list,
+    status and cancel actions manage subagents that are queued or running.
     """
     
     def __init__(self, manager: "SubagentManager"):
@@ -35,7 +37,11 @@ class SpawnTool(Tool):
         return (
             "Spawn a subagent to handle a task in the background. "
             "Use this for complex or time-consuming tasks that can run independently. "
-            "The subagent will complete the task and report back when done."
+            "The subagent will complete the task and report back when done. "
+            "Subagents run a few at a time; extra ones wait in a queue. "
+            "For several independent subtasks (e.g. research from different angles) use action 'group' "
+            "with 'tasks': they run in parallel and all results come back together in one message. "
+            "Actions: spawn (default), group, list, status, cancel."
         )
     
     @property
@@ -43,23 +49,110 @@ class SpawnTool(Tool):
         return {
             "type": "object",
             "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["spawn", "group", "list", "status", "cancel"],
+                    "description": "Action to perform (default: spawn)",
+                },
                 "task": {
                     "type": "string",
-                    "description": "The task for the subagent to complete",
+                    "description": "The task for the subagent to complete (for spawn)",
+                },
+                "tasks": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 1,
+                    "description": "Independent subtasks to run in parallel (for group)",
                 },
                 "label": {
                     "type": "string",
                     "description": "Optional short label for the task (for display)",
                 },
+                "priority": {
+                    "type": "string",
+                    "enum": ["high", "normal", "low"],
+                    "description": "Queue priority (for spawn, default: normal)",
+                },
+                "timeout_seconds": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Deadline for the subagent run, or the whole group (for spawn and group)",
+                },
+                "task_id": {
+                    "type": "string",
+                    "description": "Subagent or group id (for status and cancel)",
+                },
             },
-            "required": ["task"],
         }
     
-    async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
-        """Spawn a subagent to execute the given task."""
-        return await self._manager.spawn(
-            task=task,
-            label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
-        )
+    async def execute(
+        self,
+        action: str = "spawn",
+        task: str | None = None,
+        tasks: list[str] | None = None,
+        label: str | None = None,
+        priority: str = "normal",
+        timeout_seconds: int | None = None,
+        task_id: str | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Spawn a subagent, or list/inspect/cancel existing ones."""
+        if action == "spawn":
+            if not task:
+                return "Error: task is required for spawn"
+            return await self._manager.spawn(
+                task=task,
+                label=label,
+                origin_channel=self._origin_channel,
+                origin_chat_id=self._origin_chat_id,
+                priority=priority,
+                timeout_s=timeout_seconds,
+            )
+        if action == "group":
+            if not tasks:
+                return "Error: tasks is required for group"
+            return await self._manager.spawn_group(
+                tasks=tasks,
+                label=label,
+                origin_channel=self._origin_channel,
+                origin_chat_id=self._origin_chat_id,
+                priority=priority,
+                timeout_s=timeout_seconds,
+            )
+        if action == "list":
+            return self._list()
+        if action in ("status", "cancel") and not task_id:
+            return f"Error: task_id is required for {action}"
+        if action == "status":
+            if group := self._manager.get_group(task_id):
+                info = group.to_dict()
+                lines = [self._describe(m.to_dict()) for m in group.members]
+                return f"Group {info['label']} (id: {info['id']}, {info['status']}):\n" + "\n".join(lines)
+            record = self._manager.get(task_id)
+            if record is None:
+                return f"Subagent {task_id} not found"
+            return self._describe(record.to_dict(), with_result=True)
+        if action == "cancel":
+            if group := self._manager.get_group(task_id):
+                cancelled = sum(self._manager.cancel(m.id) for m in group.members)
+                return f"Cancelled {cancelled} subagents of group {task_id}"
+            if self._manager.cancel(task_id):
+                return f"Cancelled subagent {task_id}"
+            return f"Subagent {task_id} is not queued or running"
+        return f"Unknown action: {action}"
+    
+    def _list(self) -> str:
+        records = self._manager.list_tasks()
+        if not records:
+            return "No subagents."
+        return "Subagents:\n" + "\n".join(self._describe(r.to_dict()) for r in records)
+    
+    @staticmethod
+    def _describe(info: dict[str, Any], with_result: bool = False) -> str:
+        line = f"- {info['label']} (id: {info['id']}, {info['status']}, waited {info['queueWaitS']}s"
+        if info["runS"] is not None:
+            line += f", ran {info['runS']}s, {info['tokensUsed']} tokens"
+        line += ")"
+        if with_result and info["result"]:
+            line += f"\nResult: {info['result']}"
+        return line
@@ -56,10 +56,14 @@ class WebSearchTool(Tool):
         },
         "required": ["query"]
     }
+    cache_ttl = 600
     
     def __init__(self, api_key: str | None = None, max_results: int = 5):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+
+    def cache_key(self, params: dict[str, Any]) -> str | None:
+        return json.dumps([params.get("query", "").strip(), params.get("count") or self.max_results])
     
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         if not self.api_key:
@@ -104,9 +108,16 @@ class WebFetchTool(Tool):
         },
         "required": ["url"]
     }
+    cache_ttl = 600
     
     def __init__(self, max_chars: int = 50000):
         self.max_chars = max_chars
+
+    def cache_key(self, params: dict[str, Any]) -> str | None:
+        return json.dumps([params.get("url"), params.get("extractMode", "markdown"), params.get("maxChars") or self.max_chars])
+
+    def is_cacheable_result(self, result: str) -> bool:
+        return not result.startswith('{"error"')
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
         from readability import Document
@@ -0,0 +1,286 @@
+"""Incremental trigram index over the workspace's text files."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse  # type: ignore[no-redef]
+
+if TYPE_CHECKING:
+    from nanobot.watcher import WatcherService
+
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".cache",
+})
+_SNIFF_BYTES = 8192
+
+
+def _trigrams(text: str) -> set[bytes]:
+    data = text.lower().encode("utf-8")
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+
+def load_gitignore(root: Path) -> list[str]:
+    """Patterns from root/.gitignore (negations are not supported and skipped)."""
+    try:
+        text = (root / ".gitignore").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+    return [
+        line.strip() for line in text.splitlines()
+        if line.strip() and not line.startswith(("#", "!"))
+    ]
+
+
+def is_ignored(rel: str, is_dir: bool, patterns: list[str]) -> bool:
+    """Whether a path relative to the ignore root is excluded by patterns or DEFAULT_IGNORED_DIRS."""
+    name = rel.rsplit("/", 1)[-1]
+    if is_dir and name in DEFAULT_IGNORED_DIRS:
+        return True
+    for pattern in patterns:
+        dir_only = pattern.endswith("/")
+        pattern = pattern.strip("/")
+        if dir_only and not is_dir:
+            continue
+        target = rel if "/" in pattern else name
+        if fnmatch.fnmatchcase(target, pattern):
+            return True
+    return False
+
+
+def required_literals(pattern: str, flags: int = 0) -> list[str]:
+    """
+    Literal runs that every match of the regex must contain.
+
+    Only top-level concatenated literals count; anything optional, repeated
+    or alternated ends a run. An empty list means the regex can't be narrowed.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return []
+    runs, current = [], []
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+    if current:
+        runs.append("".join(current))
+    return [r for r in runs if len(r.encode("utf-8")) >= 3]
+
+
+@dataclass
+class _Entry:
+    id: int  # -1 for files that are tracked but not indexed (binary or too large)
+    mtime_ns: int
+    size: int
+    trigrams: bytes  # Concatenated 3-byte trigrams, kept to remove the file's postings
+
+
+class WorkspaceIndex:
+    """
+    Trigram index of the text files under root.
+
+    Each file's lower-cased content is broken into byte trigrams, with
+    postings from trigram to file ids. A regex query is narrowed to the
+    files that contain every trigram of its required literals before any
+    file is read. Ignored directories, the root's .gitignore, binary files
+    and files over max_file_bytes are skipped.
+
+    The index is built on first use and kept current incrementally: from
+    watcher events when a watcher is given, otherwise by re-stating the tree
+    at most every rescan_s seconds and re-indexing only files whose mtime or
+    size changed. Methods are thread-safe, so callers can run them off the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_file_bytes: int = 1024 * 1024,
+        max_files: int = 50_000,
+        ignore: list[str] | None = None,
+        watcher: WatcherService | None = None,
+        rescan_s: float = 2.0,
+    ):
+        self.root = Path(root).resolve()
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.rescan_s = rescan_s
+        self._ignore = list(ignore or [])
+        self._patterns = self._ignore
+        self._files: dict[str, _Entry] = {}
+        self._paths: dict[int, str] = {}
+        self._postings: dict[bytes, set[int]] = {}
+        self._next_id = 0
+        self._built = False
+        self._scanned_at = 0.0
+        self._dirty: set[Path] = set()
+        self._lock = threading.RLock()
+        self._watch = None
+        if watcher is not None:
+            self._watch = watcher.watch(self.root, self._on_change, recursive=True)
+
+    @property
+    def file_count(self) -> int:
+        return len(self._paths)
+
+    def close(self) -> None:
+        if self._watch:
+            self._watch.cancel()
+            self._watch = None
+
+    def _on_change(self, paths: set[Path]) -> None:
+        with self._lock:
+            self._dirty.update(paths)
+
+    def is_ignored(self, rel: str, is_dir: bool) -> bool:
+        return is_ignored(rel, is_dir, self._patterns)
+
+    # ---- indexing ----
+
+    def _add(self, rel: str, path: Path, st: os.stat_result) -> None:
+        self._remove(rel)
+        skipped = _Entry(id=-1, mtime_ns=st.st_mtime_ns, size=st.st_size, trigrams=b"")
+        if st.st_size > self.max_file_bytes or len(self._paths) >= self.max_files:
+            self._files[rel] = skipped
+            return
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return
+        if b"\0" in data[:_SNIFF_BYTES]:
+            self._files[rel] = skipped
+            return
+        tris = _trigrams(data.decode("utf-8", errors="replace"))
+        file_id = self._next_id
+        self._next_id += 1
+        for t in tris:
+            self._postings.setdefault(t, set()).add(file_id)
+        self._files[rel] = _Entry(id=file_id, mtime_ns=st.st_mtime_ns, size=st.st_size, trigrams=b"".join(tris))
+        self._paths[file_id] = rel
+
+    def _remove(self, rel: str) -> None:
+        entry = self._files.pop(rel, None)
+        if entry is None or entry.id < 0:
+            return
+        del self._paths[entry.id]
+        for i in range(0, len(entry.trigrams), 3):
+            t = entry.trigrams[i:i + 3]
+            ids = self._postings.get(t)
+            if ids is not None:
+                ids.discard(entry.id)
+                if not ids:
+                    del self._postings[t]
+
+    def _scan(self, top: Path) -> None:
+        """Bring every file under top up to date (stat only for unchanged ones)."""
+        top_rel = top.relative_to(self.root).as_posix() if top != self.root else ""
+        seen: set[str] = set()
+        for dirpath, dirnames, filenames in os.walk(top):
+            base = Path(dirpath).relative_to(self.root).as_posix()
+            base = "" if base == "." else base + "/"
+            dirnames[:] = sorted(d for d in dirnames if not self.is_ignored(base + d, True))
+            for name in filenames:
+                rel = base + name
+                if self.is_ignored(rel, False):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                seen.add(rel)
+                entry = self._files.get(rel)
+                if entry is None or entry.mtime_ns != st.st_mtime_ns or entry.size != st.st_size:
+                    self._add(rel, path, st)
+        prefix = top_rel + "/" if top_rel else ""
+        for rel in [r for r in self._files if r.startswith(prefix) and r not in seen]:
+            self._remove(rel)
+
+    def _update(self, path: Path) -> None:
+        try:
+            rel = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return
+        if rel == ".gitignore":
+            self._patterns = self._ignore + load_gitignore(self.root)
+        if path.is_dir():
+            if not any(self.is_ignored(p, True) for p in self._ancestors(rel)):
+                self._scan(path)
+            return
+        if not path.exists():
+            self._remove(rel)
+            prefix = rel + "/"
+            for gone in [r for r in self._files if r.startswith(prefix)]:
+                self._remove(gone)
+            return
+        if self.is_ignored(rel, False) or any(self.is_ignored(p, True) for p in self._ancestors(rel)[:-1]):
+            return
+        try:
+            self._add(rel, path, path.stat())
+        except OSError:
+            self._remove(rel)
+
+    @staticmethod
+    def _ancestors(rel: str) -> list[str]:
+        parts = rel.split("/")
+        return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+    def refresh(self) -> None:
+        """Build the index, or apply what changed since the last call."""
+        with self._lock:
+            if not self._built:
+                started = time.monotonic()
+                self._patterns = self._ignore + load_gitignore(self.root)
+                self._scan(self.root)
+                self._built = True
+                self._scanned_at = time.monotonic()
+                logger.info(
+                    "Workspace index: {} files, {} trigrams in {:.0f} ms",
+                    self.file_count, len(self._postings), (self._scanned_at - started) * 1000,
+                )
+            elif self._watch is not None:
+                dirty, self._dirty = self._dirty, set()
+                for path in sorted(dirty):
+                    self._update(path)
+            elif time.monotonic() - self._scanned_at >= self.rescan_s:
+                self._patterns = self._ignore + load_gitignore(self.root)
+                self._scan(self.root)
+                self._scanned_at = time.monotonic()
+
+    # ---- queries ----
+
+    def candidates(self, literals: list[str]) -> list[str]:
+        """Indexed files that may contain all literals (all files if there are none)."""
+        with self._lock:
+            if not literals:
+                return sorted(self._paths.values())
+            needed = set()
+            for literal in literals:
+                needed |= _trigrams(literal)
+            postings = sorted((self._postings.get(t, set()) for t in needed), key=len)
+            if not postings or not postings[0]:
+                return []
+            ids = set(postings[0])
+            for p in postings[1:]:
+                ids &= p
+                if not ids:
+                    return []
+            return sorted(self._paths[i] for i in ids)
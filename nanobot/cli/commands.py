@@ -329,7 +329,7 @@ def gateway(
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
-    from nanobot.config.loader import load_config, get_data_dir
+    from nanobot.config.loader import load_config, get_data_dir, watch_config
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
@@ -337,6 +337,8 @@ def gateway(
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.watcher import WatcherService
+    import functools
     
     if verbose:
         import logging
@@ -349,10 +351,20 @@ def gateway(
     bus = MessageBus()
     provider = _make_provider(config)
     session_manager = SessionManager(config.workspace_path)
+    # One watcher shared by everything that caches workspace files (and config.json)
+    watcher = WatcherService() if config.gateway.hot_reload else None
     
     # Create cron service first (callback set after agent creation)
-    cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron_store_path = get_data_dir() / "cron" / "jobs.db"
+    cron = CronService(
+        cron_store_path,
+        max_concurrent=config.cron.max_concurrent_jobs,
+        job_timeout_s=config.cron.job_timeout_s,
+        catch_up=config.cron.catch_up,
+        catch_up_window_s=config.cron.catch_up_window_s,
+        lease_grace_s=config.cron.lease_grace_s,
+        sync_interval_s=config.cron.sync_interval_s,
+    )
     
     # Build email config for the email_read tool (if IMAP is enabled)
     _em = config.channels.email
@@ -385,6 +397,10 @@ def gateway(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        search_config=config.tools.search,
+        tool_routing=config.tools.routing,
+        tool_cache=config.tools.cache,
+        artifacts_config=config.tools.artifacts,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
@@ -392,11 +408,33 @@ def gateway(
         email_config=_email_cfg,
         gcal_config=config.tools.google_calendar.model_dump(),
         fallback_models=config.agents.defaults.fallback_models,
+        memory_config=config.agents.memory,
+        loop_detection=config.agents.loop_detection,
+        watcher=watcher,
+        subagents_config=config.agents.subagents,
+        provider_factory=functools.partial(_make_provider, config),
     )
     
     # Set cron callback (needs agent)
+    from nanobot.cron.fanout import ChannelRateLimiter, deliver_fanout
+    fanout_limiter = ChannelRateLimiter(config.cron.channel_rate_limits)
+
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job, potentially bypassing the agent for simple notifications."""
+        # Fan-out: produce the content once (directly or with one agent turn), deliver it to every recipient
+        if job.payload.recipients:
+            content = job.payload.message
+            if not job.payload.deliver:
+                content = await agent.process_direct(
+                    job.payload.message, session_key=f"cron:{job.id}", channel="cli", chat_id="direct",
+                )
+            if content:
+                await deliver_fanout(
+                    job, content, bus.publish_outbound,
+                    limiter=fanout_limiter, batch_size=config.cron.fanout_batch_size,
+                )
+            return content
+
         # If it's a simple notification meant for direct delivery, skip the agent to save time/tokens/context
         if job.payload.deliver and job.payload.kind == "agent_turn" and job.payload.to:
             from nanobot.bus.events import OutboundMessage
@@ -433,10 +471,67 @@ def gateway(
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
         on_heartbeat=on_heartbeat,
-        interval_s=30 * 60,  # 30 minutes (production mode)
-        enabled=True
+        interval_s=config.heartbeat.interval_s,
+        enabled=config.heartbeat.enabled,
+        watch_interval_s=config.heartbeat.watch_interval_s,
+        watcher=watcher,
     )
     
+    def on_config_change(new: Config) -> None:
+        """Apply edited settings that don't need a restart; warn about the rest."""
+        old_d, new_d = config.agents.defaults, new.agents.defaults
+
+        def assign(*targets: tuple[object, str]):
+            return lambda value: [setattr(obj, attr, value) for obj, attr in targets]
+
+        live = [
+            ("model", old_d.model, new_d.model, assign((agent, "model"), (agent.subagents, "model"))),
+            ("temperature", old_d.temperature, new_d.temperature,
+             assign((agent, "temperature"), (agent.subagents, "temperature"))),
+            ("maxTokens", old_d.max_tokens, new_d.max_tokens,
+             assign((agent, "max_tokens"), (agent.subagents, "max_tokens"))),
+            ("maxToolIterations", old_d.max_tool_iterations, new_d.max_tool_iterations,
+             assign((agent, "max_iterations"))),
+            ("memoryWindow", old_d.memory_window, new_d.memory_window, assign((agent, "memory_window"))),
+            ("fallbackModels", old_d.fallback_models, new_d.fallback_models, assign((agent, "fallback_models"))),
+            ("tools.exec.timeout", config.tools.exec.timeout, new.tools.exec.timeout,
+             assign((agent.tools.get("exec"), "timeout"))),
+            ("heartbeat.intervalS", config.heartbeat.interval_s, new.heartbeat.interval_s,
+             assign((heartbeat, "interval_s"))),
+            ("heartbeat.watchIntervalS", config.heartbeat.watch_interval_s, new.heartbeat.watch_interval_s,
+             assign((heartbeat, "watch_interval_s"))),
+            ("cron.jobTimeoutS", config.cron.job_timeout_s, new.cron.job_timeout_s, assign((cron, "job_timeout_s"))),
+            ("cron.channelRateLimits", config.cron.channel_rate_limits, new.cron.channel_rate_limits,
+             assign((fanout_limiter, "rates"))),
+        ]
+        applied = []
+        for name, before, after, apply in live:
+            if before != after:
+                apply(after)
+                applied.append(name)
+        if applied:
+            logger.info("Config: applied {}", ", ".join(applied))
+        structural = [
+            name for name, before, after in (
+                ("channels", config.channels, new.channels),
+                ("providers", config.providers, new.providers),
+                ("gateway", config.gateway, new.gateway),
+                ("agents.memory", config.agents.memory, new.agents.memory),
+                ("agents.defaults.workspace", old_d.workspace, new_d.workspace),
+                ("tools.mcpServers", config.tools.mcp_servers, new.tools.mcp_servers),
+            ) if before != after
+        ]
+        if structural:
+            logger.warning("Config: restart the gateway to apply changes to {}", ", ".join(structural))
+        # Closures (cron fan-out, heartbeat routing) read the live config object
+        config.agents.defaults = new_d.model_copy(update={"workspace": old_d.workspace})
+        config.tools.exec = new.tools.exec
+        config.heartbeat = new.heartbeat
+        config.cron = new.cron
+    
+    if watcher is not None:
+        watch_config(watcher, on_config_change)
+    
     # Create channel manager
     channels = ChannelManager(config, bus)
     
@@ -449,7 +544,8 @@ def gateway(
     if cron_status["jobs"] > 0:
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
-    console.print(f"[green]✓[/green] Heartbeat: every 30m")
+    if config.heartbeat.enabled:
+        console.print(f"[green]✓[/green] Heartbeat: watching HEARTBEAT.md (re-check every {config.heartbeat.interval_s // 60}m)")
     
     # Start the Dashboard API
     from nanobot.server.api import start_api
@@ -457,6 +553,8 @@ def gateway(
     
     async def run():
         try:
+            if watcher is not None:
+                await watcher.start()
             await cron.start()
             await heartbeat.start()
             await asyncio.gather(
@@ -469,6 +567,8 @@ def gateway(
             await agent.close_mcp()
             heartbeat.stop()
             cron.stop()
+            if watcher is not None:
+                watcher.stop()
             agent.stop()
             await channels.stop_all()
     
@@ -521,7 +621,7 @@ def agent(
     provider = _make_provider(config)
 
     # Create cron service for tool usage (no callback needed for CLI unless running)
-    cron_store_path = get_data_dir() / "cron" / "jobs.json"
+    cron_store_path = get_data_dir() / "cron" / "jobs.db"
     cron = CronService(cron_store_path)
 
     if logs:
@@ -540,12 +640,18 @@ def agent(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        search_config=config.tools.search,
+        tool_routing=config.tools.routing,
+        tool_cache=config.tools.cache,
+        artifacts_config=config.tools.artifacts,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
         email_config=_email_cfg,
         gcal_config=config.tools.google_calendar.model_dump(),
         fallback_models=config.agents.defaults.fallback_models,
+        memory_config=config.agents.memory,
+        loop_detection=config.agents.loop_detection,
     )
     
     # Show spinner when logs are off (no output to miss); skip when logs are on
@@ -858,7 +964,7 @@ def cron_list(
     from nanobot.config.loader import get_data_dir
     from nanobot.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = get_data_dir() / "cron" / "jobs.db"
     service = CronService(store_path)
     
     jobs = service.list_jobs(include_disabled=all)
@@ -914,6 +1020,9 @@ def cron_add(
     deliver: bool = typer.Option(False, "--deliver", "-d", help="Deliver response to channel"),
     to: str = typer.Option(None, "--to", help="Recipient for delivery"),
     channel: str = typer.Option(None, "--channel", help="Channel for delivery (e.g. 'telegram', 'whatsapp')"),
+    recipient: list[str] = typer.Option(None, "--recipient", "-r", help="Fan-out recipient 'channel:chat_id' (repeatable)"),
+    spread: int = typer.Option(0, "--spread", help="Spread fan-out deliveries over N seconds"),
+    jitter: int = typer.Option(0, "--jitter", help="Delay each cron run by a fixed per-job 0..N seconds"),
 ):
     """Add a scheduled job."""
     from nanobot.config.loader import get_data_dir
@@ -928,7 +1037,7 @@ def cron_add(
     if every:
         schedule = CronSchedule(kind="every", every_ms=every * 1000)
     elif cron_expr:
-        schedule = CronSchedule(kind="cron", expr=cron_expr, tz=tz)
+        schedule = CronSchedule(kind="cron", expr=cron_expr, tz=tz, jitter_s=jitter)
     elif at:
         import datetime
         dt = datetime.datetime.fromisoformat(at)
@@ -937,7 +1046,7 @@ def cron_add(
         console.print("[red]Error: Must specify --every, --cron, or --at[/red]")
         raise typer.Exit(1)
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = get_data_dir() / "cron" / "jobs.db"
     service = CronService(store_path)
     
     try:
@@ -948,6 +1057,8 @@ def cron_add(
             deliver=deliver,
             to=to,
             channel=channel,
+            recipients=recipient or [],
+            spread_s=spread,
         )
     except ValueError as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -964,7 +1075,7 @@ def cron_remove(
     from nanobot.config.loader import get_data_dir
     from nanobot.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = get_data_dir() / "cron" / "jobs.db"
     service = CronService(store_path)
     
     if service.remove_job(job_id):
@@ -982,7 +1093,7 @@ def cron_enable(
     from nanobot.config.loader import get_data_dir
     from nanobot.cron.service import CronService
     
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = get_data_dir() / "cron" / "jobs.db"
     service = CronService(store_path)
     
     job = service.enable_job(job_id, enabled=not disable)
@@ -1021,11 +1132,17 @@ def cron_run(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        search_config=config.tools.search,
+        tool_routing=config.tools.routing,
+        tool_cache=config.tools.cache,
+        artifacts_config=config.tools.artifacts,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
+        memory_config=config.agents.memory,
+        loop_detection=config.agents.loop_detection,
     )
 
-    store_path = get_data_dir() / "cron" / "jobs.json"
+    store_path = get_data_dir() / "cron" / "jobs.db"
     service = CronService(store_path)
 
     result_holder = []
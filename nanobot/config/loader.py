@@ -2,9 +2,15 @@
 
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from loguru import logger
 
 from nanobot.config.schema import Config
 
+if TYPE_CHECKING:
+    from nanobot.watcher import Watch, WatcherService
+
 
 def get_config_path() -> Path:
     """Get the default configuration file path."""
@@ -42,6 +48,34 @@ def load_config(config_path: Path | None = None) -> Config:
     return Config()
 
 
+def watch_config(
+    watcher: "WatcherService",
+    on_change: Callable[[Config], Any],
+    config_path: Path | None = None,
+) -> "Watch":
+    """
+    Reload the configuration whenever its file changes.
+
+    on_change receives the new Config. Edits that don't parse or validate
+    are logged and ignored, so the running config stays in effect.
+    """
+    path = config_path or get_config_path()
+
+    def reload(_changed: set[Path]) -> Any:
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                config = Config.model_validate(_migrate_config(json.load(f)))
+        except (OSError, ValueError) as e:
+            logger.warning("Config: ignoring invalid change to {}: {}", path, e)
+            return None
+        logger.info("Config: reloaded {}", path)
+        return on_change(config)
+
+    return watcher.watch(path, reload)
+
+
 def save_config(config: Config, config_path: Path | None = None) -> None:
     """
     Save configuration to file.
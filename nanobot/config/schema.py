@@ -192,10 +192,51 @@ class AgentDefaults(Base):
     fallback_models: list[str] = Field(default_factory=list)
 
 
+class MemoryConfig(Base):
+    """Memory consolidation and retrieval configuration."""
+
+    consolidation_model: str = ""  # Cheaper/faster model for consolidation (empty = agent model)
+    consolidation_concurrency: int = 1  # Max sessions consolidated at the same time
+    consolidation_timeout_s: int = 120  # Time budget per consolidation job
+    consolidation_chunk_tokens: int = 12000  # Larger backlogs are summarized in chunks (map-reduce)
+    consolidation_chunk_concurrency: int = 4  # Max chunk summaries in parallel
+    consolidation_memory_tokens: int = 2000  # Budget for memory sections sent to consolidation
+    retrieval_enabled: bool = True  # Inject only memory/history relevant to the current turn
+    retrieval_top_k: int = 8  # Max facts + history entries retrieved per turn
+    retrieval_max_tokens: int = 1500  # Prompt budget for injected memory
+    embedding_model: str = ""  # LiteLLM embedding model (empty = local hashing embedder)
+
+
+class SubagentsConfig(Base):
+    """Background subagent scheduling."""
+
+    max_concurrent: int = 3  # Subagents running at the same time
+    max_per_origin: int = 2  # Running subagents per chat
+    max_queued: int = 20  # Waiting subagents before spawn is refused
+    timeout_s: int = 900  # Deadline per subagent run
+    max_iterations: int = 15  # LLM calls per subagent run
+    token_budget: int = 200000  # Total tokens per subagent run (0 = unlimited)
+    isolation: str = "inline"  # "inline" (gateway event loop) or "process" (worker processes)
+    worker_processes: int = 0  # Worker pool size in process mode (0 = maxConcurrent)
+    worker_memory_mb: int = 2048  # Address-space limit per worker (0 = unlimited)
+    worker_cpu_s: int = 0  # CPU seconds per subagent run in a worker (0 = unlimited)
+
+
+class LoopDetectionConfig(Base):
+    """Repeated tool-call detection within a turn."""
+
+    enabled: bool = True
+    warn_after: int = 3  # Identical calls (same arguments and result) before a corrective hint
+    stop_after: int = 5  # Identical calls before the turn ends with a partial answer
+
+
 class AgentsConfig(Base):
     """Agent configuration."""
 
     defaults: AgentDefaults = Field(default_factory=AgentDefaults)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    subagents: SubagentsConfig = Field(default_factory=SubagentsConfig)
+    loop_detection: LoopDetectionConfig = Field(default_factory=LoopDetectionConfig)
 
 
 class ProviderConfig(Base):
@@ -228,11 +269,35 @@ class ProvidersConfig(Base):
     github_copilot: ProviderConfig = Field(default_factory=ProviderConfig)  # Github Copilot (OAuth)
 
 
+class CronConfig(Base):
+    """Cron scheduler configuration."""
+
+    max_concurrent_jobs: int = 4  # Due jobs running at the same time
+    job_timeout_s: int = 600  # Default time budget per job run
+    catch_up: str = "skip"  # Missed runs (downtime, dead replica): skip or run once
+    catch_up_window_s: int = 3600  # Only catch up runs missed by at most this long
+    lease_grace_s: int = 60  # Extra lease time beyond a job's timeout before another replica may take over
+    sync_interval_s: float = 5  # How often to pick up jobs changed by other processes/replicas
+    fanout_batch_size: int = 20  # Fan-out deliveries sent together
+    channel_rate_limits: dict[str, float] = Field(
+        default_factory=lambda: {"telegram": 25, "whatsapp": 10}
+    )  # Max fan-out messages per second per channel
+
+
+class HeartbeatConfig(Base):
+    """Heartbeat (HEARTBEAT.md) configuration."""
+
+    enabled: bool = True
+    interval_s: int = 30 * 60  # Re-check open tasks without a due time or recurrence this often (0 = only on change)
+    watch_interval_s: float = 5  # How often HEARTBEAT.md is checked for changes (no LLM call)
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
     host: str = "0.0.0.0"
     port: int = 18790
+    hot_reload: bool = True  # Watch workspace files and config.json, applying edits without a restart
 
 
 class WebSearchConfig(Base):
@@ -252,6 +317,46 @@ class ExecToolConfig(Base):
     """Shell exec tool configuration."""
 
     timeout: int = 60
+    max_output_chars: int = 10000  # Head and tail of stdout kept in the result; the middle is elided
+    spill_output: bool = True  # Save the full output of truncated commands under workspace/artifacts/exec
+    progress_interval_s: int = 15  # Progress updates with the latest output while a command runs
+    persistent_sessions: bool = False  # One long-lived bash per chat (cd/env/venv persist between commands)
+    session_idle_s: int = 1800  # Idle persistent shells are closed after this long
+
+
+class SearchToolConfig(Base):
+    """Workspace search (search_files) configuration."""
+
+    max_file_kb: int = 1024  # Larger files are not indexed
+    max_files: int = 50_000
+    ignore: list[str] = Field(default_factory=list)  # Extra .gitignore-style patterns
+
+
+class ToolRoutingConfig(Base):
+    """Per-turn tool subset selection."""
+
+    enabled: bool = True
+    max_tools: int = 12  # Tools offered per turn, including the core set
+    core: list[str] = Field(default_factory=lambda: [
+        "read_file", "write_file", "edit_file", "list_dir", "search_files", "exec", "message", "request_tools",
+        "artifact_read",
+    ])
+
+
+class ArtifactsConfig(Base):
+    """Large tool results saved under workspace/artifacts/results instead of kept in the conversation."""
+
+    enabled: bool = True
+    spill_chars: int = 16_000  # Results longer than this are saved as artifacts
+    preview_chars: int = 2_000  # How much of a saved result stays in the conversation
+
+
+class ToolCacheConfig(Base):
+    """Memoization of idempotent tool calls (read_file, web_search, web_fetch, email_read)."""
+
+    enabled: bool = True
+    max_entries: int = 256
+    scope: str = "session"  # "session" (per chat) or "global" (shared across chats)
 
 
 class GoogleCalendarConfig(Base):
@@ -278,6 +383,10 @@ class ToolsConfig(Base):
 
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
+    search: SearchToolConfig = Field(default_factory=SearchToolConfig)
+    routing: ToolRoutingConfig = Field(default_factory=ToolRoutingConfig)
+    cache: ToolCacheConfig = Field(default_factory=ToolCacheConfig)
+    artifacts: ArtifactsConfig = Field(default_factory=ArtifactsConfig)
     google_calendar: GoogleCalendarConfig = Field(default_factory=GoogleCalendarConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
@@ -290,6 +399,8 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    cron: CronConfig = Field(default_factory=CronConfig)
+    heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
 
     @property
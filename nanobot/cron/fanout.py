@@ -0,0 +1,89 @@
+"""Fan-out delivery of one cron result to many recipients."""
+
+import asyncio
+import hashlib
+import time
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.cron.types import CronJob
+
+
+def stable_fraction(*parts: str) -> float:
+    """Deterministic value in [0, 1) for the given key (same across processes and restarts)."""
+    digest = hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+class ChannelRateLimiter:
+    """Per-channel token bucket; channels without a configured rate are unlimited."""
+
+    def __init__(self, rates: dict[str, float] | None = None):
+        self.rates = {ch: r for ch, r in (rates or {}).items() if r > 0}
+        self._next_slot: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, channel: str) -> None:
+        rate = self.rates.get(channel)
+        if not rate:
+            return
+        lock = self._locks.setdefault(channel, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(channel, now))
+            self._next_slot[channel] = slot + 1 / rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def fanout_targets(job: CronJob) -> list[tuple[str, str]]:
+    """(channel, chat_id) pairs of a fan-out job; bare ids use payload.channel."""
+    targets = []
+    for recipient in job.payload.recipients:
+        channel, sep, chat_id = recipient.partition(":")
+        if not sep:
+            channel, chat_id = job.payload.channel or "cli", recipient
+        if chat_id and (channel, chat_id) not in targets:
+            targets.append((channel, chat_id))
+    return targets
+
+
+async def deliver_fanout(
+    job: CronJob,
+    content: str,
+    publish: Callable[[OutboundMessage], Awaitable[None]],
+    limiter: ChannelRateLimiter | None = None,
+    batch_size: int = 20,
+) -> int:
+    """
+    Send content to every recipient of job in batches.
+
+    Recipients are ordered by a hash of (job id, recipient), and batches are
+    spread evenly over payload.spread_s, so the same recipient gets its
+    message at the same offset every run. Returns the number of messages sent.
+    """
+    targets = sorted(fanout_targets(job), key=lambda t: stable_fraction(job.id, *t))
+    batches = [targets[i:i + batch_size] for i in range(0, len(targets), max(1, batch_size))]
+    step = job.payload.spread_s / len(batches) if batches and job.payload.spread_s else 0.0
+    start = time.monotonic()
+    sent = 0
+
+    async def send(channel: str, chat_id: str) -> bool:
+        if limiter:
+            await limiter.acquire(channel)
+        try:
+            await publish(OutboundMessage(channel=channel, chat_id=chat_id, content=content))
+            return True
+        except Exception as e:
+            logger.error("Cron: fan-out of job '{}' to {}:{} failed: {}", job.name, channel, chat_id, e)
+            return False
+
+    for i, batch in enumerate(batches):
+        delay = start + i * step - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sent += sum(await asyncio.gather(*(send(ch, to) for ch, to in batch)))
+    logger.info("Cron: job '{}' delivered to {}/{} recipients", job.name, sent, len(targets))
+    return sent
@@ -1,15 +1,20 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
-import json
+import heapq
+import os
+import socket
 import time
 import uuid
+from dataclasses import fields
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Coroutine
 
 from loguru import logger
 
+from nanobot.cron.fanout import stable_fraction
+from nanobot.cron.store import CronJobStore
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
 
 
@@ -17,8 +22,8 @@ def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
-    """Compute next run time in ms."""
+def _compute_next_run(schedule: CronSchedule, now_ms: int, key: str = "") -> int | None:
+    """Compute next run time in ms. key seeds the deterministic jitter of cron schedules."""
     if schedule.kind == "at":
         return schedule.at_ms if schedule.at_ms and schedule.at_ms > now_ms else None
     
@@ -32,13 +37,15 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
         try:
             from croniter import croniter
             from zoneinfo import ZoneInfo
+            # Each job keeps the same offset within its jitter window on every occurrence
+            offset = int(stable_fraction(key) * schedule.jitter_s * 1000) if schedule.jitter_s else 0
             # Use caller-provided reference time for deterministic scheduling
-            base_time = now_ms / 1000
+            base_time = (now_ms - offset) / 1000
             tz = ZoneInfo(schedule.tz) if schedule.tz else datetime.now().astimezone().tzinfo
             base_dt = datetime.fromtimestamp(base_time, tz=tz)
             cron = croniter(schedule.expr, base_dt)
             next_dt = cron.get_next(datetime)
-            return int(next_dt.timestamp() * 1000)
+            return int(next_dt.timestamp() * 1000) + offset
         except Exception:
             return None
     
@@ -60,186 +67,332 @@ def _validate_schedule_for_add(schedule: CronSchedule) -> None:
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    Due times live in a min-heap of (next_run_at_ms, job_id) entries; entries
+    that no longer match their job (rescheduled, disabled, removed) are dropped
+    lazily when they reach the top. Due jobs run as concurrent tasks, bounded
+    by max_concurrent, each with its own timeout and overlap policy.
+
+    Several services (gateway replicas) may share one store. Each due run is
+    claimed in the store with a lease before it starts, so exactly one
+    replica executes it; leases left behind by a dead replica are taken over
+    once they expire. Changes made by other processes are picked up every
+    sync_interval_s.
+    """
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        max_concurrent: int = 4,
+        job_timeout_s: float = 600,
+        catch_up: str = "skip",
+        catch_up_window_s: float = 3600,
+        lease_grace_s: float = 60,
+        sync_interval_s: float = 5,
+        owner_id: str | None = None,
     ):
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.max_concurrent = max(1, max_concurrent)
+        self.job_timeout_s = job_timeout_s
+        self.catch_up = catch_up  # "skip" missed runs, or run them "once"
+        self.catch_up_window_s = catch_up_window_s
+        self.lease_grace_s = lease_grace_s
+        self.sync_interval_s = sync_interval_s
+        self.owner_id = owner_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._db = CronJobStore(store_path)
         self._store: CronStore | None = None
+        self._jobs: dict[str, CronJob] = {}
+        self._heap: list[tuple[int, str]] = []
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._active: dict[str, set[asyncio.Task]] = {}  # job_id -> runs in flight
+        self._queued: set[str] = set()  # jobs to re-run once their active run finishes
+        self._deferred: set[str] = set()  # due jobs leased by another replica
+        self._data_version: int | None = None
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
+        """Load jobs from the database (once; the service keeps them in memory)."""
         if self._store:
             return self._store
         
-        if self.store_path.exists():
-            try:
-                data = json.loads(self.store_path.read_text(encoding="utf-8"))
-                jobs = []
-                for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
-                self._store = CronStore(jobs=jobs)
-            except Exception as e:
-                logger.warning("Failed to load cron store: {}", e)
-                self._store = CronStore()
-        else:
+        try:
+            self._data_version = self._db.data_version()
+            self._store = CronStore(jobs=self._db.load())
+        except Exception as e:
+            logger.warning("Failed to load cron store: {}", e)
             self._store = CronStore()
         
+        self._jobs = {j.id: j for j in self._store.jobs}
+        self._rebuild_heap()
         return self._store
     
     def _save_store(self) -> None:
-        """Save jobs to disk."""
-        if not self._store:
-            return
-        
-        self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        data = {
-            "version": self._store.version,
-            "jobs": [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "enabled": j.enabled,
-                    "schedule": {
-                        "kind": j.schedule.kind,
-                        "atMs": j.schedule.at_ms,
-                        "everyMs": j.schedule.every_ms,
-                        "expr": j.schedule.expr,
-                        "tz": j.schedule.tz,
-                    },
-                    "payload": {
-                        "kind": j.payload.kind,
-                        "message": j.payload.message,
-                        "deliver": j.payload.deliver,
-                        "channel": j.payload.channel,
-                        "to": j.payload.to,
-                    },
-                    "state": {
-                        "nextRunAtMs": j.state.next_run_at_ms,
-                        "lastRunAtMs": j.state.last_run_at_ms,
-                        "lastStatus": j.state.last_status,
-                        "lastError": j.state.last_error,
-                    },
-                    "createdAtMs": j.created_at_ms,
-                    "updatedAtMs": j.updated_at_ms,
-                    "deleteAfterRun": j.delete_after_run,
-                }
-                for j in self._store.jobs
-            ]
-        }
-        
-        self.store_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        """Persist every job in one transaction."""
+        if self._store:
+            self._db.save(*self._store.jobs)
+    
+    def _save_job(self, *jobs: CronJob) -> None:
+        """Persist only the given jobs' rows."""
+        self._db.save(*(j for j in jobs if j.id in self._jobs))
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
         self._load_store()
         self._recompute_next_runs()
-        self._save_store()
         self._arm_timer()
-        logger.info("Cron service started with {} jobs", len(self._store.jobs if self._store else []))
+        logger.info("Cron service started with {} jobs (owner {})",
+                    len(self._store.jobs if self._store else []), self.owner_id)
     
     def stop(self) -> None:
-        """Stop the cron service."""
+        """Stop the cron service and cancel runs in flight."""
         self._running = False
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for runs in self._active.values():
+            for task in runs:
+                task.cancel()
+        self._queued.clear()
+        self._db.close()
     
     def _recompute_next_runs(self) -> None:
-        """Recompute next run times for all enabled jobs."""
+        """Schedule enabled jobs whose next run is missing or was missed, per the catch-up policy."""
         if not self._store:
             return
         now = _now_ms()
+        changed = []
         for job in self._store.jobs:
-            if job.enabled:
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+            next_run = job.state.next_run_at_ms
+            if not job.enabled or (next_run and next_run > now):
+                continue
+            if next_run and self.catch_up == "once" and now - next_run <= self.catch_up_window_s * 1000:
+                logger.info("Cron: catching up missed run of job '{}'", job.name)
+                continue  # Left due: runs on the first tick
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, now, job.id)
+            changed.append(job)
+        self._save_job(*changed)
+        self._rebuild_heap()
     
+    # ---- heap ----
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [
+            (j.state.next_run_at_ms, j.id) for j in self._jobs.values()
+            if j.enabled and j.state.next_run_at_ms
+        ]
+        heapq.heapify(self._heap)
+
+    def _push(self, job: CronJob) -> None:
+        """Index the job's current next run time. O(log n); old entries go stale."""
+        if job.enabled and job.state.next_run_at_ms:
+            heapq.heappush(self._heap, (job.state.next_run_at_ms, job.id))
+            # Bound the number of stale entries
+            if len(self._heap) > 2 * len(self._jobs) + 64:
+                self._rebuild_heap()
+
+    def _is_current(self, entry: tuple[int, str]) -> bool:
+        job = self._jobs.get(entry[1])
+        return bool(job and job.enabled and job.state.next_run_at_ms == entry[0])
+
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
-        if not self._store:
-            return None
-        times = [j.state.next_run_at_ms for j in self._store.jobs 
-                 if j.enabled and j.state.next_run_at_ms]
-        return min(times) if times else None
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
     
     def _arm_timer(self) -> None:
-        """Schedule the next timer tick."""
+        """Schedule the next timer tick (at the latest one sync interval away)."""
         if self._timer_task:
             self._timer_task.cancel()
-        
-        next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+            self._timer_task = None
+        if not self._running:
             return
         
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        next_wake = self._get_next_wake_ms()
+        delay_s = self.sync_interval_s
+        if next_wake:
+            delay_s = min(delay_s, max(0, next_wake - _now_ms()) / 1000)
         
         async def tick():
             await asyncio.sleep(delay_s)
             if self._running:
+                self._sync()
                 await self._on_timer()
         
         self._timer_task = asyncio.create_task(tick())
+
+    # ---- replicas ----
+
+    def _lease_until(self, job: CronJob, now: int) -> int:
+        run_s = (job.timeout_s or self.job_timeout_s) + job.payload.spread_s
+        return now + int((run_s + self.lease_grace_s) * 1000)
+
+    @staticmethod
+    def _assign(target: CronJob, source: CronJob) -> None:
+        for f in fields(CronJob):
+            setattr(target, f.name, getattr(source, f.name))
+
+    def _sync(self) -> None:
+        """Pick up changes committed by other processes and take over expired leases."""
+        if not self._store:
+            return
+        try:
+            version = self._db.data_version()
+            if version != self._data_version:
+                self._data_version = version
+                fresh = {j.id: j for j in self._db.load()}
+                for job_id in [i for i in self._jobs if i not in fresh and not self._active.get(i)]:
+                    del self._jobs[job_id]
+                for job_id, job in fresh.items():
+                    if job_id not in self._jobs:
+                        self._jobs[job_id] = job
+                    elif not self._active.get(job_id):
+                        self._assign(self._jobs[job_id], job)
+                self._store.jobs = list(self._jobs.values())
+                self._deferred.clear()
+                self._rebuild_heap()
+            elif self._deferred:
+                self._deferred.clear()
+                self._rebuild_heap()
+            self._take_over_expired()
+        except Exception as e:
+            logger.warning("Cron: sync with store failed: {}", e)
+
+    def _take_over_expired(self) -> None:
+        now = _now_ms()
+        for stale in self._db.expired_leases(now):
+            previous = stale.state.lease_owner
+            if previous == self.owner_id and self._active.get(stale.id):
+                continue  # Our own run, still going
+            job = self._jobs.setdefault(stale.id, stale)
+            if job is not stale:
+                self._assign(job, stale)
+            rerun = self.catch_up == "once"
+            job.state.lease_owner = self.owner_id if rerun else None
+            job.state.lease_until_ms = self._lease_until(job, now) if rerun else None
+            job.updated_at_ms = now
+            if not self._db.take_over(job, previous, now):
+                continue
+            logger.warning("Cron: lease of job '{}' held by {} expired{}", job.name, previous,
+                           ", running it again" if rerun else "")
+            if rerun:
+                self._start_run(job)
+        self._store.jobs = list(self._jobs.values())
+
+    def _refresh(self, job_id: str, now: int) -> None:
+        """Reload one job after losing a claim on it."""
+        fresh = self._db.get(job_id)
+        if fresh is None:
+            self._jobs.pop(job_id, None)
+            self._store.jobs = list(self._jobs.values())
+            return
+        job = self._jobs[job_id]
+        self._assign(job, fresh)
+        if job.state.next_run_at_ms and job.state.next_run_at_ms <= now:
+            # Still due but leased elsewhere: retry after the next sync
+            self._deferred.add(job_id)
+        else:
+            self._push(job)
+
+    # ---- runs ----
     
     async def _on_timer(self) -> None:
-        """Handle timer tick - run due jobs."""
+        """Handle timer tick - claim and dispatch due jobs without waiting for them."""
         if not self._store:
             return
         
         now = _now_ms()
-        due_jobs = [
-            j for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
+        due_jobs = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._is_current(entry) and entry[1] not in self._deferred:
+                due_jobs.append(self._jobs[entry[1]])
         
         for job in due_jobs:
-            await self._execute_job(job)
+            expected = job.state.next_run_at_ms
+            busy = bool(self._active.get(job.id))
+            if job.schedule.kind == "at":
+                job.enabled = False
+                job.state.next_run_at_ms = None
+            else:
+                # Next occurrence is computed at dispatch so a slow run cannot delay it
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, now, job.id)
+            if busy and job.overlap == "skip":
+                job.state.last_status = "skipped"
+            job.state.lease_owner = self.owner_id
+            job.state.lease_until_ms = max(job.state.lease_until_ms or 0, self._lease_until(job, now))
+            job.updated_at_ms = now
+
+            if not self._db.claim(job, expected, self.owner_id, now):
+                logger.debug("Cron: job '{}' was claimed by another replica", job.name)
+                self._refresh(job.id, now)
+                continue
+            self._push(job)
+            self._dispatch(job, busy)
         
-        self._save_store()
+        self._timer_task = None
+        self._arm_timer()
+
+    def _dispatch(self, job: CronJob, busy: bool) -> None:
+        """Start a claimed run according to the job's overlap policy."""
+        if busy and job.overlap == "skip":
+            logger.warning("Cron: job '{}' still running, skipping this run", job.name)
+            return
+        if busy and job.overlap == "queue":
+            logger.info("Cron: job '{}' still running, queued next run", job.name)
+            self._queued.add(job.id)
+            return
+        self._start_run(job)
+
+    def _start_run(self, job: CronJob) -> None:
+        async def run() -> None:
+            async with self._slots:
+                if job.state.lease_owner == self.owner_id:
+                    # The lease runs from the actual start, not from the claim
+                    job.state.lease_until_ms = self._lease_until(job, _now_ms())
+                    self._db.save_owned(job, self.owner_id)
+                await self._execute_job(job)
+
+        task = asyncio.create_task(run())
+        self._active.setdefault(job.id, set()).add(task)
+        task.add_done_callback(lambda t: self._on_run_done(job, t))
+
+    def _on_run_done(self, job: CronJob, task: asyncio.Task) -> None:
+        runs = self._active.get(job.id)
+        if runs is not None:
+            runs.discard(task)
+            if not runs:
+                del self._active[job.id]
+        if not self._running or task.cancelled():
+            return
+        if job.id in self._queued and not self._active.get(job.id):
+            self._queued.discard(job.id)
+            if job.id in self._jobs:
+                self._start_run(job)
+        if job.id in self._jobs:
+            if not self._active.get(job.id) and job.state.lease_owner == self.owner_id:
+                job.state.lease_owner = None
+                job.state.lease_until_ms = None
+            if not self._db.save_owned(job, self.owner_id):
+                logger.warning("Cron: lease of job '{}' was taken over during its run", job.name)
+                self._refresh(job.id, _now_ms())
         self._arm_timer()
     
     async def _execute_job(self, job: CronJob) -> None:
-        """Execute a single job."""
+        """Execute a single job within its timeout and record the outcome."""
         start_ms = _now_ms()
+        start = time.monotonic()
+        # Fan-out deliveries are spread over spread_s on top of the run itself
+        timeout = (job.timeout_s or self.job_timeout_s) + job.payload.spread_s
         logger.info("Cron: executing job '{}' ({})", job.name, job.id)
         
         # Mark one-shot jobs as disabled BEFORE running to prevent infinite loops if the handler or logger crashes
-        original_enabled = job.enabled
         if job.schedule.kind == "at":
             job.enabled = False
             job.state.next_run_at_ms = None
@@ -247,12 +400,17 @@ class CronService:
         try:
             response = None
             if self.on_job:
-                response = await self.on_job(job)
+                response = await asyncio.wait_for(self.on_job(job), timeout=timeout)
             
             job.state.last_status = "ok"
             job.state.last_error = None
             logger.info("Cron: job '{}' completed", job.name)
             
+        except asyncio.TimeoutError:
+            job.state.last_status = "error"
+            job.state.last_error = f"timed out after {timeout:g}s"
+            logger.error("Cron: job '{}' timed out after {:g}s", job.name, timeout)
+
         except Exception as e:
             job.state.last_status = "error"
             job.state.last_error = str(e)
@@ -263,16 +421,25 @@ class CronService:
                 pass
         
         finally:
+            duration_ms = int((time.monotonic() - start) * 1000)
             job.state.last_run_at_ms = start_ms
+            job.state.run_count += 1
+            job.state.last_duration_ms = duration_ms
+            job.state.max_duration_ms = max(job.state.max_duration_ms or 0, duration_ms)
+            job.state.total_duration_ms += duration_ms
             job.updated_at_ms = _now_ms()
             
             # Final cleanup for one-shot jobs
-            if job.schedule.kind == "at":
-                if job.delete_after_run:
-                    self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
-                # Compute next run for recurring jobs
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            if job.schedule.kind == "at" and job.delete_after_run:
+                self._delete(job.id)
+    
+    def _delete(self, job_id: str) -> bool:
+        if self._jobs.pop(job_id, None) is None:
+            return False
+        self._store.jobs = [j for j in self._store.jobs if j.id != job_id]
+        self._queued.discard(job_id)
+        self._db.delete(job_id)
+        return True
     
     # ========== Public API ==========
     
@@ -291,14 +458,21 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        overlap: str = "skip",
+        timeout_s: float | None = None,
+        recipients: list[str] | None = None,
+        spread_s: int = 0,
     ) -> CronJob:
-        """Add a new job."""
+        """Add a new job. With recipients, one run is delivered to every "channel:chat_id" listed."""
         store = self._load_store()
         _validate_schedule_for_add(schedule)
+        if overlap not in ("skip", "queue", "allow"):
+            raise ValueError(f"unknown overlap policy '{overlap}'")
         now = _now_ms()
+        job_id = str(uuid.uuid4())[:8]
         
         job = CronJob(
-            id=str(uuid.uuid4())[:8],
+            id=job_id,
             name=name,
             enabled=True,
             schedule=schedule,
@@ -308,15 +482,21 @@ class CronService:
                 deliver=deliver,
                 channel=channel,
                 to=to,
+                recipients=list(recipients or []),
+                spread_s=spread_s,
             ),
-            state=CronJobState(next_run_at_ms=_compute_next_run(schedule, now)),
+            state=CronJobState(next_run_at_ms=_compute_next_run(schedule, now, job_id)),
             created_at_ms=now,
             updated_at_ms=now,
             delete_after_run=delete_after_run,
+            overlap=overlap,
+            timeout_s=timeout_s,
         )
         
         store.jobs.append(job)
-        self._save_store()
+        self._jobs[job.id] = job
+        self._push(job)
+        self._save_job(job)
         self._arm_timer()
         
         logger.info("Cron: added job '{}' ({})", name, job.id)
@@ -324,13 +504,10 @@ class CronService:
     
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        self._load_store()
+        removed = self._delete(job_id)
         
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info("Cron: removed job {}", job_id)
         
@@ -338,32 +515,34 @@ class CronService:
     
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        self._load_store()
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+        job.enabled = enabled
+        job.updated_at_ms = _now_ms()
+        if enabled:
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms(), job.id)
+            self._push(job)
+        else:
+            job.state.next_run_at_ms = None
+        self._save_job(job)
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                if not force and not job.enabled:
-                    return False
-                await self._execute_job(job)
-                self._save_store()
-                self._arm_timer()
-                return True
-        return False
+        self._load_store()
+        job = self._jobs.get(job_id)
+        if not job or (not force and not job.enabled):
+            return False
+        await self._execute_job(job)
+        if job.schedule.kind != "at" and job.enabled:
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms(), job.id)
+            self._push(job)
+        self._save_job(job)
+        self._arm_timer()
+        return True
     
     def status(self) -> dict:
         """Get service status."""
@@ -371,5 +550,6 @@ class CronService:
         return {
             "enabled": self._running,
             "jobs": len(store.jobs),
+            "running": sum(len(runs) for runs in self._active.values()),
             "next_wake_at_ms": self._get_next_wake_ms(),
         }
@@ -0,0 +1,288 @@
+"""SQLite-backed cron job store."""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    enabled INTEGER NOT NULL,
+    next_run_at_ms INTEGER,
+    updated_at_ms INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    lease_owner TEXT,
+    lease_until_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_next_run ON jobs (enabled, next_run_at_ms);
+"""
+
+_COLUMNS = "id, enabled, next_run_at_ms, updated_at_ms, data, lease_owner, lease_until_ms"
+
+
+def job_to_dict(j: CronJob) -> dict[str, Any]:
+    """Serialize a job to the camelCase layout used by jobs.json."""
+    return {
+        "id": j.id,
+        "name": j.name,
+        "enabled": j.enabled,
+        "schedule": {
+            "kind": j.schedule.kind,
+            "atMs": j.schedule.at_ms,
+            "everyMs": j.schedule.every_ms,
+            "expr": j.schedule.expr,
+            "tz": j.schedule.tz,
+            "jitterS": j.schedule.jitter_s,
+        },
+        "payload": {
+            "kind": j.payload.kind,
+            "message": j.payload.message,
+            "deliver": j.payload.deliver,
+            "channel": j.payload.channel,
+            "to": j.payload.to,
+            "recipients": j.payload.recipients,
+            "spreadS": j.payload.spread_s,
+        },
+        "state": {
+            "nextRunAtMs": j.state.next_run_at_ms,
+            "lastRunAtMs": j.state.last_run_at_ms,
+            "lastStatus": j.state.last_status,
+            "lastError": j.state.last_error,
+            "runCount": j.state.run_count,
+            "lastDurationMs": j.state.last_duration_ms,
+            "maxDurationMs": j.state.max_duration_ms,
+            "totalDurationMs": j.state.total_duration_ms,
+            "leaseOwner": j.state.lease_owner,
+            "leaseUntilMs": j.state.lease_until_ms,
+        },
+        "createdAtMs": j.created_at_ms,
+        "updatedAtMs": j.updated_at_ms,
+        "deleteAfterRun": j.delete_after_run,
+        "overlap": j.overlap,
+        "timeoutS": j.timeout_s,
+    }
+
+
+def job_from_dict(j: dict[str, Any]) -> CronJob:
+    """Deserialize a job written by job_to_dict (or by the legacy jobs.json)."""
+    state = j.get("state", {})
+    return CronJob(
+        id=j["id"],
+        name=j["name"],
+        enabled=j.get("enabled", True),
+        schedule=CronSchedule(
+            kind=j["schedule"]["kind"],
+            at_ms=j["schedule"].get("atMs"),
+            every_ms=j["schedule"].get("everyMs"),
+            expr=j["schedule"].get("expr"),
+            tz=j["schedule"].get("tz"),
+            jitter_s=j["schedule"].get("jitterS", 0),
+        ),
+        payload=CronPayload(
+            kind=j["payload"].get("kind", "agent_turn"),
+            message=j["payload"].get("message", ""),
+            deliver=j["payload"].get("deliver", False),
+            channel=j["payload"].get("channel"),
+            to=j["payload"].get("to"),
+            recipients=j["payload"].get("recipients", []),
+            spread_s=j["payload"].get("spreadS", 0),
+        ),
+        state=CronJobState(
+            next_run_at_ms=state.get("nextRunAtMs"),
+            last_run_at_ms=state.get("lastRunAtMs"),
+            last_status=state.get("lastStatus"),
+            last_error=state.get("lastError"),
+            run_count=state.get("runCount", 0),
+            last_duration_ms=state.get("lastDurationMs"),
+            max_duration_ms=state.get("maxDurationMs"),
+            total_duration_ms=state.get("totalDurationMs", 0),
+            lease_owner=state.get("leaseOwner"),
+            lease_until_ms=state.get("leaseUntilMs"),
+        ),
+        created_at_ms=j.get("createdAtMs", 0),
+        updated_at_ms=j.get("updatedAtMs", 0),
+        delete_after_run=j.get("deleteAfterRun", False),
+        overlap=j.get("overlap", "skip"),
+        timeout_s=j.get("timeoutS"),
+    )
+
+
+class CronJobStore:
+    """
+    One row per job in a SQLite database (WAL mode).
+
+    Writes touch only the rows that changed, each in its own transaction,
+    and next run times are indexed. A legacy jobs.json next to the database
+    is imported once and kept as jobs.json.migrated.
+
+    Several processes may share the database: a run is claimed with a
+    compare-and-set on the job's next run time plus a lease (owner, expiry),
+    and an expired lease can be taken over by another owner.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path if path.suffix == ".db" else path.with_suffix(".db")
+        self.legacy_path = self.path.with_suffix(".json")
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, kind in (("lease_owner", "TEXT"), ("lease_until_ms", "INTEGER")):
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+            self._conn = conn
+            self._migrate_json()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _migrate_json(self) -> None:
+        if not self.legacy_path.exists():
+            return
+        try:
+            data = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+            jobs = [job_from_dict(j) for j in data.get("jobs", [])]
+        except Exception as e:
+            logger.warning("Failed to read legacy cron store {}: {}", self.legacy_path, e)
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._row(job) for job in jobs],
+            )
+        try:
+            self.legacy_path.replace(self.legacy_path.with_name(self.legacy_path.name + ".migrated"))
+        except OSError:
+            pass  # Another process finished the migration first
+        logger.info("Cron: migrated {} jobs from {} to {}", len(jobs), self.legacy_path.name, self.path.name)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Immediate (write-locked) transaction, rolled back on error."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _row(job: CronJob) -> tuple:
+        return (
+            job.id,
+            int(job.enabled),
+            job.state.next_run_at_ms,
+            job.updated_at_ms,
+            json.dumps(job_to_dict(job), ensure_ascii=False),
+            job.state.lease_owner,
+            job.state.lease_until_ms,
+        )
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get(self, job_id: str) -> CronJob | None:
+        row = self.conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return job_from_dict(json.loads(row[0])) if row else None
+
+    def load(self) -> list[CronJob]:
+        rows = self.conn.execute("SELECT data FROM jobs ORDER BY rowid").fetchall()
+        jobs = []
+        for (data,) in rows:
+            try:
+                jobs.append(job_from_dict(json.loads(data)))
+            except (ValueError, KeyError) as e:
+                logger.warning("Cron: skipping unreadable job row: {}", e)
+        return jobs
+
+    def save(self, *jobs: CronJob) -> None:
+        """Insert or update the given jobs atomically."""
+        if not jobs:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                f"INSERT INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET enabled = excluded.enabled, "
+                "next_run_at_ms = excluded.next_run_at_ms, updated_at_ms = excluded.updated_at_ms, "
+                "data = excluded.data, lease_owner = excluded.lease_owner, "
+                "lease_until_ms = excluded.lease_until_ms",
+                [self._row(job) for job in jobs],
+            )
+
+    def claim(self, job: CronJob, expected_next_run_ms: int, owner: str, now_ms: int) -> bool:
+        """
+        Atomically take the run due at expected_next_run_ms.
+
+        job must already carry the post-claim state (advanced schedule and the
+        caller's lease). Fails if another owner advanced the job first or holds
+        a live lease on it.
+        """
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET enabled = ?, next_run_at_ms = ?, updated_at_ms = ?, data = ?, "
+                "lease_owner = ?, lease_until_ms = ? "
+                "WHERE id = ? AND enabled = 1 AND next_run_at_ms = ? "
+                "AND (lease_owner IS NULL OR lease_owner = ? OR lease_until_ms < ?)",
+                (*self._row(job)[1:], job.id, expected_next_run_ms, owner, now_ms),
+            )
+            return cur.rowcount == 1
+
+    def save_owned(self, job: CronJob, owner: str) -> bool:
+        """Write the job's row unless another owner has taken its lease meanwhile."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET enabled = ?, next_run_at_ms = ?, updated_at_ms = ?, data = ?, "
+                "lease_owner = ?, lease_until_ms = ? "
+                "WHERE id = ? AND (lease_owner IS NULL OR lease_owner = ?)",
+                (*self._row(job)[1:], job.id, owner),
+            )
+            return cur.rowcount == 1
+
+    def expired_leases(self, now_ms: int) -> list[CronJob]:
+        """Jobs whose run lease ran out (their owner died or overran)."""
+        rows = self.conn.execute(
+            "SELECT data FROM jobs WHERE lease_owner IS NOT NULL AND lease_until_ms < ?", (now_ms,)
+        ).fetchall()
+        return [job_from_dict(json.loads(data)) for (data,) in rows]
+
+    def take_over(self, job: CronJob, previous_owner: str, now_ms: int) -> bool:
+        """Move an expired lease to job.state.lease_owner; only one taker succeeds."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET updated_at_ms = ?, data = ?, lease_owner = ?, lease_until_ms = ? "
+                "WHERE id = ? AND lease_owner = ? AND lease_until_ms < ?",
+                (job.updated_at_ms, json.dumps(job_to_dict(job), ensure_ascii=False),
+                 job.state.lease_owner, job.state.lease_until_ms, job.id, previous_owner, now_ms),
+            )
+            return cur.rowcount == 1
+
+    def delete(self, job_id: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def next_run_at_ms(self) -> int | None:
+        """Earliest next run across enabled jobs (served by the index)."""
+        row = self.conn.execute(
+            "SELECT MIN(next_run_at_ms) FROM jobs WHERE enabled = 1 AND next_run_at_ms IS NOT NULL"
+        ).fetchone()
+        return row[0] if row else None
+
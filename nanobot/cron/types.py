@@ -16,6 +16,8 @@ class CronSchedule:
     expr: str | None = None
     # Timezone for cron expressions
     tz: str | None = None
+    # Deterministic per-job delay (0..jitter_s) so jobs sharing a schedule don't fire together
+    jitter_s: int = 0
 
 
 @dataclass
@@ -27,6 +29,10 @@ class CronPayload:
     deliver: bool = False
     channel: str | None = None  # e.g. "whatsapp"
     to: str | None = None  # e.g. phone number
+    # Fan-out: the same result is delivered to every "channel:chat_id" here
+    recipients: list[str] = field(default_factory=list)
+    # Spread fan-out deliveries over this many seconds
+    spread_s: int = 0
 
 
 @dataclass
@@ -36,6 +42,18 @@ class CronJobState:
     last_run_at_ms: int | None = None
     last_status: Literal["ok", "error", "skipped"] | None = None
     last_error: str | None = None
+    # Run-duration stats
+    run_count: int = 0
+    last_duration_ms: int | None = None
+    max_duration_ms: int | None = None
+    total_duration_ms: int = 0
+    # Run lease held by the replica executing the job
+    lease_owner: str | None = None
+    lease_until_ms: int | None = None
+
+    @property
+    def avg_duration_ms(self) -> int | None:
+        return self.total_duration_ms // self.run_count if self.run_count else None
 
 
 @dataclass
@@ -50,6 +68,10 @@ class CronJob:
     created_at_ms: int = 0
     updated_at_ms: int = 0
     delete_after_run: bool = False
+    # What to do when the job comes due while a previous run is still active
+    overlap: Literal["skip", "queue", "allow"] = "skip"
+    # Per-run time budget in seconds (None = service default)
+    timeout_s: float | None = None
 
 
 @dataclass
@@ -1,14 +1,31 @@
-"""Heartbeat service - periodic agent wake-up to check for tasks."""
+"""Heartbeat service - agent wake-ups driven by the tasks in HEARTBEAT.md."""
 
 import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from loguru import logger
 
-# Default interval: 30 minutes
+from nanobot.utils.helpers import ensure_dir
+
+if TYPE_CHECKING:
+    from nanobot.watcher import WatcherService
+
+# Default re-check interval for open tasks without a due time: 30 minutes
 DEFAULT_HEARTBEAT_INTERVAL_S = 30 * 60
 
+# How often HEARTBEAT.md is checked for changes (a stat call, no LLM)
+DEFAULT_WATCH_INTERVAL_S = 5
+
+# Due time for tasks that carry a date but no time of day
+DATE_ONLY_DUE_HOUR = 9
+
 # The prompt sent to agent during heartbeat
 HEARTBEAT_PROMPT = """Read HEARTBEAT.md in your workspace (if it exists).
 Follow any instructions or tasks listed there.
@@ -18,57 +35,138 @@ If nothing needs attention, reply with just: HEARTBEAT_OK"""
 # Token that indicates "nothing to do"
 HEARTBEAT_OK_TOKEN = "HEARTBEAT_OK"
 
+_CHECKBOX_RE = re.compile(r"^[-*]\s+\[([ xX])\]\s*")
+_LIST_ITEM_RE = re.compile(r"^[-*]\s+")
+_ISO_DUE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{1,2}):(\d{2}))?\b")
+_BR_DUE_RE = re.compile(r"\b(\d{2})/(\d{2})/(\d{4})(?:\s+(?:às\s+)?(\d{1,2})[:h](\d{2}))?\b")
+_EVERY_RE = re.compile(r"\b(?:every|a cada)\s+(\d+)\s*(m|min|mins|minutes?|minutos?|h|hours?|horas?|d|days?|dias?)\b", re.I)
+_UNIT_S = {"m": 60, "h": 3600, "d": 86400}
 
-def _is_heartbeat_empty(content: str | None) -> bool:
-    """Check if HEARTBEAT.md has no actionable content."""
-    if not content:
-        return True
-    
-    # Lines to skip: empty, headers, HTML comments
-    for line in content.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or line.startswith("<!--"):
+
+@dataclass
+class HeartbeatTask:
+    """An open (unchecked) task parsed from HEARTBEAT.md."""
+
+    key: str
+    text: str
+    due_ms: int | None = None  # One-off: act once when this time is reached
+    every_s: int | None = None  # Recurring: act at most this often
+
+
+def _parse_due(text: str) -> int | None:
+    """Due time in ms from 'YYYY-MM-DD[ HH:MM]' or 'DD/MM/YYYY[ HH:MM]' (local time)."""
+    m = _ISO_DUE_RE.search(text)
+    if m:
+        year, month, day, hour, minute = m.groups()
+    else:
+        m = _BR_DUE_RE.search(text)
+        if not m:
+            return None
+        day, month, year, hour, minute = m.groups()
+    try:
+        dt = datetime(int(year), int(month), int(day),
+                      int(hour) if hour else DATE_ONLY_DUE_HOUR, int(minute) if minute else 0)
+    except ValueError:
+        return None
+    return int(dt.timestamp() * 1000)
+
+
+def _parse_every(text: str) -> int | None:
+    m = _EVERY_RE.search(text)
+    if not m or int(m.group(1)) <= 0:
+        return None
+    return int(m.group(1)) * _UNIT_S[m.group(2)[0].lower()]
+
+
+def parse_heartbeat(content: str | None) -> list[HeartbeatTask]:
+    """
+    Open tasks in HEARTBEAT.md.
+
+    Only list items ('- [ ] ...', '- ...', '* ...') are tasks; headers, prose,
+    HTML comments and checked boxes ([x]) are ignored. A task may carry a due
+    date/time or an 'every 15m' / 'a cada 2h' recurrence. Indented lines
+    continue the task above.
+    """
+    tasks: list[HeartbeatTask] = []
+    lines: list[str] = []
+    in_comment = False
+    for raw in (content or "").splitlines():
+        line = raw.strip()
+        if in_comment or line.startswith("<!--"):
+            in_comment = "-->" not in line
+            continue
+        if raw[:1].isspace() and line and lines and lines[-1] and not _CHECKBOX_RE.match(line):
+            lines[-1] += " " + line
             continue
-        
-        # If it's a checkbox, check if it has text after it
-        if line.startswith(("- [ ]", "* [ ]", "- [x]", "* [x]")):
-            task_text = line[5:].strip()
-            if task_text:
-                return False
+        # Anything that is not a list item (headers, prose, blank lines) ends the task above
+        lines.append(line if _LIST_ITEM_RE.match(line) else "")
+
+    for line in lines:
+        if not line:
+            continue
+        m = _CHECKBOX_RE.match(line)
+        if m and m.group(1).lower() == "x":
             continue
-            
-        # Any other non-empty line is considered actionable
-        return False
-    
-    return True
+        text = line[(m or _LIST_ITEM_RE.match(line)).end():].strip()
+        if not text:
+            continue
+        key = hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()[:16]
+        tasks.append(HeartbeatTask(key=key, text=text, due_ms=_parse_due(text), every_s=_parse_every(text)))
+    return tasks
+
+
+def _is_heartbeat_empty(content: str | None) -> bool:
+    """Check if HEARTBEAT.md has no actionable content."""
+    return not parse_heartbeat(content)
 
 
 class HeartbeatService:
     """
-    Periodic heartbeat service that wakes the agent to check for tasks.
-    
-    The agent reads HEARTBEAT.md from the workspace and executes any
-    tasks listed there. If nothing needs attention, it replies HEARTBEAT_OK.
+    Wakes the agent when HEARTBEAT.md has something to act on.
+
+    The file is watched cheaply (stat, then a content hash) and parsed into
+    open tasks. The agent is only called when a task is new or edited, a
+    dated task comes due, a recurring task's period elapses, or an undated
+    task has not been checked for interval_s. Between those moments the
+    service sleeps until the earliest parsed due time, so unchanged files
+    cost no LLM calls. If nothing needs attention the agent replies HEARTBEAT_OK.
+
+    With a watcher, edits wake the service immediately instead of being
+    picked up by polling every watch_interval_s.
     """
-    
+
     def __init__(
         self,
         workspace: Path,
         on_heartbeat: Callable[[str], Coroutine[Any, Any, str]] | None = None,
         interval_s: int = DEFAULT_HEARTBEAT_INTERVAL_S,
         enabled: bool = True,
+        watch_interval_s: float = DEFAULT_WATCH_INTERVAL_S,
+        state_file: Path | None = None,
+        watcher: "WatcherService | None" = None,
     ):
         self.workspace = workspace
         self.on_heartbeat = on_heartbeat
         self.interval_s = interval_s
         self.enabled = enabled
+        self.watch_interval_s = watch_interval_s
+        self.state_file = state_file or workspace / "memory" / "heartbeat_state.json"
         self._running = False
         self._task: asyncio.Task | None = None
-    
+        self._stat: tuple[int, int] | None = None
+        self._content_hash: str | None = None
+        self._tasks: list[HeartbeatTask] = []
+        self._last_run: dict[str, int] = {}  # task key -> last time the agent was woken for it (0 = never)
+        self._next_wake_ms: int | None = None
+        self._watcher = watcher
+        self._watch = None
+        self._wake = asyncio.Event()
+        self._load_state()
+
     @property
     def heartbeat_file(self) -> Path:
         return self.workspace / "HEARTBEAT.md"
-    
+
     def _read_heartbeat_file(self) -> str | None:
         """Read HEARTBEAT.md content."""
         if self.heartbeat_file.exists():
@@ -77,62 +175,162 @@ class HeartbeatService:
             except Exception:
                 return None
         return None
-    
+
+    # ---- state ----
+
+    def _load_state(self) -> None:
+        try:
+            data = json.loads(self.state_file.read_text(encoding="utf-8"))
+            self._last_run = {k: int(v) for k, v in data.get("tasks", {}).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning("Heartbeat state unreadable, starting fresh: {}", e)
+
+    def _save_state(self) -> None:
+        try:
+            ensure_dir(self.state_file.parent)
+            tmp = self.state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"tasks": self._last_run}), encoding="utf-8")
+            tmp.replace(self.state_file)
+        except OSError as e:
+            logger.warning("Heartbeat: failed to save state: {}", e)
+
+    # ---- pre-check ----
+
+    def _file_changed(self) -> bool:
+        """Re-parse HEARTBEAT.md if it changed on disk; True when its content did."""
+        try:
+            st = self.heartbeat_file.stat()
+            stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stat = None
+        if stat == self._stat and self._content_hash is not None:
+            return False
+        self._stat = stat
+        content = self._read_heartbeat_file() if stat else None
+        digest = hashlib.sha1((content or "").encode("utf-8")).hexdigest()
+        if digest == self._content_hash:
+            return False
+        self._content_hash = digest
+        self._tasks = parse_heartbeat(content)
+        keys = {t.key for t in self._tasks}
+        self._last_run = {k: v for k, v in self._last_run.items() if k in keys}
+        return True
+
+    def _due(self, task: HeartbeatTask, now_ms: int) -> int | None:
+        """When task next needs the agent (ms), or None if never again."""
+        last = self._last_run.get(task.key)
+        if task.due_ms is not None:
+            return task.due_ms if not last or last < task.due_ms else None
+        if last is None:
+            return now_ms  # New or edited task
+        period = task.every_s or self.interval_s
+        return last + period * 1000 if period > 0 else None
+
+    def _evaluate(self, now_ms: int) -> list[HeartbeatTask]:
+        """Tasks that need the agent now; also sets the next wake time."""
+        actionable, upcoming = [], []
+        for task in self._tasks:
+            due = self._due(task, now_ms)
+            if due is None:
+                continue
+            if due <= now_ms:
+                actionable.append(task)
+            else:
+                upcoming.append(due)
+        self._next_wake_ms = min(upcoming) if upcoming else None
+        return actionable
+
+    def _mark_seen(self, tasks: list[HeartbeatTask], now_ms: int) -> None:
+        for task in tasks:
+            self._last_run[task.key] = now_ms
+        # Dated tasks are remembered (never run) so they don't count as new on restart
+        for task in self._tasks:
+            self._last_run.setdefault(task.key, 0 if task.due_ms is not None else now_ms)
+        self._save_state()
+
+    # ---- loop ----
+
     async def start(self) -> None:
         """Start the heartbeat service."""
         if not self.enabled:
             logger.info("Heartbeat disabled")
             return
-        
+
         self._running = True
+        if self._watcher is not None:
+            self._watch = self._watcher.watch(self.heartbeat_file, lambda _: self._wake.set())
         self._task = asyncio.create_task(self._run_loop())
-        logger.info("Heartbeat started (every {}s)", self.interval_s)
-    
+        logger.info("Heartbeat started (watching {}, re-check every {}s)", self.heartbeat_file.name, self.interval_s)
+
     def stop(self) -> None:
         """Stop the heartbeat service."""
         self._running = False
+        if self._watch:
+            self._watch.cancel()
+            self._watch = None
         if self._task:
             self._task.cancel()
             self._task = None
-    
+
     async def _run_loop(self) -> None:
-        """Main heartbeat loop."""
+        """Main heartbeat loop: cheap file checks, agent only when something is actionable."""
         while self._running:
             try:
-                await asyncio.sleep(self.interval_s)
-                if self._running:
-                    await self._tick()
+                self._wake.clear()
+                await self._tick()
+                delay = None if self._watch else self.watch_interval_s
+                if self._next_wake_ms is not None:
+                    until = max(0.0, self._next_wake_ms / 1000 - time.time())
+                    delay = until if delay is None else min(delay, until)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("Heartbeat error: {}", e)
-    
+                await asyncio.sleep(self.watch_interval_s)
+
     async def _tick(self) -> None:
         """Execute a single heartbeat tick."""
-        content = self._read_heartbeat_file()
-        
-        # Skip if HEARTBEAT.md is empty or doesn't exist
-        if _is_heartbeat_empty(content):
-            logger.debug("Heartbeat: no tasks (HEARTBEAT.md empty)")
+        changed = self._file_changed()
+        now_ms = int(time.time() * 1000)
+        if not changed and (self._next_wake_ms is None or now_ms < self._next_wake_ms):
+            return
+
+        actionable = self._evaluate(now_ms)
+        if not actionable:
+            self._mark_seen([], now_ms)
+            logger.debug("Heartbeat: nothing actionable in HEARTBEAT.md")
             return
-        
-        logger.info("Heartbeat: checking for tasks...")
-        
+
+        logger.info("Heartbeat: {} task(s) need attention", len(actionable))
+
         if self.on_heartbeat:
+            items = "\n".join(f"- {t.text}" for t in actionable)
             try:
-                response = await self.on_heartbeat(HEARTBEAT_PROMPT)
-                
+                response = await self.on_heartbeat(f"{HEARTBEAT_PROMPT}\n\nItems that need attention now:\n{items}")
+
                 # Check if agent said "nothing to do"
                 if HEARTBEAT_OK_TOKEN.replace("_", "") in response.upper().replace("_", ""):
                     logger.debug("Heartbeat: OK (no action needed)")
                 else:
                     logger.info("Heartbeat: completed session")
-                    
+
             except Exception as e:
                 import traceback
                 logger.error("Heartbeat execution failed: {}\n{}", e, traceback.format_exc())
-                print(f"DEBUG: Heartbeat execution failed: {e}")
-    
+
+        # Edits the agent made to HEARTBEAT.md during the run don't trigger another one
+        done_ms = int(time.time() * 1000)
+        self._mark_seen(actionable, done_ms)
+        if self._file_changed():
+            self._mark_seen([], done_ms)
+        self._evaluate(done_ms)
+
     async def trigger_now(self) -> str | None:
         """Manually trigger a heartbeat."""
         if self.on_heartbeat:
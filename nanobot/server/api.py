@@ -49,6 +49,7 @@ async def get_status():
         "uptime": "1h 12m",
         "tokens_today": 12450,
         "alerts": 0,
+        "loops": _agent.loop_metrics.stats(),
         "services": [
             {"id": "tg", "name": "Telegram", "status": "online", "uptime": "1h 12m", "response": "120ms"},
             {"id": "email", "name": "Email", "status": "online", "uptime": "1h 10m", "response": "4s"},
@@ -79,8 +80,34 @@ async def get_agents():
 
 @app.get("/api/tasks")
 async def get_tasks():
-    # This would pull from the agent's active task queue
-    return []
+    # Background subagents: running, queued, then recently finished
+    if not _agent:
+        return []
+    return [r.to_dict() for r in _agent.subagents.list_tasks()]
+
+@app.get("/api/subagents")
+async def get_subagents():
+    if not _agent:
+        return {"stats": {}, "tasks": []}
+    return {
+        "stats": _agent.subagents.stats(),
+        "tasks": [r.to_dict() for r in _agent.subagents.list_tasks()],
+        "groups": [g.to_dict() for g in _agent.subagents.list_groups()],
+    }
+
+@app.get("/api/subagents/{task_id}")
+async def get_subagent(task_id: str):
+    record = _agent.subagents.get(task_id) if _agent else None
+    if record is None:
+        raise HTTPException(status_code=404, detail="Subagent not found")
+    return record.to_dict()
+
+@app.post("/api/subagents/{task_id}/cancel")
+async def cancel_subagent(task_id: str):
+    # The API runs in its own thread; the cancel is handed to the agent's loop
+    if not _agent or not _agent.subagents.cancel_threadsafe(task_id):
+        raise HTTPException(status_code=404, detail="Subagent not queued or running")
+    return {"id": task_id, "cancelled": True}
 
 @app.post("/api/extras/generate/{script_type}")
 async def generate_extra(script_type: str, background_tasks: BackgroundTasks):
@@ -0,0 +1,5 @@
+"""Shared filesystem watcher for hot-reloading workspace files and config."""
+
+from nanobot.watcher.service import Watch, WatcherService
+
+__all__ = ["Watch", "WatcherService"]
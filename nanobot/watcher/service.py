@@ -0,0 +1,296 @@
+"""Shared filesystem watcher - inotify with a polling fallback, debounced callbacks."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import inspect
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+# inotify(7) event masks
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+ChangeCallback = Callable[[set[Path]], Any]
+
+
+@dataclass(eq=False)
+class Watch:
+    """A subscription: callback gets the changed paths under path, after debouncing."""
+
+    path: Path
+    callback: ChangeCallback
+    recursive: bool = False
+    polled: bool = False
+    _service: "WatcherService | None" = field(default=None, repr=False)
+
+    def matches(self, changed: Path) -> bool:
+        if changed == self.path:
+            return True
+        if self.recursive:
+            return self.path in changed.parents
+        return changed.parent == self.path
+
+    def cancel(self) -> None:
+        if self._service:
+            self._service.unwatch(self)
+            self._service = None
+
+
+def _load_inotify() -> Any | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class WatcherService:
+    """
+    One filesystem watcher shared by every subsystem that caches files.
+
+    Subscribers register a file or directory with watch() and receive the
+    set of changed paths once per debounce window, on the event loop. Events
+    come from inotify on Linux; elsewhere, or when inotify is unavailable or
+    out of watches, the affected paths are polled with stat instead. Paths
+    that don't exist yet are picked up when they are created.
+    """
+
+    def __init__(
+        self,
+        debounce_s: float = 0.05,
+        poll_interval_s: float = 1.0,
+        use_inotify: bool = True,
+    ):
+        self.debounce_s = debounce_s
+        self.poll_interval_s = poll_interval_s
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd: int | None = None
+        self._wds: dict[int, Path] = {}  # inotify watch descriptor -> directory
+        self._dirs: dict[Path, int] = {}
+        self._watches: list[Watch] = []
+        self._pending: dict[Watch, set[Path]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._snapshots: dict[Watch, dict[Path, tuple[int, int]]] = {}
+        self._poll_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        """Start delivering events (must be called from the event loop)."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                self._loop.add_reader(fd, self._read_events)
+            else:
+                logger.warning("Watcher: inotify unavailable ({}), polling instead", os.strerror(ctypes.get_errno()))
+        for w in self._watches:
+            self._arm(w)
+        logger.info("Watcher started ({}, {} paths)", self.backend, len(self._watches))
+
+    def stop(self) -> None:
+        if self._fd is not None:
+            if self._loop:
+                self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._wds.clear()
+        self._dirs.clear()
+        self._loop = None
+
+    # ---- subscriptions ----
+
+    def watch(self, path: Path, callback: ChangeCallback, recursive: bool = False) -> Watch:
+        """
+        Call callback(changed_paths) when path (a file, or a directory's entries) changes.
+
+        The callback may be a plain function or a coroutine function. Watches
+        added before start() are armed when the service starts.
+        """
+        w = Watch(path=Path(path).absolute(), callback=callback, recursive=recursive, _service=self)
+        self._watches.append(w)
+        if self._loop is not None:
+            self._arm(w)
+        return w
+
+    def unwatch(self, w: Watch) -> None:
+        if w in self._watches:
+            self._watches.remove(w)
+        self._snapshots.pop(w, None)
+        self._pending.pop(w, None)
+
+    def _arm(self, w: Watch) -> None:
+        if self._fd is None or w.polled:
+            self._start_polling(w)
+            return
+        target = w.path if w.recursive or w.path.is_dir() else w.path.parent
+        existing = target
+        while not existing.is_dir() and existing != existing.parent:
+            existing = existing.parent
+        dirs = [existing]
+        if existing == target and w.recursive:
+            dirs += [Path(root) / d for root, names, _ in os.walk(target) for d in names]
+        for d in dirs:
+            if not self._add_dir(d):
+                w.polled = True
+                self._start_polling(w)
+                return
+
+    def _add_dir(self, directory: Path) -> bool:
+        if directory in self._dirs:
+            return True
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            logger.warning("Watcher: cannot watch {} ({}), polling it instead", directory, os.strerror(errno))
+            return False
+        self._wds[wd] = directory
+        self._dirs[directory] = wd
+        return True
+
+    # ---- inotify ----
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.error("Watcher: inotify read failed: {}", e)
+            return
+        offset, rearm = 0, False
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size: offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                for w in self._watches:
+                    self._queue(w, w.path)
+                continue
+            directory = self._wds.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wds.pop(wd, None)
+                self._dirs.pop(directory, None)
+                rearm = True
+                continue
+            changed = directory / os.fsdecode(name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                rearm = True
+            for w in self._watches:
+                if w.matches(changed) or (mask & IN_ISDIR and changed in w.path.parents):
+                    self._queue(w, changed if w.matches(changed) else w.path)
+        if rearm:
+            # New directories inside recursive watches, or a watched path's parent appeared
+            for w in list(self._watches):
+                if not w.polled:
+                    self._arm(w)
+
+    # ---- polling ----
+
+    def _start_polling(self, w: Watch) -> None:
+        self._snapshots[w] = self._snapshot(w)
+        if self._poll_task is None and self._loop is not None:
+            self._poll_task = self._loop.create_task(self._poll_loop())
+
+    def _snapshot(self, w: Watch) -> dict[Path, tuple[int, int]]:
+        snap: dict[Path, tuple[int, int]] = {}
+        try:
+            st = w.path.stat()
+        except OSError:
+            return snap
+        snap[w.path] = (st.st_mtime_ns, st.st_size)
+        if not w.path.is_dir():
+            return snap
+        stack = [w.path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            est = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        snap[Path(entry.path)] = (est.st_mtime_ns, est.st_size)
+                        if w.recursive and entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+            except OSError:
+                continue
+        return snap
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_s)
+            for w, old in list(self._snapshots.items()):
+                new = self._snapshot(w)
+                for p in old.keys() | new.keys():
+                    if old.get(p) != new.get(p):
+                        self._queue(w, p)
+                self._snapshots[w] = new
+
+    # ---- dispatch ----
+
+    def _queue(self, w: Watch, changed: Path) -> None:
+        self._pending.setdefault(w, set()).add(changed)
+        if self._flush_handle is None and self._loop is not None:
+            self._flush_handle = self._loop.call_later(self.debounce_s, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for w, paths in pending.items():
+            if w not in self._watches:
+                continue
+            try:
+                result = w.callback(paths)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error("Watcher: callback for {} failed: {}", w.path, e)
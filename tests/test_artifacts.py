@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.artifacts import ArtifactReadTool
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import ReadFileTool
+from nanobot.agent.tools.registry import ToolRegistry
+
+
+class _BigTool(Tool):
+    name = "big"
+    description = "Return a long text."
+    parameters = {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        return "\n".join(f"line {i} {'x' * 40}" for i in range(1000))
+
+
+def _registry(tmp_path: Path) -> tuple[ToolRegistry, ArtifactStore]:
+    store = ArtifactStore(tmp_path / "artifacts", spill_chars=1000, preview_chars=200)
+    registry = ToolRegistry(artifacts=store)
+    registry.register(_BigTool())
+    registry.register(ArtifactReadTool(store, max_chars=500))
+    return registry, store
+
+
+async def test_large_result_is_spilled_with_preview_and_handle(tmp_path: Path) -> None:
+    registry, store = _registry(tmp_path)
+    full = await _BigTool().execute()
+
+    result = await registry.execute("big", {})
+    assert len(result) < 600
+    assert result.startswith("line 0 ")
+    handle = result.split("artifact ")[1].split(";")[0]
+    assert store.read(handle) == full
+
+    # Content-addressed: the same result maps to the same artifact
+    assert await registry.execute("big", {}) == result
+    assert len(list((tmp_path / "artifacts").iterdir())) == 1
+
+
+async def test_artifact_read_pages_and_searches(tmp_path: Path) -> None:
+    registry, _ = _registry(tmp_path)
+    handle = (await registry.execute("big", {})).split("artifact ")[1].split(";")[0]
+
+    page = await registry.execute("artifact_read", {"handle": handle, "offset": 100})
+    assert page.startswith(f"[{handle}: chars 100-600 of ")
+    assert "continue with offset=600" in page
+
+    found = await registry.execute("artifact_read", {"handle": handle, "pattern": r"^line 99[0-4] "})
+    assert found.splitlines()[0] == f"[{handle}: 5 matching lines]"
+    assert found.splitlines()[1].startswith("991: line 990 ")
+
+    assert (await registry.execute("artifact_read", {"handle": "../secret"})).startswith("Error")
+
+
+async def test_self_paging_tools_are_not_spilled(tmp_path: Path) -> None:
+    registry, _ = _registry(tmp_path)
+    registry.register(ReadFileTool(workspace=tmp_path))
+    (tmp_path / "big.txt").write_text("".join(f"line {i} {'x' * 40}\n" for i in range(1, 2001)), encoding="utf-8")
+
+    result = await registry.execute("read_file", {"path": "big.txt", "offset": 1, "limit": 500})
+    assert "artifact" not in result
+    assert "line 500 " in result and "line 501 " not in result
+    assert "offset=501" in result
@@ -0,0 +1,93 @@
+import asyncio
+
+from nanobot.agent.consolidation import ConsolidationService
+from nanobot.session.manager import Session
+
+
+class _BlockingStore:
+    """Records consolidate calls; each call waits until released."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, bool, int]] = []
+        self.release = asyncio.Event()
+        self.active = 0
+        self.max_active = 0
+
+    async def consolidate(self, session, provider, model, *, archive_all=False, memory_window=50, **kwargs):
+        self.calls.append((session.key, archive_all, len(session.messages)))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+
+
+def _session(key: str, count: int) -> Session:
+    session = Session(key=key)
+    for i in range(count):
+        session.add_message("user", f"msg{i}")
+    return session
+
+
+async def test_requests_for_busy_session_are_coalesced() -> None:
+    store = _BlockingStore()
+    service = ConsolidationService(store, provider=None, model="cheap")
+    session = _session("cli:a", 10)
+
+    assert service.submit(session) is True
+    await asyncio.sleep(0)
+    for _ in range(5):
+        assert service.submit(session) is False
+
+    store.release.set()
+    await asyncio.wait_for(service.wait_idle(), timeout=1)
+
+    # One in flight + one pending, regardless of how many requests arrived
+    assert len(store.calls) == 2
+    service.stop()
+
+
+async def test_archive_jobs_are_merged_not_dropped() -> None:
+    store = _BlockingStore()
+    service = ConsolidationService(store, provider=None, model="cheap")
+
+    service.submit(_session("cli:a", 3))
+    await asyncio.sleep(0)
+    service.submit(_session("cli:a", 4), archive_all=True)
+    service.submit(_session("cli:a", 5))
+    service.submit(_session("cli:a", 6), archive_all=True)
+
+    store.release.set()
+    await asyncio.wait_for(service.wait_idle(), timeout=1)
+
+    assert store.calls == [("cli:a", False, 3), ("cli:a", True, 10)]
+    service.stop()
+
+
+async def test_concurrency_limit_across_sessions() -> None:
+    store = _BlockingStore()
+    service = ConsolidationService(store, provider=None, model="cheap", max_concurrent=2)
+
+    for key in ("a", "b", "c", "d"):
+        service.submit(_session(key, 1))
+    await asyncio.sleep(0.01)
+    assert store.active == 2
+
+    store.release.set()
+    await asyncio.wait_for(service.wait_idle(), timeout=1)
+    assert store.max_active == 2
+    assert len(store.calls) == 4
+    service.stop()
+
+
+async def test_job_exceeding_time_budget_is_abandoned() -> None:
+    store = _BlockingStore()
+    service = ConsolidationService(store, provider=None, model="cheap", timeout_s=0.01)
+
+    service.submit(_session("cli:a", 1))
+    await asyncio.wait_for(service.wait_idle(), timeout=1)
+
+    assert store.active == 0
+    assert service.is_busy("cli:a") is False
+    service.stop()
@@ -0,0 +1,81 @@
+import time
+
+from nanobot.cron.fanout import ChannelRateLimiter, deliver_fanout, fanout_targets
+from nanobot.cron.service import CronService, _compute_next_run
+from nanobot.cron.types import CronJob, CronPayload, CronSchedule
+
+
+def _job(recipients: list[str], spread_s: int = 0) -> CronJob:
+    return CronJob(id="digest", name="digest", payload=CronPayload(
+        message="hi", channel="telegram", recipients=recipients, spread_s=spread_s,
+    ))
+
+
+def test_jitter_is_deterministic_and_within_window() -> None:
+    schedule = CronSchedule(kind="cron", expr="0 9 * * *", tz="UTC", jitter_s=600)
+    now = 1_767_254_400_000  # 2026-01-01 08:00 UTC
+    plain = _compute_next_run(CronSchedule(kind="cron", expr="0 9 * * *", tz="UTC"), now)
+
+    offsets = {_compute_next_run(schedule, now, f"job{i}") - plain for i in range(50)}
+    assert all(0 <= o < 600_000 for o in offsets)
+    assert len(offsets) > 40
+
+    first = _compute_next_run(schedule, now, "job1")
+    assert _compute_next_run(schedule, now, "job1") == first
+    # Computing from the moment it fired yields the next day at the same offset
+    assert _compute_next_run(schedule, first, "job1") == first + 86_400_000
+
+
+def test_targets_are_deduplicated_and_default_channel() -> None:
+    job = _job(["telegram:1", "2", "whatsapp:3", "telegram:1"])
+    assert fanout_targets(job) == [("telegram", "1"), ("telegram", "2"), ("whatsapp", "3")]
+
+
+async def test_deliveries_are_batched_spread_and_rate_limited() -> None:
+    sent = []
+
+    async def publish(msg):
+        sent.append((time.monotonic(), msg.channel, msg.chat_id))
+
+    job = _job([f"telegram:{i}" for i in range(6)] + ["whatsapp:w"], spread_s=1)
+    start = time.monotonic()
+    count = await deliver_fanout(job, "digest", publish, ChannelRateLimiter({"whatsapp": 0}), batch_size=3)
+
+    assert count == 7
+    offsets = sorted(t - start for t, _, _ in sent)
+    assert offsets[2] < 0.1
+    assert 0.3 < offsets[3] < 0.5
+    assert offsets[6] > 0.6
+
+    order = [(ch, to) for _, ch, to in sorted(sent)]
+    sent.clear()
+    await deliver_fanout(job, "digest", publish, batch_size=3)
+    assert {(ch, to) for _, ch, to in sent[:3]} == set(order[:3])
+
+
+async def test_rate_limiter_paces_per_channel() -> None:
+    limiter = ChannelRateLimiter({"telegram": 50})
+    start = time.monotonic()
+    for _ in range(6):
+        await limiter.acquire("telegram")
+        await limiter.acquire("cli")
+    assert time.monotonic() - start >= 0.09
+
+
+async def test_fanout_job_runs_once_for_all_recipients(tmp_path) -> None:
+    runs = []
+
+    async def on_job(job):
+        runs.append(fanout_targets(job))
+
+    service = CronService(tmp_path / "jobs.db", on_job=on_job)
+    job = service.add_job(
+        "digest", CronSchedule(kind="cron", expr="0 9 * * *", jitter_s=300), "digest",
+        recipients=[f"telegram:{i}" for i in range(500)], spread_s=60,
+    )
+    assert await service.run_job(job.id)
+
+    assert len(runs) == 1 and len(runs[0]) == 500
+    reloaded = CronService(tmp_path / "jobs.db").list_jobs()[0]
+    assert reloaded.payload.recipients == job.payload.recipients
+    assert (reloaded.payload.spread_s, reloaded.schedule.jitter_s) == (60, 300)
@@ -0,0 +1,146 @@
+import asyncio
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from nanobot.cron.service import CronService
+from nanobot.cron.types import CronSchedule
+
+REPLICA = """
+import asyncio, sys
+from pathlib import Path
+from nanobot.cron.service import CronService
+
+async def main(db, out, owner):
+    async def on_job(job):
+        with open(out, "a") as f:
+            f.write(f"{job.id} {owner}\\n")
+        await asyncio.sleep(0.05)
+
+    service = CronService(Path(db), on_job=on_job, catch_up="once", sync_interval_s=0.05, owner_id=owner)
+    await service.start()
+    await asyncio.sleep(float(sys.argv[4]))
+    service.stop()
+
+asyncio.run(main(*sys.argv[1:4]))
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def test_replica_processes_run_each_job_once(tmp_path) -> None:
+    db = tmp_path / "jobs.db"
+    out = tmp_path / "runs.log"
+    service = CronService(db)
+    due = _now_ms() + 1500
+    ids = {service.add_job(f"r{i}", CronSchedule(kind="at", at_ms=due + i * 20), "hi").id for i in range(15)}
+    service.stop()
+
+    procs = [
+        subprocess.Popen([sys.executable, "-c", REPLICA, str(db), str(out), f"replica{n}", "3"])
+        for n in range(3)
+    ]
+    for proc in procs:
+        assert proc.wait(timeout=30) == 0
+
+    runs = [line.split()[0] for line in out.read_text().splitlines()]
+    assert sorted(runs) == sorted(ids)
+
+
+async def test_expired_lease_is_taken_over(tmp_path) -> None:
+    db = tmp_path / "jobs.db"
+    started = asyncio.Event()
+
+    async def hang(job):
+        started.set()
+        await asyncio.sleep(60)
+
+    a = CronService(db, on_job=hang, owner_id="a", sync_interval_s=60)
+    await a.start()
+    job = a.add_job("report", CronSchedule(kind="every", every_ms=3_600_000), "hi")
+    job.state.next_run_at_ms = 1
+    a._save_job(job)
+    a._push(job)
+    await a._on_timer()
+    await asyncio.wait_for(started.wait(), 1)
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT lease_owner FROM jobs").fetchone()[0] == "a"
+    conn.execute("UPDATE jobs SET lease_until_ms = 1")  # replica "a" died
+    conn.commit()
+
+    reran = asyncio.Event()
+
+    async def record(job):
+        reran.set()
+
+    b = CronService(db, on_job=record, owner_id="b", catch_up="once", sync_interval_s=60)
+    await b.start()
+    b._sync()
+    await asyncio.wait_for(reran.wait(), 1)
+    await asyncio.sleep(0.05)
+
+    assert conn.execute("SELECT lease_owner FROM jobs").fetchone()[0] is None
+    assert b.list_jobs()[0].state.run_count == 1
+    a.stop()
+    b.stop()
+
+
+async def test_claim_fails_when_another_replica_ran_first(tmp_path) -> None:
+    db = tmp_path / "jobs.db"
+    runs = []
+
+    async def on_job(job):
+        runs.append(job.id)
+
+    a = CronService(db, on_job=on_job, owner_id="a")
+    b = CronService(db, on_job=on_job, owner_id="b")
+    await a.start()
+    await b.start()
+    job = a.add_job("once", CronSchedule(kind="every", every_ms=3_600_000), "hi")
+    job.state.next_run_at_ms = 1
+    a._save_job(job)
+    a._push(job)
+    b._sync()
+
+    await a._on_timer()
+    await b._on_timer()
+    await asyncio.sleep(0.05)
+
+    assert runs == [job.id]
+    assert b.list_jobs()[0].state.next_run_at_ms > _now_ms()
+    a.stop()
+    b.stop()
+
+
+def _seed_missed_job(db: Path) -> str:
+    seed = CronService(db)
+    job = seed.add_job("missed", CronSchedule(kind="every", every_ms=3_600_000), "hi")
+    job.state.next_run_at_ms = _now_ms() - 10_000
+    seed._save_job(job)
+    seed.stop()
+    return job.id
+
+
+async def test_catch_up_policy(tmp_path) -> None:
+    runs = []
+
+    async def on_job(job):
+        runs.append(job.id)
+
+    _seed_missed_job(tmp_path / "skip.db")
+    skip = CronService(tmp_path / "skip.db", on_job=on_job, catch_up="skip")
+    await skip.start()
+    assert skip.list_jobs()[0].state.next_run_at_ms > _now_ms()
+    skip.stop()
+
+    job_id = _seed_missed_job(tmp_path / "once.db")
+    once = CronService(tmp_path / "once.db", on_job=on_job, catch_up="once")
+    await once.start()
+    await asyncio.sleep(0.1)
+    once.stop()
+    assert runs == [job_id]
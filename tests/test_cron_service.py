@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 import pytest
 
 from nanobot.cron.service import CronService
@@ -28,3 +31,98 @@ def test_add_job_accepts_valid_timezone(tmp_path) -> None:
 
     assert job.schedule.tz == "America/Vancouver"
     assert job.state.next_run_at_ms is not None
+
+
+def _due_now(service: CronService, job) -> None:
+    job.state.next_run_at_ms = 1
+    service._save_job(job)
+    service._push(job)
+
+
+async def test_due_jobs_run_concurrently_under_cap(tmp_path) -> None:
+    active = 0
+    peak = 0
+
+    async def on_job(job):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job, max_concurrent=2)
+    await service.start()
+    for i in range(4):
+        _due_now(service, service.add_job(f"j{i}", CronSchedule(kind="every", every_ms=3_600_000), "hi"))
+
+    start = time.monotonic()
+    await service._on_timer()
+    while service.status()["running"]:
+        await asyncio.sleep(0.01)
+    service.stop()
+
+    assert peak == 2
+    assert time.monotonic() - start < 0.18
+    job = service.list_jobs()[0]
+    assert job.state.run_count == 1
+    assert job.state.last_duration_ms >= 40
+    assert job.state.next_run_at_ms > int(time.time() * 1000)
+
+
+async def test_job_timeout_is_recorded(tmp_path) -> None:
+    async def on_job(job):
+        await asyncio.sleep(1)
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job)
+    job = service.add_job("slow", CronSchedule(kind="every", every_ms=60_000), "hi", timeout_s=0.02)
+
+    assert await service.run_job(job.id)
+    assert job.state.last_status == "error"
+    assert "timed out" in job.state.last_error
+    reloaded = CronService(tmp_path / "jobs.json").list_jobs()[0]
+    assert reloaded.state.run_count == 1
+    assert reloaded.timeout_s == 0.02
+
+
+async def test_overlap_policies(tmp_path) -> None:
+    runs: dict[str, int] = {}
+    release = asyncio.Event()
+
+    async def on_job(job):
+        runs[job.name] = runs.get(job.name, 0) + 1
+        await release.wait()
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job, max_concurrent=8)
+    await service.start()
+    jobs = {
+        policy: service.add_job(policy, CronSchedule(kind="every", every_ms=3_600_000), "hi", overlap=policy)
+        for policy in ("skip", "queue", "allow")
+    }
+    for _ in range(3):
+        for job in jobs.values():
+            _due_now(service, job)
+        await service._on_timer()
+        await asyncio.sleep(0.01)
+
+    assert runs == {"skip": 1, "queue": 1, "allow": 3}
+    assert jobs["skip"].state.last_status == "skipped"
+
+    release.set()
+    while service.status()["running"]:
+        await asyncio.sleep(0.01)
+    service.stop()
+    assert runs == {"skip": 1, "queue": 2, "allow": 3}
+
+
+def test_heap_skips_stale_entries(tmp_path) -> None:
+    service = CronService(tmp_path / "jobs.json")
+    a = service.add_job("a", CronSchedule(kind="every", every_ms=1_000), "hi")
+    b = service.add_job("b", CronSchedule(kind="every", every_ms=5_000), "hi")
+
+    assert service._get_next_wake_ms() == a.state.next_run_at_ms
+    service.enable_job(a.id, enabled=False)
+    assert service._get_next_wake_ms() == b.state.next_run_at_ms
+    service.remove_job(b.id)
+    assert service._get_next_wake_ms() is None
+    service.enable_job(a.id)
+    assert service._get_next_wake_ms() == a.state.next_run_at_ms
@@ -0,0 +1,72 @@
+import json
+import sqlite3
+
+from typer.testing import CliRunner
+
+from nanobot.cli.commands import app
+from nanobot.cron.service import CronService
+from nanobot.cron.store import CronJobStore
+from nanobot.cron.types import CronSchedule
+
+LEGACY = {
+    "version": 1,
+    "jobs": [{
+        "id": "abc12345",
+        "name": "morning digest",
+        "enabled": True,
+        "schedule": {"kind": "cron", "atMs": None, "everyMs": None, "expr": "0 9 * * *", "tz": None},
+        "payload": {"kind": "agent_turn", "message": "digest", "deliver": True,
+                    "channel": "telegram", "to": "42"},
+        "state": {"nextRunAtMs": 1, "lastRunAtMs": None, "lastStatus": None, "lastError": None},
+        "createdAtMs": 1,
+        "updatedAtMs": 1,
+        "deleteAfterRun": False,
+    }],
+}
+
+
+def test_legacy_json_is_migrated_once(tmp_path) -> None:
+    legacy = tmp_path / "cron" / "jobs.json"
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps(LEGACY), encoding="utf-8")
+
+    jobs = CronService(tmp_path / "cron" / "jobs.db").list_jobs()
+
+    assert [(j.id, j.payload.channel, j.payload.to) for j in jobs] == [("abc12345", "telegram", "42")]
+    assert not legacy.exists()
+    assert (tmp_path / "cron" / "jobs.json.migrated").exists()
+    assert [j.id for j in CronService(tmp_path / "cron" / "jobs.db").list_jobs()] == ["abc12345"]
+
+
+def test_updates_touch_single_rows(tmp_path) -> None:
+    service = CronService(tmp_path / "jobs.db")
+    a = service.add_job("a", CronSchedule(kind="every", every_ms=60_000), "hi")
+    b = service.add_job("b", CronSchedule(kind="every", every_ms=60_000), "hi")
+
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    before = dict(conn.execute("SELECT id, updated_at_ms FROM jobs").fetchall())
+    conn.execute("UPDATE jobs SET updated_at_ms = -1 WHERE id = ?", (b.id,))
+    conn.commit()
+
+    service.enable_job(a.id, enabled=False)
+
+    rows = dict(conn.execute("SELECT id, updated_at_ms FROM jobs").fetchall())
+    assert rows[b.id] == -1
+    assert rows[a.id] >= before[a.id]
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert CronJobStore(tmp_path / "jobs.db").next_run_at_ms() == b.state.next_run_at_ms
+
+    service.remove_job(b.id)
+    assert [j.id for j in CronService(tmp_path / "jobs.db").list_jobs(include_disabled=True)] == [a.id]
+
+
+def test_cron_list_reads_migrated_store(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr("nanobot.config.loader.get_data_dir", lambda: tmp_path)
+    (tmp_path / "cron").mkdir()
+    (tmp_path / "cron" / "jobs.json").write_text(json.dumps(LEGACY), encoding="utf-8")
+
+    result = CliRunner().invoke(app, ["cron", "list"])
+
+    assert result.exit_code == 0
+    assert "abc12345" in result.stdout
+    assert "morning digest" in result.stdout
@@ -0,0 +1,59 @@
+import os
+import time
+
+from nanobot.agent.tools.filesystem import EditFileTool
+
+
+def _source(n: int) -> str:
+    return "".join(f"def func_{i}(x):\n    return x + {i}\n\n" for i in range(n))
+
+
+async def test_multi_edit_applies_all_hunks_in_one_write(tmp_path) -> None:
+    path = tmp_path / "mod.py"
+    path.write_text(_source(3), encoding="utf-8")
+    path.chmod(0o750)
+    tool = EditFileTool(workspace=tmp_path)
+
+    result = await tool.execute("mod.py", edits=[
+        {"old_text": "return x + 0", "new_text": "return x"},
+        {"old_text": "def func_2(x):", "new_text": "def func_two(x):"},
+    ])
+    assert result == f"Successfully applied 2 edits to {path}"
+    content = path.read_text(encoding="utf-8")
+    assert "    return x\n" in content and "def func_two(x):" in content
+    assert os.stat(path).st_mode & 0o777 == 0o750
+    assert [p.name for p in tmp_path.iterdir()] == ["mod.py"]
+
+
+async def test_multi_edit_is_all_or_nothing(tmp_path) -> None:
+    path = tmp_path / "mod.py"
+    path.write_text(_source(3), encoding="utf-8")
+    tool = EditFileTool(workspace=tmp_path)
+
+    result = await tool.execute("mod.py", edits=[
+        {"old_text": "return x + 0", "new_text": "return x"},
+        {"old_text": "return x + 1", "new_text": "return x"},
+        {"old_text": "    return", "new_text": "    yield"},
+    ])
+    assert result.startswith("Warning: edit 3: old_text appears 3 times")
+    assert result.endswith("No edits were applied.")
+    assert path.read_text(encoding="utf-8") == _source(3)
+
+    assert await tool.execute("mod.py") == "Error: Provide old_text and new_text, or edits"
+
+
+async def test_not_found_points_at_the_closest_block_in_large_files(tmp_path) -> None:
+    path = tmp_path / "big.py"
+    path.write_text(_source(20_000), encoding="utf-8")
+    tool = EditFileTool(workspace=tmp_path)
+
+    started = time.monotonic()
+    result = await tool.execute(
+        "big.py", old_text="def func_12345(x):\n    return x + 99999\n\ndef func_12346(x):\n", new_text="",
+    )
+    assert time.monotonic() - started < 1.0
+    assert "Best match (75% similar) at line 37036" in result
+    assert "+    return x + 12345" in result
+
+    result = await tool.execute("big.py", old_text="def fnuc_777(y):\n", new_text="")
+    assert result.endswith("No similar text found. Verify the file content.")
@@ -0,0 +1,100 @@
+import sys
+
+from nanobot.agent.tools.shell import ExecTool, OutputBuffer
+
+
+def _py(code: str) -> str:
+    return f'"{sys.executable}" -c "{code}"'
+
+
+def test_output_buffer_keeps_head_and_tail_in_constant_memory(tmp_path) -> None:
+    spill = tmp_path / "out.log"
+    buf = OutputBuffer(head_bytes=10, tail_bytes=10, spill_path=spill)
+    for i in range(1000):
+        buf.write(f"{i:05d}\n".encode())
+    buf.close()
+
+    assert buf.total == 6000
+    assert len(buf.head) == len(buf.tail) == 10
+    assert buf.omitted == 5980
+    assert buf.text().startswith("00000\n0000") and buf.text().endswith("98\n00999\n")
+    assert "5,980 bytes omitted" in buf.text()
+    assert spill.read_bytes() == b"".join(f"{i:05d}\n".encode() for i in range(1000))
+
+
+def test_small_output_is_not_spilled(tmp_path) -> None:
+    buf = OutputBuffer(head_bytes=100, tail_bytes=100, spill_path=tmp_path / "out.log")
+    buf.write(b"hello")
+    buf.close()
+    assert buf.text() == "hello" and not buf.spilled
+    assert not (tmp_path / "out.log").exists()
+
+
+async def test_exec_truncates_large_output_and_saves_the_full_copy(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), max_output_chars=200, artifacts_dir=tmp_path / "artifacts")
+    result = await tool.execute(_py("print(chr(10).join(str(i) for i in range(100000)))"))
+
+    assert result.startswith("0\n1\n2\n")
+    assert "\n99999\n" in result
+    assert "bytes omitted" in result
+    spilled = list((tmp_path / "artifacts").glob("*-stdout.log"))
+    assert len(spilled) == 1 and str(spilled[0]) in result
+    assert spilled[0].read_text().splitlines()[-1] == "99999"
+    assert len(spilled[0].read_text().splitlines()) == 100000
+
+
+async def test_exec_reports_progress_and_partial_output_on_timeout(tmp_path) -> None:
+    updates: list[str] = []
+
+    async def on_progress(content: str) -> None:
+        updates.append(content)
+
+    tool = ExecTool(working_dir=str(tmp_path), timeout=2, progress_interval_s=0.5)
+    tool.on_progress = on_progress
+    result = await tool.execute(_py("import time; print('started', flush=True); time.sleep(30)"))
+
+    assert result.startswith("Error: Command timed out after 2 seconds")
+    assert "started" in result
+    assert updates and "started" in updates[-1]
+
+
+async def test_exec_stderr_and_exit_code(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path))
+    result = await tool.execute(_py("import sys; sys.stderr.write('boom'); sys.exit(3)"))
+    assert "STDERR:\nboom" in result and "Exit code: 3" in result
+    assert await tool.execute("true") == "(no output)"
+
+
+async def test_persistent_session_keeps_state_between_commands(tmp_path) -> None:
+    (tmp_path / "sub").mkdir()
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True)
+    tool.set_context("cli", "a")
+    try:
+        assert await tool.execute("cd sub && export GREETING=hi") == "(no output)"
+        assert await tool.execute('printf "%s %s" "$GREETING" "$(basename "$PWD")"') == "hi sub"
+        assert "Exit code: 4" in await tool.execute("false || (exit 4)")
+        assert await tool.execute("printf 'no newline'") == "no newline"
+
+        # Another chat gets its own shell
+        tool.set_context("cli", "b")
+        assert await tool.execute('echo "[$GREETING]"') == "[]\n"
+
+        # Blocked commands never reach the shell
+        assert "blocked" in await tool.execute("rm -rf /")
+    finally:
+        tool.close_sessions()
+
+
+async def test_persistent_session_respawns_after_timeout_and_exit(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, timeout=1)
+    try:
+        await tool.execute("export MARK=1")
+        result = await tool.execute("echo before; sleep 30")
+        assert "timed out" in result and "before" in result
+        assert await tool.execute('echo "[$MARK]"') == "[]\n"
+
+        result = await tool.execute("export MARK=2; exit 5")
+        assert "Exit code: 5" in result and "new session" in result
+        assert await tool.execute('echo "[$MARK]"') == "[]\n"
+    finally:
+        tool.close_sessions()
@@ -0,0 +1,141 @@
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from nanobot.heartbeat.service import HeartbeatService, parse_heartbeat
+
+CONTENT = """# Heartbeat Tasks
+
+<!-- comment
+spanning lines -->
+
+- [ ] Verificar calendário
+- [x] Tarefa concluída
+- [ ] Checar email a cada 15 min
+- [ ] Pagar boleto 2030-01-05 14:30
+"""
+
+
+def _service(tmp_path, content: str = CONTENT, **kwargs):
+    (tmp_path / "HEARTBEAT.md").write_text(content, encoding="utf-8")
+    prompts = []
+
+    async def on_heartbeat(prompt: str) -> str:
+        prompts.append(prompt)
+        return "HEARTBEAT_OK"
+
+    return HeartbeatService(tmp_path, on_heartbeat=on_heartbeat, **kwargs), prompts
+
+
+def _edit(path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_parse_open_tasks_due_dates_and_recurrence() -> None:
+    tasks = parse_heartbeat(CONTENT + "- [ ] Dentista 12/03/2030 às 9h30\n")
+    assert [t.text.split()[0] for t in tasks] == ["Verificar", "Checar", "Pagar", "Dentista"]
+    assert tasks[0].due_ms is None and tasks[0].every_s is None
+    assert tasks[1].every_s == 15 * 60
+    assert tasks[2].due_ms == int(datetime(2030, 1, 5, 14, 30).timestamp() * 1000)
+    assert tasks[3].due_ms == int(datetime(2030, 3, 12, 9, 30).timestamp() * 1000)
+    assert parse_heartbeat("# Title\n\n- [x] done\n<!-- x -->\n") == []
+
+
+def test_prose_is_not_a_task() -> None:
+    content = "# Title\n\nAdd tasks below.\n  Indented prose.\n\n- [ ] Real task\n  continued\n* Bullet task\nMore prose.\n"
+    assert [t.text for t in parse_heartbeat(content)] == ["Real task continued", "Bullet task"]
+
+
+def test_shipped_template_tasks() -> None:
+    template = Path(__file__).parent.parent / "workspace" / "HEARTBEAT.md"
+    tasks = parse_heartbeat(template.read_text(encoding="utf-8"))
+    assert [t.text.split(".")[0] for t in tasks] == [
+        "Verificar eventos do calendário",
+        "Checar caixa de entrada de email",
+    ]
+
+
+async def test_unchanged_file_does_not_wake_agent(tmp_path) -> None:
+    service, prompts = _service(tmp_path)
+
+    await service._tick()
+    assert len(prompts) == 1
+    assert "Verificar calendário" in prompts[0] and "Pagar boleto" not in prompts[0]
+
+    for _ in range(5):
+        await service._tick()
+    assert len(prompts) == 1
+    # The next wake is the 15-minute recurrence, not a blind interval
+    assert abs(service._next_wake_ms - (time.time() + 15 * 60) * 1000) < 5000
+
+
+async def test_new_task_wakes_agent_but_check_off_does_not(tmp_path) -> None:
+    service, prompts = _service(tmp_path)
+    await service._tick()
+
+    _edit(tmp_path / "HEARTBEAT.md", CONTENT.replace("- [ ] Verificar", "- [x] Verificar"))
+    await service._tick()
+    assert len(prompts) == 1
+
+    _edit(tmp_path / "HEARTBEAT.md", CONTENT + "- [ ] Renovar domínio\n")
+    await service._tick()
+    assert len(prompts) == 2
+    assert "Renovar domínio" in prompts[1] and "Checar email" not in prompts[1]
+
+
+async def test_due_task_fires_once_and_state_survives_restart(tmp_path) -> None:
+    due = datetime.fromtimestamp(time.time() + 3600).strftime("%Y-%m-%d %H:%M")
+    content = f"- [ ] Reunião {due}\n"
+    service, prompts = _service(tmp_path, content, interval_s=0)
+
+    await service._tick()
+    assert prompts == []
+    assert service._next_wake_ms is not None
+
+    service._next_wake_ms = 0
+    service._tasks[0].due_ms = int(time.time() * 1000) - 1
+    await service._tick()
+    await service._tick()
+    assert len(prompts) == 1
+
+    restarted, prompts2 = _service(tmp_path, content, interval_s=0)
+    await restarted._tick()
+    assert prompts2 == []
+
+
+async def test_agent_edits_during_run_do_not_retrigger(tmp_path) -> None:
+    path = tmp_path / "HEARTBEAT.md"
+    path.write_text("- [ ] Tarefa nova\n", encoding="utf-8")
+    runs = []
+
+    async def on_heartbeat(prompt: str) -> str:
+        runs.append(prompt)
+        _edit(path, "- [ ] Tarefa nova (em andamento)\n")
+        return "done"
+
+    service = HeartbeatService(tmp_path, on_heartbeat=on_heartbeat)
+    await service._tick()
+    await service._tick()
+    assert len(runs) == 1
+
+
+async def test_watcher_wakes_heartbeat_on_edit(tmp_path) -> None:
+    import asyncio
+
+    from nanobot.watcher import WatcherService
+
+    watcher = WatcherService(debounce_s=0.01, poll_interval_s=0.05)
+    await watcher.start()
+    service, prompts = _service(tmp_path, "# Nothing yet\n", watcher=watcher, watch_interval_s=3600)
+    await service.start()
+    await asyncio.sleep(0.1)
+    assert prompts == []
+
+    (tmp_path / "HEARTBEAT.md").write_text("- [ ] Ligar para o banco\n", encoding="utf-8")
+    await asyncio.sleep(0.3)
+    service.stop()
+    watcher.stop()
+    assert len(prompts) == 1 and "Ligar para o banco" in prompts[0]
@@ -0,0 +1,96 @@
+import os
+import time
+from datetime import datetime
+
+from nanobot.agent.history import HistoryIndex, tokenize
+from nanobot.agent.tools.history import HistorySearchTool
+
+
+def _index(tmp_path) -> HistoryIndex:
+    memory = tmp_path / "memory"
+    memory.mkdir()
+    return HistoryIndex(memory)
+
+
+def test_tokenize_is_accent_and_plural_insensitive() -> None:
+    assert tokenize("Eleições") == tokenize("eleição")
+    assert tokenize("os lembretes") == tokenize("lembrete")
+    assert "de" not in tokenize("reunião de planejamento")
+
+
+def test_bm25_ranks_best_entry_first(tmp_path) -> None:
+    index = _index(tmp_path)
+    index.append("[2026-02-01 10:00] Configurado o Docker Swarm na VPS.")
+    index.append("[2026-02-02 11:00] Reunião sobre o orçamento do dashboard.\n\nDetalhes: orçamento aprovado.")
+    index.append("[2026-02-03 12:00] Ajustes no calendário.")
+
+    hits = index.search("orcamentos", limit=2)
+
+    assert hits[0]["date"] == "2026-02-02 11:00"
+    assert "orçamento aprovado" in hits[0]["text"]
+    assert len(hits) == 1
+
+
+def test_index_is_incremental_and_persisted(tmp_path) -> None:
+    index = _index(tmp_path)
+    index.append("[2026-02-01 10:00] primeiro evento docker")
+    assert len(index.search("docker")) == 1
+
+    index.append("[2026-02-05 10:00] segundo evento docker")
+    reloaded = HistoryIndex(index.memory_dir)
+    hits = reloaded.search("docker")
+    assert sorted(h["date"] for h in hits) == ["2026-02-01 10:00", "2026-02-05 10:00"]
+    assert reloaded._segments["HISTORY.md"][0] == index.current_file.stat().st_size
+
+
+def test_date_range_filters(tmp_path) -> None:
+    index = _index(tmp_path)
+    for day in ("01", "10", "20"):
+        index.append(f"[2026-03-{day} 09:00] backup concluído")
+
+    hits = index.search("backup", since="2026-03-05", until="2026-03-15")
+    assert [h["date"] for h in hits] == ["2026-03-10 09:00"]
+
+    latest = index.search("", since="2026-03-05")
+    assert [h["date"] for h in latest] == ["2026-03-20 09:00", "2026-03-10 09:00"]
+
+
+def test_previous_month_is_rotated_into_a_segment(tmp_path) -> None:
+    index = _index(tmp_path)
+    index.append("[2026-01-30 09:00] evento antigo de janeiro")
+    old = datetime(2026, 1, 30).timestamp()
+    os.utime(index.current_file, (old, old))
+
+    index.append("[2026-02-01 09:00] evento novo de fevereiro")
+
+    assert (index.segments_dir / "2026-01.md").exists()
+    assert "janeiro" not in index.current_file.read_text(encoding="utf-8")
+    hits = index.search("evento janeiro")
+    assert hits[0]["segment"] == "history/2026-01.md"
+    assert hits[0]["text"].startswith("[2026-01-30 09:00]")
+
+
+def test_queries_are_fast_on_large_history(tmp_path) -> None:
+    index = _index(tmp_path)
+    with open(index.current_file, "w", encoding="utf-8") as f:
+        for i in range(5000):
+            f.write(f"[2026-02-{i % 28 + 1:02d} 10:00] entrada {i} sobre assunto{i % 300} e rotina\n\n")
+    index.refresh()
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search("assunto17", limit=3)
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+
+async def test_history_search_tool_formats_hits(tmp_path) -> None:
+    index = _index(tmp_path)
+    index.append("[2026-02-01 10:00] Gleisson pediu lembrete do dentista.")
+    tool = HistorySearchTool(index)
+
+    result = await tool.execute(query="dentista")
+    assert "Found 1 history entries" in result
+    assert "dentista" in result
+
+    assert "YYYY-MM-DD" in await tool.execute(query="x", since="ontem")
+    assert "No matching" in await tool.execute(query="inexistente")
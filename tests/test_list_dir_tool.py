@@ -0,0 +1,54 @@
+from nanobot.agent.tools.filesystem import ListDirTool
+
+
+def _tree(root) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "main.py").write_text("x" * 2048, encoding="utf-8")
+    (root / "src" / "pkg" / "a.py").write_text("a", encoding="utf-8")
+    (root / "src" / "pkg" / "b.md").write_text("b", encoding="utf-8")
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "out").mkdir()
+    (root / ".gitignore").write_text("out/\n*.pyc\n", encoding="utf-8")
+    (root / "README.md").write_text("hello", encoding="utf-8")
+    (root / "src" / "main.pyc").write_text("compiled", encoding="utf-8")
+
+
+async def test_lists_one_level_with_sizes_and_counts(tmp_path) -> None:
+    _tree(tmp_path)
+    result = await ListDirTool(workspace=tmp_path).execute(".")
+    assert result.splitlines() == [
+        "📄 .gitignore  11 B",
+        "📄 README.md  5 B",
+        "📁 node_modules/ (ignored)",
+        "📁 out/ (ignored)",
+        "📁 src/  (2 items)",
+        "",
+        "3 dirs, 2 files (16 B)",
+    ]
+
+
+async def test_depth_glob_and_cursor(tmp_path) -> None:
+    _tree(tmp_path)
+    tool = ListDirTool(workspace=tmp_path)
+
+    result = await tool.execute("src", depth=3, glob="*.py")
+    assert result.splitlines() == [
+        "📄 main.py  2.0 KB",
+        "📁 pkg/",
+        "  📄 a.py  1 B",
+        "",
+        "1 dirs, 2 files (2.0 KB)",
+    ]
+
+    first = await tool.execute(".", depth=2, limit=4)
+    assert first.splitlines()[-1] == (
+        "4 dirs, 3 files (2.0 KB) in total; showing entries 1-4 of 7; more entries remain, continue with cursor=4"
+    )
+    rest = await tool.execute(".", depth=2, cursor=4)
+    assert rest.splitlines()[:3] == ["📁 src/", "  📄 main.py  2.0 KB", "  📁 pkg/  (2 items)"]
+    assert rest.splitlines()[-1] == "4 dirs, 3 files (2.0 KB) in total; showing entries 5-7 of 7"
+    assert await tool.execute(".", cursor=100) == "No more entries in ."
+
+    (tmp_path / "empty").mkdir()
+    assert await tool.execute("empty") == "Directory empty is empty"
+    assert await tool.execute("README.md") == "Error: Not a directory: README.md"
@@ -0,0 +1,55 @@
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.loop_guard import ToolLoopDetector
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+
+class _StuckProvider:
+    """Keeps listing the same directory until tools are off the table."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.last_messages: list[dict] = []
+        self.final_tools: list[dict] | None = []
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+    async def chat(self, messages, tools=None, model=None, temperature=0.7, max_tokens=4096):
+        self.calls += 1
+        self.last_messages = messages
+        if "[System: you kept repeating" in str(messages[-1].get("content")):
+            self.final_tools = tools
+            return LLMResponse(content="Here is what I found so far.")
+        call = ToolCallRequest(id=f"c{self.calls}", name="list_dir", arguments={"path": " . "})
+        return LLMResponse(content=None, tool_calls=[call])
+
+
+def test_detector_counts_identical_calls_only() -> None:
+    detector = ToolLoopDetector(warn_after=2, stop_after=3)
+
+    assert detector.record("exec", {"command": "ls  -la"}, "a") == 1
+    assert detector.record("exec", {"command": "ls -la"}, "a") == 2  # Whitespace is normalized
+    assert detector.record("exec", {"command": "ls -la"}, "b") == 1  # Different result: progress
+    assert detector.record("read_file", {"path": "x"}, "[cached: identical call 3s ago]\nok") == 1
+    assert detector.record("read_file", {"path": "x"}, "[cached: identical call 9s ago]\nok") == 2
+    assert detector.hint("exec", 2) is not None and not detector.should_stop
+
+    detector.record("exec", {"command": "ls -la"}, "a")
+    assert detector.should_stop
+
+
+async def test_agent_loop_warns_then_stops_with_partial_answer(tmp_path) -> None:
+    provider = _StuckProvider()
+    agent = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, max_iterations=20)
+
+    content, tools_used = await agent._run_agent_loop([{"role": "user", "content": "list it"}])
+
+    assert content == "Here is what I found so far."
+    assert len(tools_used) == 5 and provider.calls == 6
+    assert provider.final_tools is None
+    tool_results = [m["content"] for m in provider.last_messages if m["role"] == "tool"]
+    assert "[Loop warning" not in tool_results[1] and "[Loop warning" in tool_results[2]
+    stats = agent.loop_metrics.stats()
+    assert stats["warnings"] == 1 and stats["stopped"] == 1
+    assert stats["recent"][0]["tool"] == "list_dir"
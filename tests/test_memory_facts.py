@@ -0,0 +1,138 @@
+import os
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.session.manager import Session
+
+MEMORY_MD = """# Long-term Memory
+
+## User Information
+
+- **Name**: Gleisson
+- **Timezone**: America/Sao_Paulo
+
+## Project Context
+
+- **Dashboard**: React + Vite, served by nginx
+- Deploys run on a VPS behind Traefik
+"""
+
+
+def _store(tmp_path) -> MemoryStore:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(MEMORY_MD)
+    return store
+
+
+def test_existing_markdown_is_imported_as_keyed_facts(tmp_path) -> None:
+    store = _store(tmp_path)
+    sections = {s["title"]: s["facts"] for s in store.facts.sections()}
+
+    assert list(sections["User Information"]) == ["Name", "Timezone"]
+    assert "Dashboard" in sections["Project Context"]
+    assert store.read_long_term() == MEMORY_MD
+
+
+def test_ops_patch_memory_without_touching_other_facts(tmp_path) -> None:
+    store = _store(tmp_path)
+
+    applied = store.apply_memory_ops([
+        {"op": "update", "section": "User Information", "key": "Timezone", "value": "UTC-3"},
+        {"op": "add", "section": "Preferences", "key": "Language", "value": "PT-BR"},
+        {"op": "delete", "section": "Project Context", "key": "Dashboard"},
+        {"op": "delete", "section": "Project Context", "key": "missing"},
+        {"op": "bogus", "section": "x", "key": "y"},
+    ])
+
+    assert applied == 3
+    text = store.read_long_term()
+    assert "- **Timezone**: UTC-3" in text
+    assert "- **Name**: Gleisson" in text
+    assert "## Preferences\n\n- **Language**: PT-BR" in text
+    assert "Dashboard" not in text
+    assert "Deploys run on a VPS behind Traefik" in text
+
+
+def test_direct_edits_to_memory_md_are_picked_up(tmp_path) -> None:
+    store = _store(tmp_path)
+    store.facts.sections()
+
+    edited = MEMORY_MD.replace("Gleisson", "Caio")
+    store.memory_file.write_text(edited, encoding="utf-8")
+    st = store.memory_file.stat()
+    os.utime(store.memory_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    facts = {s["title"]: s["facts"] for s in store.facts.sections()}
+    assert facts["User Information"]["Name"] == "- **Name**: Caio"
+
+
+def test_prompt_view_sends_only_relevant_sections(tmp_path) -> None:
+    store = _store(tmp_path)
+    store.apply_memory_ops([
+        {"op": "add", "section": f"Topic {i}", "key": f"fact{i}", "value": "filler " * 40}
+        for i in range(20)
+    ])
+
+    view = store.facts.prompt_view("what timezone am I in?", max_tokens=400)
+
+    assert "### Index" in view
+    assert "- **Timezone**: America/Sao_Paulo" in view
+    assert "filler" not in view
+    assert "Topic 7: fact7" in view
+
+
+class _OpsProvider:
+    def __init__(self) -> None:
+        self.prompt = ""
+
+    async def chat(self, messages, tools=None, model=None, **kwargs):
+        self.prompt = messages[-1]["content"]
+        return LLMResponse(content=None, tool_calls=[ToolCallRequest(
+            id="1", name="save_memory", arguments={
+                "history_entry": "[2026-03-01 09:00] Talked about the timezone.",
+                "memory_ops": [{"op": "update", "section": "User Information",
+                                "key": "Timezone", "value": "America/Recife"}],
+            },
+        )])
+
+
+async def test_consolidation_applies_memory_ops(tmp_path) -> None:
+    store = _store(tmp_path)
+    session = Session(key="cli:ops")
+    session.add_message("user", "I moved, my timezone is now America/Recife")
+
+    provider = _OpsProvider()
+    await store.consolidate(session, provider, "m", archive_all=True)
+
+    assert "Gleisson" in provider.prompt
+    assert "- **Timezone**: America/Recife" in store.read_long_term()
+    assert "- **Name**: Gleisson" in store.read_long_term()
+    assert "Talked about the timezone" in store.history_file.read_text(encoding="utf-8")
+
+
+class _RewriteProvider:
+    async def chat(self, messages, tools=None, model=None, **kwargs):
+        return LLMResponse(content=None, tool_calls=[ToolCallRequest(
+            id="1", name="save_memory", arguments={
+                "history_entry": "[2026-03-01 09:00] Talked about the timezone.",
+                "memory_update": "## User Information\n\n- **Timezone**: America/Recife\n",
+            },
+        )])
+
+
+async def test_partial_view_rewrite_is_merged_not_applied(tmp_path) -> None:
+    store = _store(tmp_path)
+    store.apply_memory_ops([
+        {"op": "add", "section": f"Topic {i}", "key": f"fact{i}", "value": "filler " * 40}
+        for i in range(20)
+    ])
+    session = Session(key="cli:rewrite")
+    session.add_message("user", "I moved, my timezone is now America/Recife")
+
+    await store.consolidate(session, _RewriteProvider(), "m", archive_all=True, memory_tokens=400)
+
+    memory = store.read_long_term()
+    assert "- **Timezone**: America/Recife" in memory
+    assert "- **Name**: Gleisson" in memory
+    assert "Deploys run on a VPS" in memory
+    assert "fact19" in store.facts.prompt_view("", max_tokens=10_000)
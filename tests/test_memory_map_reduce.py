@@ -0,0 +1,118 @@
+import asyncio
+
+from nanobot.agent.memory import MemoryStore, _split_chunks
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.session.manager import Session
+
+
+class _FakeProvider:
+    """Summarizes chunks as 'S<n>' and answers the final call with save_memory."""
+
+    def __init__(self, fail_on_call: int | None = None) -> None:
+        self.chunk_calls = 0
+        self.final_prompts: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.fail_on_call = fail_on_call
+
+    async def chat(self, messages, tools=None, model=None, **kwargs):
+        if tools:
+            self.final_prompts.append(messages[-1]["content"])
+            return LLMResponse(
+                content=None,
+                tool_calls=[ToolCallRequest(
+                    id="1", name="save_memory",
+                    arguments={"history_entry": "[2026-01-01 10:00] summary", "memory_update": "facts"},
+                )],
+            )
+        self.chunk_calls += 1
+        if self.fail_on_call == self.chunk_calls:
+            raise RuntimeError("provider down")
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return LLMResponse(content=f"S{self.chunk_calls}")
+
+
+def _big_session(count: int) -> Session:
+    session = Session(key="cli:big")
+    for i in range(count):
+        session.add_message("user", f"message number {i} " + "x" * 200)
+    return session
+
+
+def test_split_chunks_respects_budget() -> None:
+    lines = ["a" * 30] * 10 + ["b" * 100]
+    chunks = _split_chunks(lines, max_tokens=10)
+    assert all(len(c) <= 40 for c in chunks)
+    assert "".join(c.replace("\n", "") for c in chunks) == "".join(lines)
+
+
+async def test_large_backlog_is_map_reduced(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    provider = _FakeProvider()
+    session = _big_session(200)
+
+    await store.consolidate(
+        session, provider, "m", archive_all=True, chunk_tokens=1000, max_parallel=3,
+    )
+
+    assert provider.chunk_calls > 1
+    assert provider.max_active <= 3
+    assert len(provider.final_prompts) == 1
+    assert "summarized in parts" in provider.final_prompts[0]
+    assert "x" * 200 not in provider.final_prompts[0]
+    assert store.read_long_term() == "facts"
+    assert not store._checkpoint_path(session.key).exists()
+
+
+async def test_interrupted_map_reduce_resumes_from_checkpoint(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    session = _big_session(200)
+
+    failing = _FakeProvider(fail_on_call=4)
+    await store.consolidate(session, failing, "m", archive_all=True, chunk_tokens=1000, max_parallel=1)
+    assert store._checkpoint_path(session.key).exists()
+    assert store.read_long_term() == ""
+
+    resumed = _FakeProvider()
+    await store.consolidate(session, resumed, "m", archive_all=True, chunk_tokens=1000, max_parallel=1)
+
+    total_chunks = len(_split_chunks(
+        [f"[{m['timestamp'][:16]}] USER: {m['content']}" for m in session.messages], 1000,
+    ))
+    assert resumed.chunk_calls == total_chunks - 3
+    assert store.read_long_term() == "facts"
+    assert not store._checkpoint_path(session.key).exists()
+
+
+async def test_checkpoint_survives_new_messages(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    session = _big_session(200)
+
+    failing = _FakeProvider(fail_on_call=4)
+    await store.consolidate(session, failing, "m", archive_all=True, chunk_tokens=1000, max_parallel=1)
+    for i in range(5):
+        session.add_message("user", f"late message {i}")
+
+    resumed = _FakeProvider()
+    await store.consolidate(session, resumed, "m", archive_all=True, chunk_tokens=1000, max_parallel=1)
+
+    total_chunks = len(_split_chunks(
+        [f"[{m['timestamp'][:16]}] USER: {m['content']}" for m in session.messages], 1000,
+    ))
+    # The three summarized chunks are unchanged by the appended messages and are reused
+    assert resumed.chunk_calls == total_chunks - 3
+    assert not store._checkpoint_path(session.key).exists()
+
+
+async def test_small_backlog_uses_single_call(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    provider = _FakeProvider()
+    session = _big_session(3)
+
+    await store.consolidate(session, provider, "m", archive_all=True)
+
+    assert provider.chunk_calls == 0
+    assert len(provider.final_prompts) == 1
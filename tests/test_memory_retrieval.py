@@ -0,0 +1,132 @@
+import time
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.retrieval import HashingEmbedder, MemoryRetriever
+from nanobot.config.schema import MemoryConfig
+
+
+class _CountingEmbedder(HashingEmbedder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.embedded = 0
+
+    async def embed(self, texts):
+        self.embedded += len(texts)
+        return await super().embed(texts)
+
+
+def _store_with_history(tmp_path, entries: int = 0) -> MemoryStore:
+    store = MemoryStore(tmp_path)
+    store.apply_memory_ops([
+        {"op": "add", "section": "User Information", "key": "Name", "value": "Gleisson"},
+        {"op": "add", "section": "Infra", "key": "VPS", "value": "Docker Swarm behind Traefik"},
+    ])
+    for i in range(entries):
+        store.append_history(f"[2026-02-{i % 28 + 1:02d} 10:00] Conversa sobre assunto{i} e rotina diária.")
+    return store
+
+
+async def test_hashing_embedder_is_accent_and_plural_insensitive() -> None:
+    emb = HashingEmbedder()
+    a, b, c = await emb.embed(["reuniões do orçamento", "reuniao orcamento", "deploy do docker"])
+    dot = lambda x, y: sum(p * q for p, q in zip(x, y))  # noqa: E731
+    assert dot(a, b) > 0.9
+    assert dot(a, c) < 0.3
+
+
+async def test_relevant_history_is_injected_and_small_memory_kept_whole(tmp_path) -> None:
+    store = _store_with_history(tmp_path)
+    store.append_history("[2026-02-01 10:00] Marcado dentista para sexta às 15h.")
+    store.append_history("[2026-02-02 10:00] Ajustado o deploy do dashboard.")
+
+    context = await MemoryRetriever(store).build_context("quando é o dentista?")
+
+    assert "- **Name**: Gleisson" in context
+    assert "dentista para sexta" in context
+    assert "dashboard" not in context
+
+
+async def test_large_memory_injects_only_top_facts_within_budget(tmp_path) -> None:
+    store = _store_with_history(tmp_path, entries=300)
+    store.apply_memory_ops([
+        {"op": "add", "section": f"Topic {i}", "key": f"fact{i}", "value": f"detalhe{i} " * 30}
+        for i in range(100)
+    ])
+    retriever = MemoryRetriever(store, top_k=5, max_tokens=600)
+
+    context = await retriever.build_context("qual o proxy da VPS?")
+
+    assert "Traefik" in context
+    assert "detalhe" not in context
+    assert len(context) // 4 <= 600 + 20
+
+
+async def test_index_is_incremental_and_persisted(tmp_path) -> None:
+    store = _store_with_history(tmp_path, entries=50)
+    first = _CountingEmbedder()
+    await MemoryRetriever(store, embedder=first).sync()
+    assert first.embedded == 52
+
+    store.append_history("[2026-03-01 10:00] Nova entrada sobre backup.")
+    store.apply_memory_ops([{"op": "delete", "section": "Infra", "key": "VPS"}])
+    second = _CountingEmbedder()
+    retriever = MemoryRetriever(store, embedder=second)
+    await retriever.sync()
+
+    assert second.embedded == 1
+    assert len(retriever.index.items) == 52
+    assert "backup" in await retriever.build_context("backup")
+
+
+async def test_facts_added_after_sync_are_embedded(tmp_path) -> None:
+    store = _store_with_history(tmp_path)
+    store.apply_memory_ops([
+        {"op": "add", "section": f"Topic {i}", "key": f"fact{i}", "value": f"detalhe{i} " * 30}
+        for i in range(100)
+    ])
+    retriever = MemoryRetriever(store, max_tokens=600)
+    await retriever.sync()
+
+    store.apply_memory_ops([{"op": "add", "section": "Saude", "key": "Dentista", "value": "Dra. Marta, sexta 15h"}])
+
+    assert "Dra. Marta" in await retriever.build_context("quem é o dentista?")
+
+
+async def test_rewritten_history_keeps_unchanged_vectors(tmp_path) -> None:
+    store = _store_with_history(tmp_path, entries=5)
+    await MemoryRetriever(store).sync()
+    text = store.history_file.read_text(encoding="utf-8")
+    store.history_file.write_text(text.replace("assunto3 ", "tema3 "), encoding="utf-8")
+
+    embedder = _CountingEmbedder()
+    retriever = MemoryRetriever(store, embedder=embedder)
+    await retriever.sync()
+
+    assert embedder.embedded == 1
+    context = await retriever.build_context("tema3")
+    assert "tema3" in context
+    assert "assunto3 " not in context
+
+
+async def test_prompt_stays_flat_as_memory_grows(tmp_path) -> None:
+    config = MemoryConfig(retrieval_max_tokens=800)
+    store = _store_with_history(tmp_path, entries=20)
+    builder = ContextBuilder(tmp_path, memory_config=config)
+    small = len(await builder.build_system_prompt(query="rotina"))
+
+    for i in range(2000):
+        store.append_history(f"[2026-03-{i % 28 + 1:02d} 10:00] Mais uma rotina registrada número {i}.")
+    start = time.perf_counter()
+    await builder.build_system_prompt(query="rotina")
+    large = len(await builder.build_system_prompt(query="rotina"))
+
+    assert large - small < 800 * 4
+    assert time.perf_counter() - start < 10
+
+
+async def test_retrieval_disabled_injects_full_memory(tmp_path) -> None:
+    _store_with_history(tmp_path)
+    builder = ContextBuilder(tmp_path, memory_config=MemoryConfig(retrieval_enabled=False))
+    assert builder.retriever is None
+    assert "Docker Swarm behind Traefik" in await builder.build_system_prompt()
@@ -0,0 +1,61 @@
+from nanobot.agent.tools import filesystem
+from nanobot.agent.tools.filesystem import ReadFileTool
+
+
+async def test_small_files_are_returned_whole(tmp_path) -> None:
+    (tmp_path / "a.md").write_text("# Title\nbody\n", encoding="utf-8")
+    tool = ReadFileTool(workspace=tmp_path)
+    assert await tool.execute("a.md") == "# Title\nbody\n"
+
+    result = await tool.execute("a.md", offset=2)
+    assert result == "[a.md: 2 lines, 13 B | lines 2-2 shown]\nbody\n"
+
+
+async def test_large_files_are_paged_through_a_cached_line_index(tmp_path) -> None:
+    path = tmp_path / "big.log"
+    path.write_bytes(b"".join(f"line {i}\n".encode() for i in range(300_000)))
+    assert path.stat().st_size > filesystem._SMALL_FILE_BYTES
+    tool = ReadFileTool(workspace=tmp_path, max_chars=1000)
+
+    head = await tool.execute("big.log")
+    header, _, body = head.partition("\n")
+    assert header.startswith("[big.log: 300,000 lines, ") and "continue with offset=" in header
+    assert body.startswith("line 0\nline 1\n") and len(body) <= 1000
+
+    page = await tool.execute("big.log", offset=250_001, limit=3)
+    assert page.endswith("\nline 250000\nline 250001\nline 250002\n")
+    assert "lines 250001-250003 shown" in page
+
+    tail = await tool.execute("big.log", offset=-2)
+    assert tail.endswith("\nline 299998\nline 299999\n") and "continue" not in tail
+
+    index = filesystem._line_indexes[path.resolve()]
+    await tool.execute("big.log", offset=10, limit=1)
+    assert filesystem._line_indexes[path.resolve()] is index
+
+    with path.open("ab") as f:
+        f.write(b"last line without newline")
+    tail = await tool.execute("big.log", offset=-1)
+    assert "300,001 lines" in tail and tail.endswith("\nlast line without newline")
+
+
+async def test_binary_files_and_byte_ranges(tmp_path) -> None:
+    (tmp_path / "blob.bin").write_bytes(b"\x00\x01ABC" * 10)
+    tool = ReadFileTool(workspace=tmp_path)
+
+    result = await tool.execute("blob.bin")
+    assert result.startswith("Error: blob.bin looks like a binary file")
+
+    dump = await tool.execute("blob.bin", byte_offset=5, byte_limit=5)
+    assert dump == "[blob.bin: 50 B | bytes 5-10 of 50]\n00000005  00 01 41 42 43                                   ..ABC"
+
+
+async def test_encodings_are_detected(tmp_path) -> None:
+    (tmp_path / "utf16.txt").write_text("olá\nmundo\n", encoding="utf-16")
+    (tmp_path / "latin.txt").write_bytes("ação\n".encode("latin-1"))
+    tool = ReadFileTool(workspace=tmp_path)
+
+    assert await tool.execute("utf16.txt") == "olá\nmundo\n"
+    assert "ação" in await tool.execute("latin.txt", encoding="latin-1")
+    assert "�" not in await tool.execute("latin.txt")
+    assert await tool.execute("latin.txt", encoding="nope") == "Error: Unknown encoding: nope"
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+
+from nanobot.agent.tools.search import SearchFilesTool
+from nanobot.agent.workspace_index import WorkspaceIndex, required_literals
+from nanobot.watcher import WatcherService
+
+
+def _tree(root) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "core.py").write_text(
+        "class Loader:\n    def load_config(self):\n        return load_config_file()\n", encoding="utf-8",
+    )
+    (root / "src" / "load_config.py").write_text("def load_config_file():\n    pass\n", encoding="utf-8")
+    (root / "README.md").write_text("Call load_config() at startup.\nAção concluída\n", encoding="utf-8")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("load_config()", encoding="utf-8")
+    (root / "build").mkdir()
+    (root / "build" / "out.py").write_text("load_config()", encoding="utf-8")
+    (root / ".gitignore").write_text("build/\n*.log\n", encoding="utf-8")
+    (root / "debug.log").write_text("load_config failed", encoding="utf-8")
+    (root / "blob.bin").write_bytes(b"\0load_config")
+
+
+def test_required_literals() -> None:
+    assert required_literals(r"def load_\w+\(") == ["def load_"]
+    assert required_literals(r"foo(bar)?bazz") == ["foo", "bazz"]
+    assert required_literals(r"a|bcd") == []
+    assert required_literals(r"[") == []
+
+
+async def test_search_ranks_and_respects_ignores(tmp_path) -> None:
+    _tree(tmp_path)
+    index = WorkspaceIndex(tmp_path)
+    tool = SearchFilesTool(index)
+
+    result = await tool.execute(query="load_config")
+    assert result.splitlines() == [
+        "Found 4 matches in 3 files:",
+        "src/load_config.py",
+        "  1: def load_config_file():",
+        "src/pkg/core.py (2 matches)",
+        "  2: def load_config(self):",
+        "  3: return load_config_file()",
+        "README.md",
+        "  1: Call load_config() at startup.",
+    ]
+    assert index.file_count == 4  # .gitignore, README.md and the two sources
+
+    assert "README.md" in await tool.execute(query="AÇÃO")
+    assert await tool.execute(query="AÇÃO", case_sensitive=True) == "No matches."
+    page = await tool.execute(query="load_config", glob="*.py", offset=1, limit=1)
+    assert page.splitlines() == [
+        "Found 3 matches in 2 files (showing 2-2; next page: offset=2):",
+        "src/pkg/core.py (2 matches)",
+        "  2: def load_config(self):",
+    ]
+    assert (await tool.execute(glob="*.py", path="src")).splitlines() == [
+        "Found 2 files:", "src/load_config.py", "src/pkg/core.py",
+    ]
+    assert (await tool.execute(query="load_config(", literal=True)).startswith("Found 2 matches")
+    assert (await tool.execute(query="(")).startswith("Error: Invalid regular expression")
+    assert (await tool.execute(query="x", path="..")).startswith("Error: path must be inside the workspace")
+
+
+async def test_index_picks_up_changes_by_mtime(tmp_path) -> None:
+    _tree(tmp_path)
+    index = WorkspaceIndex(tmp_path, rescan_s=0)
+    tool = SearchFilesTool(index)
+    assert await tool.execute(query="brand_new_symbol") == "No matches."
+
+    (tmp_path / "src" / "new.py").write_text("brand_new_symbol = 1\n", encoding="utf-8")
+    core = tmp_path / "src" / "pkg" / "core.py"
+    core.write_text("nothing here\n", encoding="utf-8")
+    os.utime(core, ns=(time.time_ns() + 10**9,) * 2)
+    assert "src/new.py" in await tool.execute(query="brand_new_symbol")
+    assert "core.py" not in await tool.execute(query="load_config")
+
+    (tmp_path / "src" / "new.py").unlink()
+    assert await tool.execute(query="brand_new_symbol") == "No matches."
+
+
+async def test_index_follows_watcher_events(tmp_path) -> None:
+    _tree(tmp_path)
+    watcher = WatcherService(debounce_s=0.01)
+    await watcher.start()
+    index = WorkspaceIndex(tmp_path, watcher=watcher, rescan_s=3600)
+    tool = SearchFilesTool(index)
+    try:
+        assert await tool.execute(query="watched_symbol") == "No matches."
+        (tmp_path / "src" / "pkg" / "sub").mkdir()
+        (tmp_path / "src" / "pkg" / "sub" / "w.py").write_text("watched_symbol()\n", encoding="utf-8")
+        for _ in range(100):
+            if "w.py" in await tool.execute(query="watched_symbol"):
+                break
+            await asyncio.sleep(0.02)
+        assert "src/pkg/sub/w.py" in await tool.execute(query="watched_symbol")
+    finally:
+        index.close()
+        watcher.stop()
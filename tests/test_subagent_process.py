@@ -0,0 +1,116 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.subagent_worker import SubagentWorkerPool, WorkerCrashedError, _Worker
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMResponse
+
+
+class _WorkerProvider:
+    """Module-level so worker processes can unpickle it."""
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+    async def chat(self, messages, **kwargs):
+        task = messages[1]["content"]
+        if task == "burn cpu":
+            while True:
+                pass
+        if task == "hang":
+            await asyncio.sleep(3600)
+        return LLMResponse(content=f"pid={os.getpid()}", usage={"total_tokens": 7})
+
+
+def _factory() -> _WorkerProvider:
+    return _WorkerProvider()
+
+
+class _SlowToDie:
+    """Stands in for a worker process that takes a while to exit after SIGKILL."""
+
+    exitcode = -9
+
+    def is_alive(self) -> bool:
+        return True
+
+    def kill(self) -> None:
+        pass
+
+    def join(self, timeout: float | None = None) -> None:
+        time.sleep(0.3)
+
+
+class _DeadPipe:
+    def send(self, job) -> None:
+        raise BrokenPipeError
+
+    def close(self) -> None:
+        pass
+
+
+async def _wait_done(manager: SubagentManager, timeout: float = 60) -> None:
+    for _ in range(int(timeout / 0.05)):
+        if not manager.list_tasks(include_finished=False):
+            return
+        await asyncio.sleep(0.05)
+
+
+async def test_subagents_run_in_limited_worker_processes(tmp_path) -> None:
+    pool = SubagentWorkerPool(_factory, size=1, cpu_s=1, memory_mb=0)
+    manager = SubagentManager(
+        provider=_WorkerProvider(), workspace=tmp_path, bus=MessageBus(), worker_pool=pool, timeout_s=60,
+    )
+    try:
+        await manager.spawn("first")
+        await _wait_done(manager)
+        await manager.spawn("second")
+        await _wait_done(manager)
+        first, second = manager.list_tasks()[::-1]
+        assert first.status == second.status == "ok"
+        assert first.result == second.result != f"pid={os.getpid()}"  # Same reused worker
+        assert first.tokens_used == 7
+
+        # A runaway worker is killed by its CPU limit without touching the gateway
+        await manager.spawn("burn cpu")
+        await _wait_done(manager)
+        crashed = manager.list_tasks()[0]
+        assert crashed.status == "error" and "worker exited" in crashed.result
+
+        # Cancelling a running subagent kills its worker; the next run gets a fresh one
+        await manager.spawn("hang")
+        await asyncio.sleep(0.2)
+        hung = manager.list_tasks()[0]
+        assert manager.cancel(hung.id)
+        await _wait_done(manager)
+        assert hung.status == "cancelled"
+        await manager.spawn("again")
+        await _wait_done(manager)
+        again = manager.list_tasks()[0]
+        assert again.status == "ok" and again.result != first.result
+    finally:
+        manager.shutdown()
+
+
+async def test_reaping_a_worker_does_not_block_the_event_loop() -> None:
+    pool = SubagentWorkerPool(_factory, size=1)
+    pool._idle.append(_Worker(process=_SlowToDie(), conn=_DeadPipe()))
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        with pytest.raises(WorkerCrashedError, match="exit code -9"):
+            await pool.run({"task": "x"})
+    finally:
+        task.cancel()
+    assert ticks >= 10
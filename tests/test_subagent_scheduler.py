@@ -0,0 +1,168 @@
+import asyncio
+
+from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.tools.spawn import SpawnTool
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+
+class _Provider:
+    """Answers each chat call after release; can keep the subagent calling tools."""
+
+    def __init__(self, tool_calls: bool = False, tokens: int = 100) -> None:
+        self.release = asyncio.Event()
+        self.active = 0
+        self.max_active = 0
+        self.tool_calls = tool_calls
+        self.tokens = tokens
+        self.calls = 0
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+    async def chat(self, messages, tools=None, model=None, temperature=0.7, max_tokens=4096):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        usage = {"total_tokens": self.tokens}
+        if self.tool_calls:
+            call = ToolCallRequest(id=f"c{self.calls}", name="list_dir", arguments={"path": "."})
+            return LLMResponse(content="working", tool_calls=[call], usage=usage)
+        return LLMResponse(content=f"done: {messages[-1]['content']}", usage=usage)
+
+
+def _manager(tmp_path, provider, **kwargs) -> SubagentManager:
+    return SubagentManager(provider=provider, workspace=tmp_path, bus=MessageBus(), **kwargs)
+
+
+async def _drain(manager: SubagentManager) -> None:
+    for _ in range(200):
+        if not manager.list_tasks(include_finished=False):
+            return
+        await asyncio.sleep(0.01)
+
+
+async def test_global_and_per_origin_limits(tmp_path) -> None:
+    provider = _Provider()
+    manager = _manager(tmp_path, provider, max_concurrent=3, max_per_origin=2)
+
+    for i in range(4):
+        await manager.spawn(f"busy {i}", origin_chat_id="a")
+    replies = [await manager.spawn(f"other {i}", origin_chat_id="b") for i in range(2)]
+    await asyncio.sleep(0.01)
+
+    running = [r for r in manager.list_tasks() if r.status == "running"]
+    assert sorted(r.origin["chat_id"] for r in running) == ["a", "a", "b"]
+    assert "queued" in replies[1]
+
+    provider.release.set()
+    await _drain(manager)
+    assert provider.max_active == 3
+    assert all(r.status == "ok" for r in manager.list_tasks())
+    assert manager.stats()["avgQueueWaitS"] >= 0
+
+
+async def test_priority_then_fifo_and_queue_bound(tmp_path) -> None:
+    provider = _Provider()
+    manager = _manager(tmp_path, provider, max_concurrent=1, max_queued=3)
+
+    await manager.spawn("first")
+    await manager.spawn("low", priority="low")
+    await manager.spawn("normal")
+    await manager.spawn("high", priority="high")
+    assert (await manager.spawn("overflow")).startswith("Error: subagent queue is full")
+
+    assert [r.task for r in manager.list_tasks()] == ["first", "high", "normal", "low"]
+    for r in manager.list_tasks():
+        manager.cancel(r.id)
+    await asyncio.sleep(0.01)
+
+
+async def test_cancel_queued_and_running(tmp_path) -> None:
+    provider = _Provider()
+    manager = _manager(tmp_path, provider, max_concurrent=1)
+    tool = SpawnTool(manager)
+
+    await tool.execute(task="running one")
+    await tool.execute(task="waiting one")
+    await asyncio.sleep(0.01)
+    running, waiting = manager.list_tasks()
+
+    assert "Cancelled" in await tool.execute(action="cancel", task_id=waiting.id)
+    assert waiting.status == "cancelled"
+    assert manager.cancel(running.id)
+    await asyncio.sleep(0.01)
+
+    assert running.status == "cancelled"
+    assert manager.get_running_count() == 0
+    listing = await tool.execute(action="list")
+    assert running.id in listing and "cancelled" in listing
+    assert "not queued or running" in await tool.execute(action="cancel", task_id=running.id)
+
+
+async def test_deadline_and_token_budget(tmp_path) -> None:
+    provider = _Provider(tool_calls=True, tokens=400)
+    provider.release.set()
+    manager = _manager(tmp_path, provider, token_budget=1000, timeout_s=5)
+
+    await manager.spawn("loop forever")
+    await _drain(manager)
+    record = manager.list_tasks()[0]
+    assert record.status == "budget"
+    assert record.iterations == 3 and record.tokens_used == 1200
+
+    slow = _Provider()
+    manager = _manager(tmp_path, slow)
+    await manager.spawn("never answers", timeout_s=0.05)
+    await _drain(manager)
+    record = manager.list_tasks()[0]
+    assert record.status == "timeout"
+    assert record.run_s is not None and record.run_s < 1
+
+
+async def test_group_results_are_announced_once(tmp_path) -> None:
+    provider = _Provider()
+    provider.release.set()
+    manager = _manager(tmp_path, provider, max_concurrent=4, max_per_origin=4)
+    tool = SpawnTool(manager)
+    tool.set_context("telegram", "42")
+
+    reply = await tool.execute(action="group", tasks=["angle A", "angle B", "angle C"], label="research")
+    assert "3 tasks" in reply
+    await _drain(manager)
+    await asyncio.sleep(0.01)
+
+    assert manager.bus.inbound_size == 1
+    msg = await manager.bus.consume_inbound()
+    assert msg.channel == "system" and msg.chat_id == "telegram:42"
+    assert "3 ok" in msg.content
+    assert all(f"done: angle {x}" in msg.content for x in "ABC")
+
+
+async def test_group_deadline_returns_partial_results(tmp_path) -> None:
+    class _Staggered(_Provider):
+        async def chat(self, messages, **kwargs):
+            task = messages[1]["content"]
+            if task == "quick":
+                return LLMResponse(content="quick answer")
+            if len(messages) == 2:
+                call = ToolCallRequest(id="c1", name="list_dir", arguments={"path": "."})
+                return LLMResponse(content="halfway there", tool_calls=[call])
+            await asyncio.Event().wait()  # Never answers
+
+    manager = _manager(tmp_path, _Staggered(), max_concurrent=2, max_per_origin=2)
+    await manager.spawn_group(["quick", "slow", "queued"], timeout_s=0.2)
+    await asyncio.sleep(0.4)
+
+    group = manager.list_groups()[0]
+    assert group.finished_at is not None
+    assert [m.status for m in group.members] == ["ok", "timeout", "timeout"]
+    assert manager.bus.inbound_size == 1
+    msg = await manager.bus.consume_inbound()
+    assert "1 ok, 2 timeout" in msg.content
+    assert "quick answer" in msg.content
+    assert "(partial - timeout)\nhalfway there" in msg.content
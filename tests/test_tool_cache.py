@@ -0,0 +1,122 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.cache import ToolResultCache
+from nanobot.agent.tools.email_read import EmailReadTool
+from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool
+from nanobot.agent.tools.registry import ToolRegistry
+
+
+class _CountingTool(Tool):
+    name = "lookup"
+    description = "Look something up."
+    parameters = {"type": "object", "properties": {"q": {"type": "string"}}, "required": ["q"]}
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.state = 1
+
+    def cache_key(self, params: dict[str, Any]) -> str | None:
+        return params["q"]
+
+    async def cache_validator(self, params: dict[str, Any]) -> Any:
+        return self.state
+
+    async def execute(self, q: str, **kwargs: Any) -> str:
+        self.calls += 1
+        return "Error: nope" if q == "bad" else f"{q} #{self.calls}"
+
+
+async def test_results_memoized_until_validator_changes() -> None:
+    tool = _CountingTool()
+    registry = ToolRegistry(cache=ToolResultCache())
+    registry.register(tool)
+
+    assert await registry.execute("lookup", {"q": "a"}) == "a #1"
+    cached = await registry.execute("lookup", {"q": "a"})
+    assert cached.startswith("[cached: identical call") and cached.endswith("a #1")
+    assert tool.calls == 1
+
+    tool.state = 2
+    assert await registry.execute("lookup", {"q": "a"}) == "a #2"
+
+    await registry.execute("lookup", {"q": "bad"})
+    await registry.execute("lookup", {"q": "bad"})
+    assert tool.calls == 4  # Errors are not memoized
+
+
+async def test_cache_scopes_and_lru_bound() -> None:
+    tool = _CountingTool()
+    registry = ToolRegistry(cache=ToolResultCache(max_entries=2))
+    registry.register(tool)
+
+    registry.cache_scope = "telegram:1"
+    await registry.execute("lookup", {"q": "a"})
+    registry.cache_scope = "telegram:2"
+    assert await registry.execute("lookup", {"q": "a"}) == "a #2"
+
+    await registry.execute("lookup", {"q": "b"})
+    assert len(registry.cache) == 2
+    registry.cache_scope = "telegram:1"
+    assert await registry.execute("lookup", {"q": "a"}) == "a #4"  # Evicted
+
+
+async def test_cache_scope_is_per_task() -> None:
+    tool = _CountingTool()
+    registry = ToolRegistry(cache=ToolResultCache())
+    registry.register(tool)
+
+    async def turn(scope: str) -> str:
+        registry.cache_scope = scope
+        await asyncio.sleep(0)  # The other turn sets its scope meanwhile
+        return await registry.execute("lookup", {"q": "a"})
+
+    assert await asyncio.gather(turn("telegram:1"), turn("cron:job")) == ["a #1", "a #2"]
+    assert registry.cache_scope == ""
+
+
+async def test_read_file_cache_follows_writes(tmp_path: Path) -> None:
+    registry = ToolRegistry(cache=ToolResultCache())
+    registry.register(ReadFileTool(workspace=tmp_path))
+    registry.register(WriteFileTool(workspace=tmp_path))
+    (tmp_path / "notes.txt").write_text("one\n")
+
+    assert await registry.execute("read_file", {"path": "notes.txt"}) == "one\n"
+    assert "[cached:" in await registry.execute("read_file", {"path": "notes.txt"})
+
+    await registry.execute("write_file", {"path": "notes.txt", "content": "two\n"})
+    assert await registry.execute("read_file", {"path": "notes.txt"}) == "two\n"
+
+
+class _FakeIMAP:
+    def __init__(self, capabilities: tuple[str, ...]) -> None:
+        self.capabilities = capabilities
+        self.unseen = 3
+        self.items: list[str] = []
+
+    def login(self, user: str, password: str) -> None:
+        pass
+
+    def status(self, mailbox: str, items: str):
+        self.items.append(items)
+        return "OK", [f"{mailbox} (MESSAGES 10 UIDNEXT 11 UNSEEN {self.unseen})".encode()]
+
+    def logout(self) -> None:
+        pass
+
+
+async def test_email_validator_follows_read_flags(monkeypatch) -> None:
+    imap = _FakeIMAP(("IMAP4REV1",))
+    monkeypatch.setattr("imaplib.IMAP4_SSL", lambda host, port: imap)
+    tool = EmailReadTool(imap_host="imap.test", username="u", password="p")
+
+    before = await tool.cache_validator({"query": "UNSEEN"})
+    imap.unseen = 0  # Read in another client: no new message, but the result changed
+    assert await tool.cache_validator({"query": "UNSEEN"}) != before
+    assert "HIGHESTMODSEQ" not in imap.items[0] and tool.cache_ttl
+
+    imap.capabilities = ("IMAP4REV1", "CONDSTORE")
+    await tool.cache_validator({"query": "UNSEEN"})
+    assert "HIGHESTMODSEQ" in imap.items[-1]
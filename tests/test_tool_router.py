@@ -0,0 +1,108 @@
+import asyncio
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.router import RequestToolsTool, ToolRouter
+
+
+class _Tool(Tool):
+    def __init__(self, name: str, description: str):
+        self._name = name
+        self._description = description
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        return self._name
+
+
+def _registry() -> tuple[ToolRegistry, ToolRouter]:
+    registry = ToolRegistry()
+    for name, description in [
+        ("read_file", "Read the contents of a file."),
+        ("exec", "Execute a shell command."),
+        ("web_search", "Search the web."),
+        ("web_fetch", "Fetch a URL and extract readable content."),
+        ("email_send", "Send an email via SMTP."),
+        ("cron", "Schedule reminders and recurring tasks."),
+        ("mcp_github_create_issue", "Create an issue in a GitHub repository."),
+    ]:
+        registry.register(_Tool(name, description))
+    router = ToolRouter(core=["read_file", "exec", "request_tools"], max_tools=5)
+    registry.register(RequestToolsTool(registry, router))
+    return registry, router
+
+
+def test_select_core_keywords_and_links() -> None:
+    registry, router = _registry()
+
+    assert router.select(registry, "oi, tudo bem?") == {"read_file", "exec", "request_tools"}
+    assert "cron" in router.select(registry, "me lembre de pagar a conta amanhã")
+    assert "email_send" in router.select(registry, "manda um e-mail pro João")
+    assert "web_fetch" in router.select(registry, "resume https://example.com/post")
+    assert "mcp_github_create_issue" in router.select(registry, "open a github issue about the crash")
+
+
+def test_select_keeps_recent_tools_and_channel_tools() -> None:
+    registry, router = _registry()
+    history = [{"role": "tool", "name": "web_search", "content": "..."}]
+
+    assert "web_search" in router.select(registry, "e o segundo?", history=history)
+    assert "email_send" in router.select(registry, "ok", channel="email")
+
+
+def test_definitions_subset_in_registration_order() -> None:
+    registry, _ = _registry()
+
+    names = [d["function"]["name"] for d in registry.get_definitions({"cron", "read_file"})]
+    assert names == ["read_file", "cron"]
+    assert len(registry.get_definitions()) == 8
+
+
+async def test_request_tools_loads_into_active_set() -> None:
+    registry, router = _registry()
+    tool = registry.get("request_tools")
+    tool.active = router.select(registry, "oi")
+
+    listing = await tool.execute()
+    assert "cron" in listing and "read_file" not in listing
+
+    result = await tool.execute(names=["email_send", "nope"])
+    assert "Loaded: email_send" in result and "Unknown tools: nope" in result
+    assert "email_send" in tool.active
+
+    await tool.execute(query="schedule a reminder")
+    assert "cron" in tool.active
+
+
+async def test_concurrent_turns_keep_their_own_active_set() -> None:
+    registry, router = _registry()
+    tool = registry.get("request_tools")
+    started = asyncio.Event()
+
+    async def chat_turn() -> set[str]:
+        active = tool.active = router.select(registry, "oi")
+        started.set()
+        await asyncio.sleep(0)  # A cron turn starts meanwhile
+        await registry.execute("request_tools", {"names": ["email_send"]})
+        return active
+
+    async def cron_turn() -> set[str]:
+        await started.wait()
+        active = tool.active = router.select(registry, "oi")
+        await asyncio.sleep(0.01)
+        return active
+
+    chat, cron = await asyncio.gather(chat_turn(), cron_turn())
+    assert "email_send" in chat and "email_send" not in cron
@@ -86,3 +86,42 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+class CountingTool(SampleTool):
+    def __init__(self, name: str = "counting") -> None:
+        self._name = name
+        self.schema_builds = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        self.schema_builds += 1
+        return {
+            "type": "object",
+            "properties": {"tags": {"type": ["array", "null"]}, "extra": True},
+        }
+
+
+async def test_registry_caches_schemas_and_compiles_validators_once() -> None:
+    reg = ToolRegistry()
+    tool = CountingTool()
+    reg.register(tool)
+    version = reg.version
+
+    first = reg.get_definitions()
+    for _ in range(5):
+        assert reg.get_definitions() == first
+        assert await reg.execute("counting", {"tags": None, "extra": 1}) == "ok"
+    assert tool.schema_builds == 2  # One for the validator, one for the definitions
+
+    reg.register(CountingTool("other"))
+    assert reg.version == version + 1
+    assert [d["function"]["name"] for d in reg.get_definitions()] == ["counting", "other"]
+    reg.unregister("other")
+    reg.unregister("missing")
+    assert reg.version == version + 2
+    assert reg.get_definitions() == first
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.config.loader import watch_config
+from nanobot.watcher import WatcherService
+
+
+async def _settle(seconds: float = 0.2) -> None:
+    await asyncio.sleep(seconds)
+
+
+@pytest.fixture(params=["inotify", "polling"])
+async def watcher(request):
+    service = WatcherService(debounce_s=0.02, poll_interval_s=0.05, use_inotify=request.param == "inotify")
+    await service.start()
+    if service.backend != request.param:
+        service.stop()
+        pytest.skip("inotify not available")
+    yield service
+    service.stop()
+
+
+async def test_changes_are_debounced_into_one_callback(tmp_path, watcher) -> None:
+    target = tmp_path / "notes.md"
+    calls = []
+    watcher.watch(target, calls.append)
+
+    for i in range(5):
+        target.write_text(f"v{i}", encoding="utf-8")
+    (tmp_path / "other.md").write_text("x", encoding="utf-8")
+    await _settle()
+
+    assert sum(1 for c in calls if target in c) >= 1
+    assert len(calls) <= 2
+    assert all(c == {target} for c in calls)
+
+
+async def test_missing_directory_is_picked_up_when_created(tmp_path, watcher) -> None:
+    changed = set()
+    watcher.watch(tmp_path / "skills", changed.update, recursive=True)
+
+    skill = tmp_path / "skills" / "demo" / "SKILL.md"
+    skill.parent.mkdir(parents=True)
+    await _settle()
+    skill.write_text("# Demo", encoding="utf-8")
+    await _settle()
+
+    assert skill in changed
+
+
+async def test_context_caches_are_invalidated_on_change(tmp_path, watcher) -> None:
+    (tmp_path / "USER.md").write_text("Nome: Ana", encoding="utf-8")
+    builder = ContextBuilder(tmp_path, watcher=watcher)
+    await _settle()
+    assert "Nome: Ana" in await builder.build_system_prompt()
+    assert builder._bootstrap is not None
+    assert builder.skills.list_skills(filter_unavailable=False) is not None
+
+    (tmp_path / "USER.md").write_text("Nome: Bia", encoding="utf-8")
+    builder.memory.memory_file.write_text("## Infra\n- **VPS**: Hetzner\n", encoding="utf-8")
+    skill = tmp_path / "skills" / "local" / "SKILL.md"
+    skill.parent.mkdir(parents=True)
+    skill.write_text("---\ndescription: Local skill\n---\nbody", encoding="utf-8")
+    await _settle(0.3)
+
+    prompt = await builder.build_system_prompt()
+    assert "Nome: Bia" in prompt and "Nome: Ana" not in prompt
+    assert "Hetzner" in prompt
+    assert "Local skill" in prompt
+
+
+async def test_config_reload_ignores_invalid_edits(tmp_path, watcher) -> None:
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"agents": {"defaults": {"temperature": 0.7}}}), encoding="utf-8")
+    seen = []
+    watch_config(watcher, seen.append, config_path=path)
+
+    path.write_text("{ not json", encoding="utf-8")
+    await _settle()
+    assert seen == []
+
+    path.write_text(json.dumps({"agents": {"defaults": {"temperature": 0.2}}}), encoding="utf-8")
+    await _settle()
+    assert seen and seen[-1].agents.defaults.temperature == 0.2
+
+
+async def test_unwatched_loader_reads_every_time(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    (tmp_path / "USER.md").write_text("one", encoding="utf-8")
+    assert "one" in await builder.build_system_prompt()
+    (tmp_path / "USER.md").write_text("two", encoding="utf-8")
+    assert "two" in await builder.build_system_prompt()